@@ -0,0 +1,60 @@
+import ast
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+ACTIONS_DIR = Path(__file__).resolve().parent / "actions"
+
+# --- Manifest Cache: {path: (mtime_ns, ACTION_INFO | None)} ---
+_manifest_cache = {}
+
+
+def _parse_action_info(path: Path) -> Optional[Dict]:
+    """อ่าน ACTION_INFO จาก Source ด้วย AST (ไม่ Execute โมดูล ไม่มี Side Effect)"""
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError, ValueError) as ex:
+        print(f"⚠️ อ่าน {path.name} ไม่สำเร็จ: {ex}")
+        return None
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets = [node.target]
+        else:
+            continue
+        if any(isinstance(t, ast.Name) and t.id == "ACTION_INFO" for t in targets):
+            try:
+                info = ast.literal_eval(node.value)
+            except ValueError:
+                print(f"⚠️ ACTION_INFO ใน {path.name} ต้องเป็นค่าคงที่ (Literal)")
+                return None
+            return info if isinstance(info, dict) else None
+    return None
+
+
+def load_action_manifest(actions_dir=None) -> Dict[str, Dict]:
+    """
+    คืน {ชื่อไฟล์: ACTION_INFO} ของทุก Action โดยไม่ต้อง Import
+    Parse ใหม่เฉพาะไฟล์ที่ mtime เปลี่ยน (ไฟล์อื่นใช้ค่าจาก Cache)
+    """
+    directory = Path(actions_dir) if actions_dir else ACTIONS_DIR
+    manifest = {}
+    if not directory.is_dir():
+        return manifest
+
+    for path in sorted(directory.glob("*.py")):
+        if path.name.startswith("_"):
+            continue
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        cached = _manifest_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, _parse_action_info(path))
+            _manifest_cache[path] = cached
+        if cached[1] is not None:
+            manifest[path.stem] = cached[1]
+    return manifest
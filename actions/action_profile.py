@@ -1,6 +1,10 @@
 import json
 import time
 
+import services
+from bindings import BindingTable
+from ui_bridge import ui_thread
+
 try:
     from PySide6.QtCore import Qt
     from PySide6.QtGui import QFont
@@ -20,13 +24,15 @@ ACTION_INFO = {
     ],
 }
 
-_last_switch_time = 0
-_DEBOUNCE_DELAY = 0.5
+_last_switch_time = 0  # ใช้จับเวลาซ่อน OSD
 _osd_window = None
+_osd_shown = False  # สถานะฝั่ง Engine (ไม่ถาม Widget ข้าม Thread)
+_bindings = BindingTable()
 
 
+@ui_thread
 def show_osd(text):
-    """ฟังก์ชันแสดงแจ้งเตือนแบบ Compact (เล็กและไม่ดึงสายตา)"""
+    """ฟังก์ชันแสดงแจ้งเตือนแบบ Compact (เล็กและไม่ดึงสายตา) ทำงานบน GUI Thread"""
     global _osd_window
     if not QT_AVAILABLE:
         return
@@ -76,67 +82,45 @@ def show_osd(text):
     _osd_window.show()
 
 
+@ui_thread
 def hide_osd():
-    global _osd_window
     if _osd_window:
         _osd_window.hide()
 
 
-def is_triggered(joystick, val):
-    if val is None:
-        return False
-    if isinstance(val, int):
-        try:
-            return joystick.get_button(val)
-        except:
-            return False
-    if isinstance(val, list):
-        return all(is_triggered(joystick, item) for item in val)
-    if isinstance(val, dict) and "hat" in val:
-        try:
-            return list(joystick.get_hat(val["hat"])) == val["dir"]
-        except:
-            return False
-    return False
+def is_busy():
+    """ยังต้องการ Tick ต่อเนื่องระหว่างที่ OSD แสดงอยู่ (รอซ่อนอัตโนมัติ)"""
+    return _osd_shown
 
 
 def run(ui_virtual, joystick, app_config, mod_mapping, trigger_key=None):
-    global _last_switch_time
+    global _last_switch_time, _osd_shown
     current_time = time.time()
     key = trigger_key
 
     # ซ่อน OSD เมื่อเวลาผ่านไป 1.2 วินาที (ลดเวลาลงเพื่อให้หายไวขึ้น)
-    if (
-        _osd_window
-        and _osd_window.isVisible()
-        and current_time - _last_switch_time > 1.2
-    ):
+    if _osd_shown and current_time - _last_switch_time > 1.2:
+        _osd_shown = False
         hide_osd()
 
     if key is None and joystick and mod_mapping:
-        if current_time - _last_switch_time < _DEBOUNCE_DELAY:
-            return False
+        # สลับครั้งเดียวต่อการกด 1 ครั้ง (Edge จาก Engine แทนการหน่วงเวลา)
+        bindings = _bindings.get(mod_mapping)
         for act in ACTION_INFO["actions"]:
-            mapping_val = mod_mapping.get("buttons", {}).get(act["key"])
-            if mapping_val is not None and is_triggered(joystick, mapping_val):
+            binding = bindings.get(act["key"])
+            if binding is not None and binding.pressed(joystick):
                 key = act["key"]
                 break
 
     if key is None:
         return False
 
-    import gc
-
-    from main import JoyConEngine
-
-    engine = next(
-        (obj for obj in gc.get_objects() if isinstance(obj, JoyConEngine)), None
-    )
+    engine = services.get("engine")
     if not engine:
         return False
 
-    active_prof = engine._mod_mapping.get("active_profile", "default")
-    profiles = list(engine._mod_mapping.get("profiles", {}).keys())
+    active_prof = engine.get_active_profile()
+    profiles = engine.get_profile_names()
     if len(profiles) <= 1:
         return False
 
@@ -149,13 +133,16 @@ def run(ui_virtual, joystick, app_config, mod_mapping, trigger_key=None):
         return False
 
     new_profile = profiles[new_index]
-    engine._mod_mapping["active_profile"] = new_profile
+    if not engine.set_active_profile(new_profile):
+        return False
     _last_switch_time = current_time
 
     show_notification = app_config.get("system", {}).get("show_profile_osd", True)
     if show_notification:
         # ✨ แสดงข้อความสั้นลง
         show_osd(f"🔄 {new_profile.upper()}")
+        _osd_shown = True
 
     # print(f"✨ สลับโปรไฟล์ไปที่: {new_profile}")
-    return "SAVE_MAPPING"
+    # Engine บันทึกและสร้างแผนการรันใหม่แล้ว -> หยุดลูป Action เฟรมนี้
+    return True
@@ -3,6 +3,10 @@ import subprocess
 import time
 from typing import Optional
 
+from bindings import BindingTable, compile_binding, compile_buttons
+from device_state import DeviceStates
+from ui_bridge import UiProxy
+
 try:
     import pyperclip
 except ImportError:
@@ -67,19 +71,33 @@ def _analog_to_cell(ax: float, ay: float) -> Optional[int]:
     return _sector_to_cell[sector]
 
 
+# ปุ่มเริ่มต้นของคีย์บอร์ด (ถ้าไม่ได้ตั้งใน Mapping)
+_KEY_DEFAULTS = {
+    "select": 0,
+    "enter": 1,
+    "backspace": 3,
+    "space": 4,
+    "shift": 9,
+    "num_shift": 4,
+}
+
+
+def _compile_keyboard_bindings(mapping):
+    table = compile_buttons(mapping)
+    for name, default in _KEY_DEFAULTS.items():
+        if name not in table:
+            table[name] = compile_binding(default)
+    return table
+
+
 class KeyboardController:
     def __init__(self):
         self.is_active = False
-        self._overlay: Optional[KeyboardOverlay] = None
+        self._overlay: Optional[UiProxy] = None
         self._selected_cell = 4
         self._char_index = -1
         self._typed_text = ""
-        self._btn_a_prev = False
-        self._btn_x_prev = False
-        self._btn_y_prev = False
-        self._btn_b_prev = False
-        self._toggle_btn_prev = False
-        self._emoji_toggle_btn_prev = False
+        self._bindings = BindingTable(_compile_keyboard_bindings)
         self.is_shift = False
         self.is_num_mode = False
         self.is_emoji_mode = False
@@ -94,7 +112,8 @@ class KeyboardController:
         self._pending_commit = False
         self.is_emoji_mode = False
         if KeyboardOverlay:
-            self._overlay = KeyboardOverlay()
+            # Widget ถูกสร้างบน GUI Thread: Action สั่งงานผ่าน Proxy (ไม่รอ GUI วาดเสร็จ)
+            self._overlay = UiProxy(KeyboardOverlay)
             self._overlay.show()
 
     def close(self):
@@ -131,18 +150,13 @@ class KeyboardController:
                 subprocess.run(["wl-copy", emoji], check=False, timeout=2)
         except:
             return
-        time.sleep(0.05)
-        ui_virtual.press_special('ctrl', True)
-        ui_virtual.press_special('v', True)
-        time.sleep(0.02)
-        ui_virtual.press_special('v', False)
-        ui_virtual.press_special('ctrl', False)
-
-    def _handle_btn_a(self, ui_virtual, is_pressed: bool):
+        # รอคลิปบอร์ดพร้อม 50ms แล้วค่อยกด Ctrl+V (ผ่านคิว Output ไม่บล็อก Tick)
+        ui_virtual.tap_combo(["ctrl", "v"], hold=0.02, delay=0.05)
+
+    def _handle_btn_a(self, ui_virtual, pressed: bool, released: bool):
         now = time.time()
-        is_just_pressed = is_pressed and not self._btn_a_prev
 
-        if is_just_pressed:
+        if pressed:
             if self.is_emoji_mode:
                 group = EMOJI_GROUPS[self._selected_cell]
             elif self.is_num_mode and self.is_shift:
@@ -200,7 +214,7 @@ class KeyboardController:
             self._last_a_time = now
             self._last_a_release_time = 0.0
 
-        elif not is_pressed and self._btn_a_prev:
+        elif released:
             self._last_a_release_time = now
 
     def _check_auto_commit(self):
@@ -216,8 +230,8 @@ class KeyboardController:
             if self._overlay:
                 self._overlay.set_char_index(-1)
 
-    def _handle_btn_x(self, ui_virtual, is_pressed: bool):
-        if is_pressed and not self._btn_x_prev:
+    def _handle_btn_x(self, ui_virtual, pressed: bool):
+        if pressed:
             if self._pending_commit:
                 self._pending_commit = False
                 self._char_index = -1
@@ -229,8 +243,8 @@ class KeyboardController:
                 if self._overlay:
                     self._overlay.set_typed_text(self._typed_text)
 
-    def _handle_btn_y(self, ui_virtual, is_pressed: bool):
-        if is_pressed and not self._btn_y_prev:
+    def _handle_btn_y(self, ui_virtual, pressed: bool):
+        if pressed:
             if self._pending_commit:
                 self._pending_commit = False
                 self._char_index = -1
@@ -241,8 +255,8 @@ class KeyboardController:
             if self._overlay:
                 self._overlay.set_typed_text(self._typed_text)
 
-    def _handle_btn_b(self, ui_virtual, is_pressed: bool):
-        if is_pressed and not self._btn_b_prev:
+    def _handle_btn_b(self, ui_virtual, pressed: bool):
+        if pressed:
             # 🎯 ถ้าอยู่ในโหมดอิโมจิและเลือกช่องกลาง → ออกจากโหมด
             if self.is_emoji_mode and self._selected_cell == 4:
                 self.is_emoji_mode = False
@@ -274,95 +288,69 @@ class KeyboardController:
         if not joystick:
             return self.is_active
 
-        toggle_btn = mod_mapping.get("buttons", {}).get("toggle_keyboard")
-        if toggle_btn is not None:
-            try:
-                if isinstance(toggle_btn, int):
-                    pressed = joystick.get_button(toggle_btn)
-                elif isinstance(toggle_btn, list):
-                    pressed = all(joystick.get_button(b) for b in toggle_btn)
-                else:
-                    pressed = False
-
-                if pressed and not self._toggle_btn_prev:
-                    if self.is_active:
-                        self.close()
-                    else:
-                        self.open()
-                self._toggle_btn_prev = pressed
-            except:
-                pass
+        bindings = self._bindings.get(mod_mapping)
+        toggle_btn = bindings.get("toggle_keyboard")
+        if toggle_btn is not None and toggle_btn.pressed(joystick):
+            if self.is_active:
+                self.close()
+            else:
+                self.open()
 
         # 🎯 ปุ่ม toggle โหมดอิโมจิ
-        emoji_btn = mod_mapping.get("buttons", {}).get("emoji_toggle")
-        if emoji_btn is not None and self.is_active:
-            try:
-                if isinstance(emoji_btn, int):
-                    pressed = joystick.get_button(emoji_btn)
-                elif isinstance(emoji_btn, list):
-                    pressed = all(joystick.get_button(b) for b in emoji_btn)
-                else:
-                    pressed = False
-
-                if pressed and not self._emoji_toggle_btn_prev:
-                    self.is_emoji_mode = not self.is_emoji_mode
-                    self._char_index = -1
-                    self._pending_commit = False
-                    if self._overlay:
-                        self._overlay.set_selected_cell(self._selected_cell)
-                        self._overlay.set_mode(self.is_shift, self.is_num_mode, self.is_emoji_mode)
-                self._emoji_toggle_btn_prev = pressed
-            except:
-                pass
+        emoji_btn = bindings.get("emoji_toggle")
+        if emoji_btn is not None and self.is_active and emoji_btn.pressed(joystick):
+            self.is_emoji_mode = not self.is_emoji_mode
+            self._char_index = -1
+            self._pending_commit = False
+            if self._overlay:
+                self._overlay.set_selected_cell(self._selected_cell)
+                self._overlay.set_mode(self.is_shift, self.is_num_mode, self.is_emoji_mode)
 
         if not self.is_active:
             return False
 
         self._handle_analog(joystick)
 
-        buttons = mod_mapping.get("buttons", {})
-        idx_a = buttons.get("select", 0)
-        idx_b = buttons.get("enter", 1)
-        idx_x = buttons.get("backspace", 3)
-        idx_y = buttons.get("space", 4)
-        idx_shift = buttons.get("shift", 9)
-        idx_num_shift = buttons.get("num_shift", 4)
-
-        try:
-            btn_a = joystick.get_button(idx_a)
-            btn_b = joystick.get_button(idx_b)
-            btn_x = joystick.get_button(idx_x)
-            btn_y = joystick.get_button(idx_y)
-            self.is_shift = joystick.get_button(idx_shift)
-            self.is_num_mode = (
-                joystick.get_button(idx_num_shift)
-                if idx_num_shift is not None
-                else False
-            )
-        except:
-            btn_a = btn_b = btn_x = btn_y = False
-            self.is_shift = self.is_num_mode = False
+        # ⚡ ใช้ Edge ที่ Engine คำนวณไว้ (ไม่ต้องจำสถานะปุ่มของ Tick ก่อนเอง)
+        btn_a = bindings["select"]
+        self.is_shift = bindings["shift"].matches(joystick)
+        self.is_num_mode = bindings["num_shift"].matches(joystick)
 
-        self._handle_btn_a(ui_virtual, btn_a)
-        self._handle_btn_x(ui_virtual, btn_x)
-        self._handle_btn_y(ui_virtual, btn_y)
-        self._handle_btn_b(ui_virtual, btn_b)
+        self._handle_btn_a(
+            ui_virtual, btn_a.pressed(joystick), btn_a.released(joystick)
+        )
+        self._handle_btn_x(ui_virtual, bindings["backspace"].pressed(joystick))
+        self._handle_btn_y(ui_virtual, bindings["space"].pressed(joystick))
+        self._handle_btn_b(ui_virtual, bindings["enter"].pressed(joystick))
 
         self._check_auto_commit()
 
-        self._btn_a_prev = btn_a
-        self._btn_x_prev = btn_x
-        self._btn_y_prev = btn_y
-        self._btn_b_prev = btn_b
-
         if self._overlay:
             self._overlay.set_mode(self.is_shift, self.is_num_mode, self.is_emoji_mode)
 
         return True
 
 
-_controller = KeyboardController()
+# คีย์บอร์ดเสมือนแยกต่อจอย (จอยแต่ละตัวพิมพ์ออกอุปกรณ์ Output ของตัวเอง)
+_controllers = DeviceStates(KeyboardController)
+
+
+def get_controller(ui_virtual) -> KeyboardController:
+    return _controllers.get(ui_virtual)
+
+
+def is_active_for(ui_virtual) -> bool:
+    """คีย์บอร์ดของจอยนี้เปิดอยู่หรือไม่ (ไม่สร้าง Controller ใหม่)"""
+    controller = _controllers.peek(ui_virtual)
+    return controller is not None and controller.is_active
+
+
+def is_busy():
+    """คีย์บอร์ดของจอยตัวใดเปิดอยู่ -> ต้องการ Tick ต่อเนื่อง (นับเวลา Auto-Commit)"""
+    return any(controller.is_active for controller in _controllers.values())
 
 
 def run(ui_virtual, joystick, app_config, mod_mapping, trigger_key=None):
-    return _controller.run(ui_virtual, joystick, app_config, mod_mapping, trigger_key)
+    return get_controller(ui_virtual).run(
+        ui_virtual, joystick, app_config, mod_mapping, trigger_key
+    )
@@ -1,9 +1,6 @@
 # actions/macro_keyboard.py
-import ast
-import json
-import os
-import time
-from pathlib import Path
+from bindings import NEVER, BindingTable, compile_binding, parse_binding_key
+from config_store import config_store
 
 ACTION_INFO = {
     "id": "macro_keyboard",
@@ -13,62 +10,65 @@ ACTION_INFO = {
 }
 
 
+# --- Macro Library Cache (ผูกกับ Version ของ Config Store) ---
+_macro_cache = None
+_macro_version = None
+
+
 def load_macro_library():
-    path = Path(__file__).resolve().parent.parent / "config" / "macros.json"
-    if path.exists():
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+    """คืนคลังมาโครจากแรม คัดลอกใหม่เฉพาะเมื่อ Version ใน Store เปลี่ยน
+    (แก้ไฟล์จากภายนอก: Watcher ของ Engine อัปเดต Store ให้เอง ไม่ต้องเช็คดิสก์ที่นี่)"""
+    global _macro_cache, _macro_version
+    version = config_store.version("macros")
+    if _macro_cache is None or version != _macro_version:
+        data = config_store.get("macros")
+        _macro_cache = data if isinstance(data, dict) else {}
+        _macro_version = version
+    return _macro_cache
+
 
+_STEP_GAP = 0.01  # วินาที: เว้นระยะระหว่างขั้นตอนของมาโคร
 
-def execute_step(ui, step):
+
+def execute_step(ui, step, delay=0.0):
+    """ส่งขั้นตอนมาโคร 1 ขั้นเข้าคิว Output (ไม่บล็อก Tick Loop)"""
     if isinstance(step, list):
         # Combo (เช่น กด Ctrl + C พร้อมกัน)
-        for k in step:
-            ui.press_special(k.lower(), True)
-        time.sleep(0.05)
-        for k in step:
-            ui.press_special(k.lower(), False)
+        ui.tap_combo([k.lower() for k in step], delay=delay)
     else:
         # ปุ่มเดี่ยว
-        ui.tap_special(step.lower())
+        ui.tap_special(step.lower(), delay=delay)
 
 
-def is_input_active(joystick, val):
-    """ฟังก์ชันเช็คสถานะปุ่ม/แกน/D-Pad แบบรองรับการกด Combo ทุกรูปแบบ"""
-    if val is None:
-        return False
-    try:
-        if isinstance(val, int):
-            return joystick.get_button(val)
-        if isinstance(val, list):
-            return all(is_input_active(joystick, i) for i in val)
-        if isinstance(val, dict):
-            if "hat" in val:
-                return joystick.get_hat(val["hat"]) == tuple(val["dir"])
-            if "axis" in val:
-                v = joystick.get_axis(val["axis"])
-                return v > 0.8 if val["val"] > 0 else v < -0.8
-    except:
-        pass
-    return False
+def play_macro(ui, sequence):
+    """ส่งมาโครทั้งชุดเข้าคิว Output โดยเว้นระยะระหว่างขั้นตอน"""
+    for i, step in enumerate(sequence):
+        execute_step(ui, step, delay=_STEP_GAP if i else 0.0)
 
 
-def _trigger_macro(ui_virtual, state_key, is_active, macro_name, macro_library):
-    was_active = run._pressed_state.get(state_key, False)
-    if is_active and not was_active:
-        run._pressed_state[state_key] = True
-        sequence = macro_library.get(macro_name)
-        if sequence:
-            # print(f"🚀 [Macro Engine] รันมาโคร: {macro_name}")
-            for step in sequence:
-                execute_step(ui_virtual, step)
-                time.sleep(0.01)
-    elif not is_active:
-        run._pressed_state[state_key] = False
+# --- Compiled Bindings (คอมไพล์ Mapping ครั้งเดียว แล้วใช้ซ้ำทุก Tick) ---
+# มาโครผูกแกน Analog ใช้เกณฑ์เดิม 80% (ต่ำกว่าเกณฑ์กลาง 85% ของ Action อื่น)
+_AXIS_THRESHOLD = 0.8
+
+
+def _compile_mapping(mapping):
+    """คอมไพล์ Mapping ทั้งชุดเป็น [(binding, macro_name), ...]"""
+    compiled = []
+    all_mappings = {}
+    all_mappings.update(mapping.get("buttons", {}))
+    all_mappings.update(mapping.get("analogs", {}))
+    for key_str, macro_name in all_mappings.items():
+        try:
+            binding = compile_binding(parse_binding_key(key_str), _AXIS_THRESHOLD)
+        except (ValueError, TypeError):
+            continue
+        if binding is not NEVER:
+            compiled.append((binding, macro_name))
+    return compiled
+
+
+# คอมไพล์ใหม่เฉพาะเมื่อ Mapping เปลี่ยน
+_bindings = BindingTable(_compile_mapping)
 
 
 def run(ui_virtual, joystick, app_config, mapping, trigger_key=None):
@@ -78,40 +78,21 @@ def run(ui_virtual, joystick, app_config, mapping, trigger_key=None):
         macro_library = load_macro_library()
         sequence = macro_library.get(trigger_key)
         if sequence:
-            for step in sequence:
-                execute_step(ui_virtual, step)
-                time.sleep(0.01)
+            play_macro(ui_virtual, sequence)
             return True
         return False
 
     # 🔽 โหมดปกติ: อ่าน mapping จากจอย แล้วรันมาโครที่ผูกกับปุ่ม
     if not joystick or not mapping:
         return False
-    if not hasattr(run, "_pressed_state"):
-        run._pressed_state = {}
-
-    macro_library = load_macro_library()
-
-    # ดึงค่า Mapping ออกมาทั้งหมด
-    all_mappings = {}
-    all_mappings.update(mapping.get("buttons", {}))
-    all_mappings.update(mapping.get("analogs", {}))
-
-    for key_str, macro_name in all_mappings.items():
-        try:
-            # 1. ถอดรหัสข้อความ String ให้กลับเป็นตัวเลข/List/Dict
-            try:
-                parsed_key = ast.literal_eval(key_str)
-            except (ValueError, SyntaxError):
-                parsed_key = int(key_str)  # กรณีเป็นตัวเลขโดดๆ เช่น "9"
 
-            # 2. เช็คว่า Input นั้นถูกกดอยู่หรือไม่
-            is_active = is_input_active(joystick, parsed_key)
-
-            # 3. สั่งรันมาโคร (ระบบ Just Pressed)
-            _trigger_macro(ui_virtual, key_str, is_active, macro_name, macro_library)
-
-        except Exception:
+    for binding, macro_name in _bindings.get(mapping):
+        # สั่งรันมาโครเฉพาะ Tick ที่เพิ่งกด (Edge จาก Engine)
+        if not binding.pressed(joystick):
             continue
+        # โหลดคลังมาโคร (จาก Cache) เฉพาะตอนที่มีการกดจริงเท่านั้น
+        sequence = load_macro_library().get(macro_name)
+        if sequence:
+            play_macro(ui_virtual, sequence)
 
     return False
@@ -1,7 +1,11 @@
+import bisect
+import math
 import os
 import time
+from dataclasses import dataclass, field
 
-import pygame
+from bindings import BindingTable
+from device_state import DeviceStates
 
 # --- Action Info ---
 ACTION_INFO = {
@@ -19,23 +23,121 @@ ACTION_INFO = {
     ],
 }
 
+# --- Motion Settings ---
+# speed_x / speed_y ใน config คือ "พิกเซลต่อ Tick ที่ 60Hz" (ค่าเดิม) -> แปลงเป็นพิกเซล/วินาที
+_REFERENCE_RATE = 60.0
+_MAX_DT = 0.05  # กันเมาส์กระโดดหลังจากหยุดรันไปนาน
+_FOCUS_FACTOR = 0.3
+_SCROLL_THRESHOLD = 0.5
+
+
+class ResponseCurve:
+    """
+    แปลงระยะโยกสติ๊ก (0..1 หลังตัด Deadzone) เป็นสัดส่วนความเร็ว (0..1)
+    - linear : ตรงตามระยะโยก
+    - power  : t ** exponent (ละเอียดตอนโยกเบา)
+    - s_curve: smoothstep (นุ่มทั้งช่วงต้นและปลาย)
+    - lut    : ตารางจุด [[in, out], ...] แล้วประมาณค่าเชิงเส้นระหว่างจุด
+    """
+
+    def __init__(self, kind="linear", exponent=2.0, points=None):
+        self.kind = kind
+        self.exponent = max(0.1, float(exponent))
+        pts = sorted((float(a), float(b)) for a, b in (points or [[0, 0], [1, 1]]))
+        self._xs = [p[0] for p in pts]
+        self._ys = [p[1] for p in pts]
+
+    def __call__(self, t: float) -> float:
+        if self.kind == "power":
+            return t**self.exponent
+        if self.kind == "s_curve":
+            return t * t * (3.0 - 2.0 * t)
+        if self.kind == "lut" and len(self._xs) >= 2:
+            xs, ys = self._xs, self._ys
+            if t <= xs[0]:
+                return ys[0]
+            if t >= xs[-1]:
+                return ys[-1]
+            i = bisect.bisect_right(xs, t)
+            x0, x1, y0, y1 = xs[i - 1], xs[i], ys[i - 1], ys[i]
+            return y0 + (y1 - y0) * (t - x0) / (x1 - x0) if x1 > x0 else y1
+        return t
+
+
+@dataclass
+class MotionState:
+    remainder_x: float = 0.0  # เศษพิกเซลที่ยังไม่ได้ส่ง (ยกไป Tick ถัดไป)
+    remainder_y: float = 0.0
+    scroll_wait: float = 0.0  # เวลาที่เหลือก่อน Scroll ครั้งถัดไป
+    last_time: float = 0.0
+
+    def reset(self):
+        self.remainder_x = self.remainder_y = 0.0
+        self.scroll_wait = 0.0
+        self.last_time = 0.0
+
+
+@dataclass
+class MouseState:
+    # สถานะปุ่มของเมาส์เสมือน (Output) ไม่ใช่ Edge ของจอย: ใช้ตามระดับปุ่มทุก Tick
+    # เพื่อให้ปุ่มไม่ค้างแม้ Action นี้ถูกข้ามไปตอนที่ปล่อยปุ่ม
+    left_pressed: bool = False
+    right_pressed: bool = False
+    motion: MotionState = field(default_factory=MotionState)
+
+
 # --- State Variables ---
-_left_is_pressed = False
-_right_is_pressed = False
+# ปุ่ม / เศษพิกเซล / เวลา Tick ก่อนหน้า แยกต่อจอย (จอยหลายตัวไม่ทับสถานะกัน)
+_states = DeviceStates(MouseState)
+_bindings = BindingTable()
+_curve_key = None
+_curve = ResponseCurve()
+
+
+def _get_curve(mouse_cfg) -> ResponseCurve:
+    """สร้าง Curve ใหม่เฉพาะเมื่อค่าใน config เปลี่ยน"""
+    global _curve_key, _curve
+    points = mouse_cfg.get("curve_points")
+    key = (
+        mouse_cfg.get("curve", "linear"),
+        mouse_cfg.get("curve_exponent", 2.0),
+        id(points),
+    )
+    if key != _curve_key:
+        _curve = ResponseCurve(key[0], key[1], points)
+        _curve_key = key
+    return _curve
+
+
+def _apply_radial_deadzone(x, y, deadzone, curve):
+    """Deadzone แบบวงกลม: คำนวณขนาดเวกเตอร์ครั้งเดียวแล้วกระจายกลับไปทั้งสองแกน"""
+    mag = math.hypot(x, y)
+    if mag <= deadzone:
+        return 0.0, 0.0
+    t = min(1.0, (mag - deadzone) / max(1e-6, 1.0 - deadzone))
+    scale = curve(t) / mag
+    return x * scale, y * scale
 
 
 def run(ui_virtual, joystick, app_config, mod_mapping, trigger_key=None):
-    global _left_is_pressed, _right_is_pressed
-
     if not joystick or not ui_virtual:
         return
+    state = _states.get(ui_virtual)
+    motion = state.motion
 
     # 🛡️ Skip if virtual keyboard is active (prevent mouse drift while typing)
     try:
-        from actions.keyboard import _controller as kb_ctrl
-        if kb_ctrl.is_active:
-            _left_is_pressed = False
-            _right_is_pressed = False
+        from actions.keyboard import is_active_for
+
+        if is_active_for(ui_virtual):
+            # ปล่อยปุ่มเมาส์เสมือนที่ค้างอยู่ก่อนหยุดทำงาน
+            if state.left_pressed:
+                ui_virtual.mouse_click("left", False)
+                state.left_pressed = False
+            if state.right_pressed:
+                ui_virtual.mouse_click("right", False)
+                state.right_pressed = False
+            motion.reset()
             return False
     except ImportError:
         pass
@@ -43,80 +145,90 @@ def run(ui_virtual, joystick, app_config, mod_mapping, trigger_key=None):
     # 1. Trigger Mode (สูตรลับ)
     if trigger_key is not None:
         if trigger_key == "left_click":
-            ui_virtual.mouse_click("left", True)
-            time.sleep(0.05)
-            ui_virtual.mouse_click("left", False)
+            ui_virtual.click("left")
         elif trigger_key == "right_click":
-            ui_virtual.mouse_click("right", True)
-            time.sleep(0.05)
-            ui_virtual.mouse_click("right", False)
+            ui_virtual.click("right")
         return
 
+    # ⏱️ เวลาระหว่าง Tick จากนาฬิกาของ Engine (ความเร็วเมาส์ไม่ขึ้นกับ tick_rate)
+    now = getattr(joystick, "time", 0.0) or time.monotonic()
+    dt = now - motion.last_time if motion.last_time else 1.0 / _REFERENCE_RATE
+    dt = min(max(dt, 0.0), _MAX_DT)
+    motion.last_time = now
+
     # 2. ดึงค่า Config ความเร็ว
     mouse_cfg = app_config.get("mouse", {})
-    speed_x = mouse_cfg.get("speed_x", 20)
-    speed_y = mouse_cfg.get("speed_y", 20)
+    speed_x = mouse_cfg.get("speed_x", 20) * _REFERENCE_RATE
+    speed_y = mouse_cfg.get("speed_y", 20) * _REFERENCE_RATE
+    deadzone = mouse_cfg.get("deadzone", 0.15)
 
     # 3. Logic ตรวจจับ Focus (ชะลอเมาส์)
-    if "focus" in mod_mapping.get("buttons", {}):
-        try:
-            if joystick.get_button(mod_mapping["buttons"]["focus"]):
-                speed_x = max(1, int(speed_x * 0.3))
-                speed_y = max(1, int(speed_y * 0.3))
-        except:
-            pass
+    bindings = _bindings.get(mod_mapping)
+    focus = bindings.get("focus")
+    if focus is not None and focus.matches(joystick):
+        speed_x *= _FOCUS_FACTOR
+        speed_y *= _FOCUS_FACTOR
 
     # --- Movement (X, Y) ---
+    # รวมแกน X/Y เป็นการขยับครั้งเดียว (ได้ Report แนวทแยงเดียว ไม่เป็นขั้นบันได)
     moved = False
-    if "move_x" in mod_mapping.get("analogs", {}):
-        try:
-            val = joystick.get_axis(mod_mapping["analogs"]["move_x"])
-            if abs(val) > 0.15:
-                ui_virtual.mouse_move(int(val * speed_x), 0)
-                moved = True
-        except:
-            pass
-
-    if "move_y" in mod_mapping.get("analogs", {}):
-        try:
-            val = joystick.get_axis(mod_mapping["analogs"]["move_y"])
-            if abs(val) > 0.15:
-                ui_virtual.mouse_move(0, int(val * speed_y))
-                moved = True
-        except:
-            pass
+    analogs = mod_mapping.get("analogs", {})
+    ax = ay = 0.0
+    try:
+        if "move_x" in analogs:
+            ax = joystick.get_axis(analogs["move_x"])
+        if "move_y" in analogs:
+            ay = joystick.get_axis(analogs["move_y"])
+    except:
+        ax = ay = 0.0
+
+    vx, vy = _apply_radial_deadzone(ax, ay, deadzone, _get_curve(mouse_cfg))
+    if vx or vy:
+        # 🎯 สะสมเศษพิกเซลข้าม Tick (โยกเบาๆ ก็ยังขยับได้)
+        fx = vx * speed_x * dt + motion.remainder_x
+        fy = vy * speed_y * dt + motion.remainder_y
+        dx, dy = int(fx), int(fy)
+        motion.remainder_x = fx - dx
+        motion.remainder_y = fy - dy
+        if dx or dy:
+            ui_virtual.mouse_move(dx, dy)
+            moved = True
+    else:
+        motion.remainder_x = motion.remainder_y = 0.0
 
     # --- Scroll ---
-    if "scroll_y" in mod_mapping.get("analogs", {}):
+    # เลื่อน 1 ขั้นทุกๆ scroll_delay วินาทีขณะโยกค้าง (ไม่ขึ้นกับ tick_rate)
+    if "scroll_y" in analogs:
         try:
-            val = joystick.get_axis(mod_mapping["analogs"]["scroll_y"])
-            if abs(val) > 0.5:
-                ui_virtual.mouse_scroll(1 if val < 0 else -1)
-                moved = True
+            val = joystick.get_axis(analogs["scroll_y"])
+            if abs(val) > _SCROLL_THRESHOLD:
+                motion.scroll_wait -= dt
+                if motion.scroll_wait <= 0:
+                    ui_virtual.mouse_scroll(1 if val < 0 else -1)
+                    motion.scroll_wait = mouse_cfg.get("scroll_delay", 0.08)
+                    moved = True
+            else:
+                motion.scroll_wait = 0.0
         except:
             pass
 
     # --- Button Clicks ---
     # Left Click
-    if "left_click" in mod_mapping.get("buttons", {}):
-        try:
-            is_down = joystick.get_button(mod_mapping["buttons"]["left_click"])
-            if is_down != _left_is_pressed:
-                ui_virtual.mouse_click("left", is_down)
-                _left_is_pressed = is_down
-                moved = True
-        except:
-            pass
+    left = bindings.get("left_click")
+    if left is not None:
+        is_down = left.matches(joystick)
+        if is_down != state.left_pressed:
+            ui_virtual.mouse_click("left", is_down)
+            state.left_pressed = is_down
+            moved = True
 
     # Right Click
-    if "right_click" in mod_mapping.get("buttons", {}):
-        try:
-            is_down = joystick.get_button(mod_mapping["buttons"]["right_click"])
-            if is_down != _right_is_pressed:
-                ui_virtual.mouse_click("right", is_down)
-                _right_is_pressed = is_down
-                moved = True
-        except:
-            pass
+    right = bindings.get("right_click")
+    if right is not None:
+        is_down = right.matches(joystick)
+        if is_down != state.right_pressed:
+            ui_virtual.mouse_click("right", is_down)
+            state.right_pressed = is_down
+            moved = True
 
 
@@ -7,7 +7,10 @@ import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
-import pygame
+import services
+from bindings import BindingTable
+from device_state import DeviceStates
+from ui_bridge import UiProxy
 
 # --- การนำเข้า Module ---
 try:
@@ -26,10 +29,20 @@ except ImportError:
         return "🔘"
 
 
-try:
-    from menus import main_menu
-except ImportError:
-    main_menu = None
+# โหลดระบบเมนูตอนเปิดเมนูวงกลมครั้งแรก (ไม่ถ่วงเวลาเปิดโปรแกรม)
+main_menu = None
+
+
+def _load_main_menu():
+    global main_menu
+    if main_menu is None:
+        try:
+            from menus import main_menu as module
+        except ImportError:
+            return None
+        main_menu = module
+    return main_menu
+
 
 ACTION_INFO = {
     "id": "radial_setup",
@@ -51,49 +64,24 @@ class RadialState:
     is_holding: bool = False
     has_started_sequence: bool = False
     overlay_window: Optional[Any] = None
-    last_btn_state: bool = False
+    selection: int = 0  # ช่องที่เลือกอยู่ (คำนวณฝั่ง Engine ไม่อ่านกลับจาก Widget ข้าม Thread)
+    select_cooldown_until: float = 0.0
     GRACE_PERIOD: float = 0.5
+    SELECT_COOLDOWN: float = 0.2
     TIMEOUT_SECONDS: float = 5.0
     ui_virtual: Any = None
 
 
+def _selection_index(angle: float, num_items: int) -> int:
+    """ช่องของเมนูที่มุม angle ชี้อยู่ (สูตรเดียวกับ RadialMenuOverlay.update_selection)"""
+    angle_step = 360 / num_items
+    return int(((angle + angle_step / 2) % 360) // angle_step)
+
+
 class RadialMenuController:
     def __init__(self):
         self.state = RadialState()
-
-    def is_combo_pressed(self, joystick, mapping_value) -> bool:
-        if mapping_value is None:
-            return False
-        if isinstance(mapping_value, int):
-            try:
-                return joystick.get_button(mapping_value)
-            except:
-                return False
-        if isinstance(mapping_value, list):
-            return all(self.is_combo_pressed(joystick, item) for item in mapping_value)
-
-        # ✨ เช็ครูปแบบ Dictionary (Hat และ Analog)
-        if isinstance(mapping_value, dict):
-            if "hat" in mapping_value:
-                try:
-                    h_id = mapping_value["hat"]
-                    target_dir = mapping_value["dir"]
-                    current_val = joystick.get_hat(h_id)
-                    return (target_dir[0] != 0 and current_val[0] == target_dir[0]) or (
-                        target_dir[1] != 0 and current_val[1] == target_dir[1]
-                    )
-                except:
-                    pass
-            elif "axis" in mapping_value:
-                try:
-                    a_id = mapping_value["axis"]
-                    target_val = mapping_value["val"]
-                    current_val = joystick.get_axis(a_id)
-                    # ดันสุดเกิน 85% ถึงจะนับว่ากด
-                    return current_val > 0.85 if target_val > 0 else current_val < -0.85
-                except:
-                    pass
-        return False
+        self._bindings = BindingTable()
 
     def get_current_physical_inputs(
         self, joystick, include_analog: bool = False
@@ -122,8 +110,11 @@ class RadialMenuController:
         return inputs
 
     def open_menu(self):
-        if main_menu:
-            main_menu.reload_menus()
+        # 🔧 Dev Mode เท่านั้น: Import ไฟล์เมนูที่ถูกแก้ไขใหม่ (ปกติใช้ Registry ที่โหลดไว้)
+        menu = _load_main_menu()
+        engine = services.get("engine")
+        if menu and engine and engine.is_dev_mode():
+            menu.reload_menus()
         self.state.is_active = True
         self.state.current_menu_id = "main"
         self.state.wait_for_neutral = True
@@ -131,7 +122,11 @@ class RadialMenuController:
         self.state.max_combo_detected = []
         if RadialMenuOverlay and not self.state.overlay_window:
             items = main_menu.MENU_ITEMS if main_menu else ["Error"]
-            self.state.overlay_window = RadialMenuOverlay(menu_items=items)
+            # Widget ถูกสร้าง / วาดบน GUI Thread: Action สั่งงานผ่าน Proxy (ไม่รอ GUI)
+            self.state.overlay_window = UiProxy(RadialMenuOverlay, menu_items=items)
+            # ตั้งผ่าน Proxy ด้วย: อ่านรายการกลับได้ทันทีโดยไม่แตะ Widget บน GUI Thread
+            self.state.overlay_window.menu_items = items
+            self.state.selection = 0
             self.state.overlay_window.show()
 
     def close_menu(self):
@@ -148,6 +143,9 @@ class RadialMenuController:
             axis_y = joystick.get_axis(1)
             if math.hypot(axis_x, axis_y) > 0.4:
                 angle = (math.degrees(math.atan2(axis_y, axis_x)) + 90) % 360
+                num_items = len(self.state.overlay_window.menu_items)
+                if num_items:
+                    self.state.selection = _selection_index(angle, num_items)
                 self.state.overlay_window.update_selection(angle)
         except:
             pass
@@ -156,7 +154,7 @@ class RadialMenuController:
         if not self.state.overlay_window:
             return None
         try:
-            idx = self.state.overlay_window.current_selection
+            idx = self.state.selection
             item = self.state.overlay_window.menu_items[idx]
         except:
             return None
@@ -271,14 +269,11 @@ class RadialMenuController:
             return False
 
         # 🟢 2. เปิดผ่านปุ่มจอย
-        trigger_config = mod_mapping.get("buttons", {}).get("open_menu")
-        btn_pressed = self.is_combo_pressed(joystick, trigger_config)
-        if btn_pressed and not self.state.last_btn_state:
+        if self._bindings.binding(mod_mapping, "open_menu").pressed(joystick):
             if self.state.is_active:
                 self.close_menu()
             else:
                 self.open_menu()
-        self.state.last_btn_state = btn_pressed
 
         if not self.state.is_active:
             return False
@@ -306,8 +301,8 @@ class RadialMenuController:
 
         self.update_selection_from_axis(joystick)
 
-        # 🟢 5. ยืนยันเลือกเมนู
-        if joystick.get_button(0):
+        # 🟢 5. ยืนยันเลือกเมนู (เว้นช่วงหลังเลือกครั้งก่อน โดยไม่หยุด Tick รอ)
+        if joystick.get_button(0) and time.time() >= self.state.select_cooldown_until:
             result = self.handle_menu_selection(joystick, app_config)
 
             if result == "CLOSE_MENU":
@@ -363,15 +358,23 @@ class RadialMenuController:
             elif result == "STOP_SEQUENCE_LISTEN":
                 self.state.listen_mode = None
 
-            pygame.time.wait(200)
+            self.state.select_cooldown_until = time.time() + self.state.SELECT_COOLDOWN
 
         if self.state.overlay_window:
             self.state.overlay_window.update()
         return True
 
 
-_controller = RadialMenuController()
+# เมนูวงกลมแยกต่อจอย (หน้าเมนู / โหมด Listen / หน้าต่าง Overlay ของใครของมัน)
+_controllers = DeviceStates(RadialMenuController)
+
+
+def is_busy():
+    """เมนูวงกลมของจอยตัวใดเปิดอยู่ -> ต้องการ Tick ต่อเนื่อง (วาด UI / นับเวลาโหมด Listen)"""
+    return any(controller.state.is_active for controller in _controllers.values())
 
 
 def run(ui_virtual, joystick, app_config, mod_mapping, trigger_key=None):
-    return _controller.run(ui_virtual, joystick, app_config, mod_mapping, trigger_key)
+    return _controllers.get(ui_virtual).run(
+        ui_virtual, joystick, app_config, mod_mapping, trigger_key
+    )
@@ -1,10 +1,14 @@
 import importlib
-import json
-import os
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+import services
+from bindings import BindingTable, compile_binding
+from config_store import config_store
+from device_state import DeviceStates
+from ui_bridge import ui_thread
+
 # --- 1. ข้อมูลพื้นฐาน Action ---
 ACTION_INFO = {
     "id": "sequence_engine",
@@ -15,6 +19,14 @@ ACTION_INFO = {
 
 
 # --- 2. คลาสเก็บสถานะ ---
+@dataclass
+class RecipeNode:
+    """โหนดของ Trie สูตรลับ (1 ชั้น = Input 1 ตัว)"""
+
+    children: Dict[str, "RecipeNode"] = field(default_factory=dict)
+    recipe: Optional[Dict] = None
+
+
 @dataclass
 class SequenceState:
     input_buffer: List[Any] = field(default_factory=list)
@@ -24,24 +36,33 @@ class SequenceState:
     feedback_mode: Optional[str] = None
     feedback_start_time: float = 0.0
     current_recipe_data: Optional[Dict] = None
+    match_node: Optional[RecipeNode] = None
     TIMEOUT_SECONDS: float = 2.0
 
 
+_DEFAULT_LISTENER = compile_binding([10, 11])
+
+
 # --- 3. คลาสประมวลผลหลัก ---
 class SequenceEngine:
-    RECIPE_PATH = os.path.join("config", "recipes.json")
-
     def __init__(self):
         self.state = SequenceState()
         self._ui_window = None
-        # ตรวจสอบการโหลด UI เฉพาะกรณีมีหน้าจอ
-        try:
-            from PySide6.QtWidgets import QApplication
-
-            if QApplication.instance():
-                self._init_ui()
-        except:
-            pass
+        self._recipe_root: Optional[RecipeNode] = None
+        self._recipe_version = None
+        self._bindings = BindingTable()
+
+    def _ensure_ui(self):
+        # สร้างหน้าต่างตอนใช้งานครั้งแรก และเฉพาะกรณีมีหน้าจอ
+        if self._ui_window is None:
+            try:
+                from PySide6.QtWidgets import QApplication
+
+                if QApplication.instance():
+                    self._init_ui()
+            except:
+                pass
+        return self._ui_window
 
     def _init_ui(self):
         from PySide6.QtCore import Qt
@@ -68,8 +89,10 @@ class SequenceEngine:
         layout.addWidget(label)
         self._ui_window.setLayout(layout)
 
+    # หน้าต่างแจ้งผลถูกสร้าง / แก้ไขบน GUI Thread เสมอ (Action รันบน Engine Thread)
+    @ui_thread
     def _show_ui(self, text: str):
-        if not self._ui_window:
+        if not self._ensure_ui():
             return
         from PySide6.QtWidgets import QApplication
 
@@ -86,19 +109,43 @@ class SequenceEngine:
         )
         self._ui_window.show()
 
+    @ui_thread
     def _hide_ui(self):
         if self._ui_window:
             self._ui_window.hide()
 
     def _get_recipes(self) -> List[Dict]:
-        if not os.path.exists(self.RECIPE_PATH):
-            return []
-        try:
-            with open(self.RECIPE_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else data.get("recipes", [])
-        except:
-            return []
+        data = config_store.get("recipes")
+        if isinstance(data, dict):
+            data = data.get("recipes", [])
+        return data if isinstance(data, list) else []
+
+    def _get_recipe_index(self) -> RecipeNode:
+        """คืน Trie สูตรจากแรม สร้างใหม่เฉพาะเมื่อ Version ของสูตรใน Store เปลี่ยน
+        (แก้ไฟล์จากภายนอก: Watcher ของ Engine อัปเดต Store ให้เอง ไม่ต้องเช็คดิสก์ที่นี่)"""
+        version = config_store.version("recipes")
+        if self._recipe_root is None or version != self._recipe_version:
+            self._recipe_root = self._build_recipe_index(self._get_recipes())
+            self._recipe_version = version
+        return self._recipe_root
+
+    def _build_recipe_index(self, recipes: List[Dict]) -> RecipeNode:
+        root = RecipeNode()
+        for recipe in recipes:
+            sequence = recipe.get("sequence", [])
+            if not sequence:
+                continue
+            node = root
+            for item in sequence:
+                token = self._deep_normalize(item)
+                child = node.children.get(token)
+                if child is None:
+                    child = node.children[token] = RecipeNode()
+                node = child
+            # สูตรซ้ำกัน: ใช้สูตรแรกในไฟล์ (เหมือนเดิม)
+            if node.recipe is None:
+                node.recipe = recipe
+        return root
 
     def _deep_normalize(self, val):
         """จัดการแกะก้ามปู [[...]] และแปลงเป็น String เพื่อเปรียบเทียบสูตร"""
@@ -118,8 +165,11 @@ class SequenceEngine:
         if not mod:
             return None
         try:
-            module = importlib.import_module(f"actions.{mod}")
-            importlib.reload(module)
+            # ใช้ Action ที่ Engine โหลดไว้แล้ว (ไม่ Reload ให้สถานะของ Action หาย)
+            engine = services.get("engine")
+            module = engine.get_action_module(mod) if engine else None
+            if module is None:
+                module = importlib.import_module(f"actions.{mod}")
             # 🚨 ส่งคืนค่า (เช่น "EXIT") ไปที่ Engine ใหญ่
             return module.run(ui_virtual, joystick, app_config, {}, trigger_key=key)
         except Exception as ex:
@@ -172,19 +222,13 @@ class SequenceEngine:
             return True
 
         # Phase 2: ตรวจสอบปุ่มเปิดรับสูตร (L+R)
-        trigger_val = mod_mapping.get("buttons", {}).get("open_listener", [10, 11])
-        triggered = False
-        try:
-            if isinstance(trigger_val, int):
-                triggered = joystick.get_button(trigger_val)
-            else:
-                triggered = all(joystick.get_button(b) for b in trigger_val)
-        except:
-            pass
+        trigger = self._bindings.get(mod_mapping).get("open_listener", _DEFAULT_LISTENER)
+        triggered = trigger.pressed(joystick)
 
         if triggered and not self.state.is_active:
             self.state.is_active = True
             self.state.input_buffer.clear()
+            self.state.match_node = self._get_recipe_index()
             self.state.last_input_time = current_time
             self.state.reference_inputs = self._get_current_inputs(joystick)
             self._show_ui("🎮 Cheat Code Mode...")
@@ -193,29 +237,11 @@ class SequenceEngine:
         if not self.state.is_active:
             return False
 
-        # Phase 3: ตรวจสอบ Timeout และเปรียบเทียบสูตร
+        # Phase 3: ตรวจสอบ Timeout (สูตรที่ยังมีสูตรยาวกว่าต่อท้ายได้ จะตัดสินตอนนี้)
         if current_time - self.state.last_input_time > self.state.TIMEOUT_SECONDS:
             if self.state.input_buffer:
-                recipes = self._get_recipes()
-                current_seq_norm = [
-                    self._deep_normalize(x) for x in self.state.input_buffer
-                ]
-
-                for recipe in recipes:
-                    req_seq = [
-                        self._deep_normalize(x) for x in recipe.get("sequence", [])
-                    ]
-                    if current_seq_norm == req_seq:
-                        self.state.current_recipe_data = recipe
-                        self.state.feedback_mode = "success"
-                        self.state.feedback_start_time = current_time
-                        self._show_ui(f"✅ สำเร็จ!\n{recipe.get('name')}")
-                        return True
-
-                self.state.feedback_mode = "fail"
-                self.state.feedback_start_time = current_time
-                self._show_ui("❌ สูตรไม่ถูกต้อง")
-                return True
+                node = self.state.match_node
+                return self._finish_match(current_time, node.recipe if node else None)
             else:
                 self.state.is_active = False
                 self._hide_ui()
@@ -234,18 +260,50 @@ class SequenceEngine:
 
             self.state.last_input_time = current_time
             self.state.input_buffer.append(new[0])
-            seq_str = "".join([get_emoji(x) for x in self.state.input_buffer])
-            self._show_ui(seq_str)
             for n in new:
                 if n not in self.state.reference_inputs:
                     self.state.reference_inputs.append(n)
 
+            # 🌳 เดิน Trie ทีละ Input: รู้ผลทันทีที่ไม่มีสูตรไหนไปต่อได้
+            node = self.state.match_node
+            node = node.children.get(self._deep_normalize(new[0])) if node else None
+            self.state.match_node = node
+            if node is None:
+                return self._finish_match(current_time, None)
+            if node.recipe is not None and not node.children:
+                # ตรงสูตรเดียวครบแล้ว ไม่ต้องรอ Timeout
+                return self._finish_match(current_time, node.recipe)
+
+            seq_str = "".join([get_emoji(x) for x in self.state.input_buffer])
+            self._show_ui(seq_str)
+
+        return True
+
+    def _finish_match(self, current_time, recipe):
+        self.state.match_node = None
+        self.state.feedback_start_time = current_time
+        if recipe is not None:
+            self.state.current_recipe_data = recipe
+            self.state.feedback_mode = "success"
+            self._show_ui(f"✅ สำเร็จ!\n{recipe.get('name')}")
+        else:
+            self.state.feedback_mode = "fail"
+            self._show_ui("❌ สูตรไม่ถูกต้อง")
         return True
 
 
 # --- 4. การสร้าง Instance (ต้องอยู่ล่างสุดหลังประกาศ Class) ---
-_engine_instance = SequenceEngine()
+# Buffer สูตร / หน้าต่างแจ้งผล แยกต่อจอย (กดสูตรพร้อมกันหลายจอยไม่ปนกัน)
+_engines = DeviceStates(SequenceEngine)
+
+
+def is_busy():
+    """จอยตัวใดกำลังรับสูตร หรือแสดงผลลัพธ์อยู่ -> ต้องการ Tick ต่อเนื่อง (นับ Timeout)"""
+    return any(
+        engine.state.is_active or engine.state.feedback_mode is not None
+        for engine in _engines.values()
+    )
 
 
 def run(ui_virtual, joystick, app_config, mod_mapping):
-    return _engine_instance.run(ui_virtual, joystick, app_config, mod_mapping)
+    return _engines.get(ui_virtual).run(ui_virtual, joystick, app_config, mod_mapping)
@@ -1,7 +1,10 @@
 import time
+from dataclasses import dataclass
+from typing import Optional
 
-import pyautogui
-from pynput.keyboard import Controller, Key
+from bindings import BindingTable
+from device_state import DeviceStates
+from input_snapshot import EdgeTracker
 
 # --- Action Info ---
 ACTION_INFO = {
@@ -18,50 +21,58 @@ ACTION_INFO = {
     ],
 }
 
-_last_execution_time = 0
-_DEBOUNCE_DELAY = 0.3
-_keyboard = Controller()  # จำลองคีย์บอร์ดแบบ Cross-platform
+# ปุ่มที่กดค้างแล้วทำซ้ำ (เพิ่ม / ลดเสียงต่อเนื่อง) เริ่มซ้ำเมื่อกดค้างครบเวลา Long Press
+_REPEAT_KEYS = ("vol_up", "vol_down")
+_REPEAT_DELAY = EdgeTracker.LONG_PRESS
+_REPEAT_INTERVAL = 0.3
 
 
-def is_triggered(joystick, val):
-    if val is None:
-        return False
-    if isinstance(val, int):
-        try:
-            return joystick.get_button(val)
-        except:
-            return False
-    if isinstance(val, list):
-        return all(is_triggered(joystick, item) for item in val)
-    if isinstance(val, dict) and "hat" in val:
-        try:
-            h_id = val["hat"]
-            target_dir = val["dir"]
-            current_val = joystick.get_hat(h_id)
-            if target_dir[0] != 0:
-                return current_val[0] == target_dir[0]
-            if target_dir[1] != 0:
-                return current_val[1] == target_dir[1]
-        except:
-            pass
-    return False
+@dataclass
+class RepeatState:
+    key: Optional[str] = None  # ปุ่มทำซ้ำที่กดค้างอยู่
+    repeat_at: float = 0.0
+
+
+_keyboard = None  # จำลองคีย์บอร์ดแบบ Cross-platform (สร้างตอนใช้งานครั้งแรก)
+_bindings = BindingTable()
+_repeats = DeviceStates(RepeatState)
+
+
+def _tap_media_key(name):
+    # โหลด pynput เฉพาะตอนกดปุ่มสื่อครั้งแรก (ไม่ถ่วงเวลาเปิดโปรแกรม)
+    global _keyboard
+    from pynput.keyboard import Controller, Key
+
+    if _keyboard is None:
+        _keyboard = Controller()
+    key = getattr(Key, name)
+    _keyboard.press(key)
+    _keyboard.release(key)
 
 
 def run(ui_virtual, joystick, app_config, mod_mapping, trigger_key=None):
-    global _last_execution_time
     key = trigger_key
-    current_time = time.time()
 
     if key is None and joystick and mod_mapping:
-        if current_time - _last_execution_time < _DEBOUNCE_DELAY:
-            return False
+        # สั่งงานทันทีที่กด (Edge จาก Engine) ปุ่มเสียงกดค้างแล้วทำซ้ำทุก _REPEAT_INTERVAL
+        bindings = _bindings.get(mod_mapping)
+        repeat = _repeats.get(ui_virtual)
+        now = getattr(joystick, "time", 0.0) or time.monotonic()
         for act in ACTION_INFO["actions"]:
-            mapping_val = mod_mapping.get("buttons", {}).get(act["key"])
-            if mapping_val is not None:
-                if is_triggered(joystick, mapping_val):
-                    key = act["key"]
-                    _last_execution_time = current_time
-                    break
+            binding = bindings.get(act["key"])
+            if binding is not None and binding.pressed(joystick):
+                key = act["key"]
+                break
+        if key is not None:
+            repeat.key = key if key in _REPEAT_KEYS else None
+            repeat.repeat_at = now + _REPEAT_DELAY
+        elif repeat.key is not None:
+            binding = bindings.get(repeat.key)
+            if binding is None or not binding.matches(joystick):
+                repeat.key = None
+            elif now >= repeat.repeat_at:
+                key = repeat.key
+                repeat.repeat_at = now + _REPEAT_INTERVAL
 
     if key is None:
         return False
@@ -69,21 +80,19 @@ def run(ui_virtual, joystick, app_config, mod_mapping, trigger_key=None):
     # --- ส่วนสั่งงานระบบแบบ Cross-Platform ---
     try:
         if key == "vol_up":
-            _keyboard.press(Key.media_volume_up)
-            _keyboard.release(Key.media_volume_up)
+            _tap_media_key("media_volume_up")
         elif key == "vol_down":
-            _keyboard.press(Key.media_volume_down)
-            _keyboard.release(Key.media_volume_down)
+            _tap_media_key("media_volume_down")
         elif key == "vol_mute":
-            _keyboard.press(Key.media_volume_mute)
-            _keyboard.release(Key.media_volume_mute)
+            _tap_media_key("media_volume_mute")
         elif key == "media_play":
-            _keyboard.press(Key.media_play_pause)
-            _keyboard.release(Key.media_play_pause)
+            _tap_media_key("media_play_pause")
         elif key == "media_next":
-            _keyboard.press(Key.media_next_track)
-            _keyboard.release(Key.media_next_track)
+            _tap_media_key("media_next_track")
         elif key == "screenshot":
+            # pyautogui หนักมาก โหลดเฉพาะตอนสั่งแคปหน้าจอ
+            import pyautogui
+
             # สร้างชื่อไฟล์จาก Timestamp ป้องกันการเซฟทับ
             filename = f"screenshot_{int(time.time())}.png"
             pyautogui.screenshot(filename)
@@ -0,0 +1,87 @@
+"""
+Benchmark ของ Engine แบบไม่ใช้จอย / หน้าจอ / /dev/uinput จริง
+
+    python -m bench                          # สถานการณ์มาตรฐาน (synthetic)
+    python -m bench --timeline pad.json      # เล่นจากไฟล์ที่อัดไว้
+    python -m bench --save after.json --baseline before.json
+    python -m bench --record pad.json --seconds 10   # อัดจากจอยจริง (ต้องมี pygame)
+
+--baseline: เทียบกับผลเดิม ถ้าช้าลงเกิน --threshold จะจบด้วย Exit Code 1
+"""
+
+import argparse
+import os
+import sys
+
+# รันจากโฟลเดอร์ไหนก็ได้: Engine โหลด actions/ จาก Working Directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench.fakes import Timeline, record_timeline, synthetic_timeline
+from bench.harness import (
+    compare,
+    format_report,
+    load_result,
+    run_benchmark,
+    save_result,
+)
+
+
+def _record(path, seconds, rate):
+    import pygame
+
+    pygame.init()
+    pygame.joystick.init()
+    if not pygame.joystick.get_count():
+        print("❌ ไม่พบจอย")
+        return 1
+    joystick = pygame.joystick.Joystick(0)
+    joystick.init()
+    print(f"🔴 กำลังอัด {joystick.get_name()} {seconds}s ...")
+    timeline = record_timeline(joystick, int(seconds * rate), 1.0 / rate, name=path)
+    timeline.save(path)
+    print(f"💾 บันทึก {len(timeline.events)} Event -> {path}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    parser.add_argument("--timeline", help="ไฟล์ Timeline (.json) แทนสถานการณ์มาตรฐาน")
+    parser.add_argument("--ticks", type=int, default=6000, help="ความยาว synthetic")
+    parser.add_argument("--repeat", type=int, default=3, help="เล่น Timeline ซ้ำกี่รอบ")
+    parser.add_argument("--save", help="บันทึกผลเป็น JSON")
+    parser.add_argument("--baseline", help="ผล JSON เดิมที่ใช้เทียบ")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--record", help="อัดจอยจริงเป็นไฟล์ Timeline")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--rate", type=int, default=60)
+    args = parser.parse_args(argv)
+
+    if args.record:
+        return _record(args.record, args.seconds, args.rate)
+
+    if args.timeline:
+        timeline = Timeline.load(args.timeline)
+    else:
+        timeline = synthetic_timeline(args.ticks)
+    result = run_benchmark(timeline, repeat=args.repeat)
+    print(format_report(result))
+    if args.save:
+        save_result(result, args.save)
+
+    if args.baseline:
+        regressions = compare(result, load_result(args.baseline), args.threshold)
+        print("-" * 55)
+        if regressions:
+            print(f"⚠️ ช้าลงเกิน {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"   - {line}")
+            return 1
+        print(f"✅ ไม่มีค่าใดช้าลงเกิน {args.threshold:.0%} เทียบกับ {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
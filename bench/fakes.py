@@ -0,0 +1,268 @@
+import json
+import math
+from collections import Counter
+from contextlib import contextmanager
+
+
+class Timeline:
+    """
+    ลำดับการเปลี่ยนสถานะจอยแบบนับเป็น Tick (ไม่ขึ้นกับเวลาจริง ผลเทียบกันข้าม Commit ได้)
+    events: [(tick, "button" | "axis" | "hat", index, value), ...] เก็บเฉพาะตอนค่าเปลี่ยน
+    """
+
+    def __init__(self, name, length, events, buttons=16, axes=6, hats=1):
+        self.name = name
+        self.length = length
+        self.buttons = buttons
+        self.axes = axes
+        self.hats = hats
+        self.events = sorted(events, key=lambda ev: ev[0])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        events = [
+            (tick, kind, index, tuple(value) if kind == "hat" else value)
+            for tick, kind, index, value in data["events"]
+        ]
+        return cls(
+            data.get("name", path),
+            data["length"],
+            events,
+            data.get("buttons", 16),
+            data.get("axes", 6),
+            data.get("hats", 1),
+        )
+
+    def save(self, path):
+        data = {
+            "name": self.name,
+            "length": self.length,
+            "buttons": self.buttons,
+            "axes": self.axes,
+            "hats": self.hats,
+            "events": [list(ev) for ev in self.events],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+def synthetic_timeline(length=6000):
+    """
+    สถานการณ์มาตรฐาน (ตาม BENCH_MAPPING) วนทุก 600 Tick:
+    - หมุนอนาล็อกซ้ายเป็นวงกลม + หมุนล้อ (แกน 3) -> mouse
+    - คลิกซ้าย / ขวา + แตะ D-Pad เป็นระยะ
+    - เปิดแล้วปิดเมนูวงกลม (ปุ่ม 10 + 11) ช่วงท้ายรอบ -> radial_setup
+    """
+    events = []
+    axes = [0.0] * 6
+
+    def set_axis(tick, index, value):
+        value = round(value, 4)
+        if axes[index] != value:
+            axes[index] = value
+            events.append((tick, "axis", index, value))
+
+    for tick in range(length):
+        phase = tick % 600
+        if phase < 300:
+            angle = 2 * math.pi * phase / 120
+            set_axis(tick, 0, 0.8 * math.cos(angle))
+            set_axis(tick, 1, 0.8 * math.sin(angle))
+        else:
+            set_axis(tick, 0, 0.0)
+            set_axis(tick, 1, 0.0)
+        set_axis(tick, 3, -0.9 if 200 <= phase < 260 else 0.0)
+
+        if phase % 40 == 0 and phase < 400:
+            events.append((tick, "button", 0, 1))
+        elif phase % 40 == 5 and phase < 400:
+            events.append((tick, "button", 0, 0))
+        if phase == 97:
+            events.append((tick, "button", 1, 1))
+        elif phase == 103:
+            events.append((tick, "button", 1, 0))
+
+        if phase % 50 == 10:
+            events.append((tick, "hat", 0, (0, 1) if phase % 100 == 10 else (1, 0)))
+        elif phase % 50 == 14:
+            events.append((tick, "hat", 0, (0, 0)))
+
+        # เปิดเมนูที่ 420 ปิดที่ 520 (กด 10 + 11 พร้อมกัน 4 Tick)
+        if phase in (420, 520):
+            events.append((tick, "button", 10, 1))
+            events.append((tick, "button", 11, 1))
+        elif phase in (424, 524):
+            events.append((tick, "button", 10, 0))
+            events.append((tick, "button", 11, 0))
+    return Timeline("synthetic", length, events)
+
+
+def record_timeline(joystick, length, interval, name="recorded"):
+    """อัดสถานะจอย pygame จริงทุก interval วินาที เป็น Timeline (เรียกหลัง pygame.init())"""
+    import time
+
+    import pygame
+
+    counts = (
+        joystick.get_numbuttons(),
+        joystick.get_numaxes(),
+        joystick.get_numhats(),
+    )
+    state = {}
+    events = []
+    for tick in range(length):
+        pygame.event.pump()
+        current = {("button", i): joystick.get_button(i) for i in range(counts[0])}
+        current.update(
+            (("axis", i), round(joystick.get_axis(i), 4)) for i in range(counts[1])
+        )
+        current.update(
+            (("hat", i), tuple(joystick.get_hat(i))) for i in range(counts[2])
+        )
+        for key, value in current.items():
+            if state.get(key) != value:
+                events.append((tick, key[0], key[1], value))
+        state = current
+        time.sleep(interval)
+    return Timeline(name, length, events, *counts)
+
+
+class FakeJoystick:
+    """จอยปลอมหน้าตาเหมือน pygame Joystick เล่นค่าตาม Timeline ทีละ Tick (advance())"""
+
+    def __init__(self, timeline, name="Bench Pad"):
+        self.timeline = timeline
+        self.name = name
+        self.rewind()
+
+    def rewind(self):
+        """เริ่มเล่น Timeline ใหม่ตั้งแต่ Tick แรก (ปล่อยทุกปุ่ม / แกนกลับศูนย์)"""
+        timeline = self.timeline
+        self._buttons = [0] * timeline.buttons
+        self._axes = [0.0] * timeline.axes
+        self._hats = [(0, 0)] * timeline.hats
+        self._tick = 0
+        self._cursor = 0
+
+    def advance(self):
+        """ใส่ค่าของ Tick ถัดไป คืนค่า False เมื่อเล่น Timeline จบแล้ว"""
+        tick = self._tick
+        if tick >= self.timeline.length:
+            return False
+        events = self.timeline.events
+        targets = {"button": self._buttons, "axis": self._axes, "hat": self._hats}
+        while self._cursor < len(events) and events[self._cursor][0] <= tick:
+            _, kind, index, value = events[self._cursor]
+            targets[kind][index] = value
+            self._cursor += 1
+        self._tick = tick + 1
+        return True
+
+    # --- pygame.joystick.Joystick API ---
+    def init(self):
+        pass
+
+    def quit(self):
+        pass
+
+    def get_name(self):
+        return self.name
+
+    def get_instance_id(self):
+        return 0
+
+    def get_numbuttons(self):
+        return len(self._buttons)
+
+    def get_numaxes(self):
+        return len(self._axes)
+
+    def get_numhats(self):
+        return len(self._hats)
+
+    def get_button(self, i):
+        return self._buttons[i]
+
+    def get_axis(self, i):
+        return self._axes[i]
+
+    def get_hat(self, i):
+        return self._hats[i]
+
+
+class RecordingVirtualInput:
+    """
+    VirtualInput ปลอม: ไม่แตะ /dev/uinput แค่นับ Event ที่ Action ส่งออก
+    การกดแบบตั้งเวลา (click / tap) นับเป็นกด + ปล่อยทันที (ไม่มี Worker Thread)
+    """
+
+    backend = "record"
+
+    def __init__(self, device_name="JoyConMe"):
+        self.device_name = device_name
+        self.calls = Counter()
+        self.events = 0
+        self.frames = 0
+        self._frame_depth = 0
+
+    def _record(self, name, events=1):
+        self.calls[name] += 1
+        self.events += events
+
+    def begin_frame(self):
+        self._frame_depth += 1
+
+    def end_frame(self):
+        self._frame_depth = max(0, self._frame_depth - 1)
+        if self._frame_depth == 0:
+            self.frames += 1
+
+    @contextmanager
+    def frame(self):
+        self.begin_frame()
+        try:
+            yield self
+        finally:
+            self.end_frame()
+
+    def mouse_move(self, dx, dy):
+        self._record("mouse_move", bool(dx) + bool(dy))
+
+    def mouse_scroll(self, amount):
+        self._record("mouse_scroll")
+
+    def mouse_click(self, button_name, is_press):
+        self._record("mouse_click")
+
+    def click(self, button_name, hold=0.0, delay=0.0):
+        self._record("click", 2)
+
+    def tap_special(self, key_str, hold=0.0, delay=0.0):
+        self._record("tap_special", 2)
+
+    def tap_combo(self, keys, hold=0.0, delay=0.0):
+        self._record("tap_combo", 2 * len(keys))
+
+    def press_special(self, key_str, is_press):
+        self._record("press_special")
+
+    def type_char(self, char_str, shift=False, hold=0.0, delay=0.0):
+        self._record("type_char", 4 if shift else 2)
+
+    def close(self):
+        pass
+
+
+class NullUiBridge:
+    """UiBridge ที่ทิ้งงาน UI ทั้งหมด (Benchmark ไม่มีหน้าจอ / QApplication)"""
+
+    def on_gui_thread(self) -> bool:
+        return False
+
+    def post(self, fn, *args, **kwargs):
+        pass
+
+    def drain(self):
+        pass
@@ -0,0 +1,242 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from collections import defaultdict
+
+import services
+from bench.fakes import FakeJoystick, NullUiBridge, RecordingVirtualInput
+from tick_scheduler import percentile
+
+WARMUP_TICKS = 120  # Tick แรก ๆ (สร้าง Cache / Import ย่อย) ไม่นับในผล
+MIN_DELTA = 1e-6  # วินาที: ต่างกันน้อยกว่านี้ถือเป็น Noise ของการจับเวลา ไม่นับว่าช้าลง
+
+# Mapping คงที่ของ Benchmark (ไม่ผูกปุ่มที่มีผลกับเครื่องจริง เช่น ปุ่มสื่อ / แคปหน้าจอ)
+BENCH_MAPPING = {
+    "active_profile": "default",
+    "profiles": {
+        "default": {
+            "mouse": {
+                "analogs": {"move_x": 0, "move_y": 1, "scroll_y": 3},
+                "buttons": {"left_click": 0, "right_click": 1, "focus": 9},
+            },
+            "keyboard": {
+                "analogs": {"select_x": 0, "select_y": 1},
+                "buttons": {"toggle_keyboard": [0, 10]},
+            },
+            "radial_setup": {"buttons": {"open_menu": [10, 11]}},
+            "sequence_engine": {"buttons": {"open_listener": [7, 10]}},
+            "exit_app": {"buttons": {}},
+        }
+    },
+}
+
+
+def _isolate_config():
+    """ย้าย Config (setup + config_store) ไปโฟลเดอร์ชั่วคราวที่ใช้ BENCH_MAPPING
+    (ไม่แตะไฟล์ของผู้ใช้ + ผลเทียบกันได้ทุกเครื่อง) คืน (โฟลเดอร์ชั่วคราว, โฟลเดอร์เดิม)"""
+    from config import setup
+    from config_store import config_store
+
+    directory = tempfile.mkdtemp(prefix="joyconme-bench-")
+    previous = setup.CONFIG_DIR
+    setup.CONFIG_DIR = directory
+    setup.create_if_not_exists("mapping.json", BENCH_MAPPING)
+    setup.initialize_configs()
+    config_store.set_dir(directory)
+    return directory, previous
+
+
+def _restore_config(previous):
+    from config import setup
+    from config_store import config_store
+
+    setup.CONFIG_DIR = previous
+    config_store.set_dir(previous)
+
+
+def _make_engine_class():
+    from engine import JoyConEngine
+
+    class BenchEngine(JoyConEngine):
+        """
+        Engine จริงทั้งหมด ยกเว้นจอย (FakeJoystick) และอุปกรณ์ Output (RecordingVirtualInput)
+        นาฬิกาของ Tick เป็นเวลาจำลอง เดินทีละ 1/tick_rate ต่อ Tick ไม่ว่าเครื่องจะรันเร็วแค่ไหน
+        (ระยะเมาส์ / Long Press / Double Tap ได้ผลเท่ากันทุกเครื่อง ทุก Commit)
+        """
+
+        def __init__(self, joystick):
+            self._bench_joystick = joystick
+            self.action_times = defaultdict(list)
+            self.sim_time = 0.0
+            super().__init__()
+            self._clock = self._sim_clock
+
+        def _sim_clock(self):
+            return self.sim_time
+
+        def run_tick(self):
+            self.sim_time += self.get_sleep_time()
+            return super().run_tick()
+
+        def _init_hardware(self):
+            joystick = self._bench_joystick
+            counts = (
+                joystick.get_numbuttons(),
+                joystick.get_numaxes(),
+                joystick.get_numhats(),
+            )
+            self._add_session(
+                "bench", joystick.get_name(), joystick=joystick, counts=counts
+            )
+
+        _init_event_reader = _init_hardware
+        _init_evdev_readers = _init_hardware
+
+        def _init_hotplug(self):
+            pass
+
+        def _create_virtual_device(self, device_name):
+            return RecordingVirtualInput(device_name)
+
+        def _run_action(self, entry, session):
+            started = time.perf_counter()
+            try:
+                return super()._run_action(entry, session)
+            finally:
+                self.action_times[entry.action_id].append(
+                    time.perf_counter() - started
+                )
+
+    return BenchEngine
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmark(timeline, repeat=1):
+    """
+    เล่น Timeline ผ่าน JoyConEngine.run_tick ติดกัน (ไม่หลับระหว่าง Tick) แล้วคืนผลเป็น dict
+    - ticks_per_sec : จำนวน Tick ต่อวินาทีของทั้ง Engine
+    - actions       : เวลาต่อการเรียก 1 ครั้ง (p50 / p99 วินาที) แยกตาม Action
+    - output_events : Event ที่ Action ส่งออกไปยัง VirtualInput (ใช้เวลาจำลอง: เท่ากันทุกเครื่อง)
+    """
+    # Engine / Action พิมพ์ Log เยอะ: เก็บไว้ไม่ให้ปนกับผล
+    with contextlib.redirect_stdout(io.StringIO()):
+        config_dir, previous_dir = _isolate_config()
+    services.register("ui", NullUiBridge())
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine_class = _make_engine_class()
+            joystick = FakeJoystick(timeline)
+            engine = engine_class(joystick)
+            ui = engine._sessions["bench"].ui_virtual
+            try:
+                for _ in range(WARMUP_TICKS):
+                    if not joystick.advance():
+                        break
+                    engine.run_tick()
+                engine.action_times.clear()
+                events_before = ui.events
+
+                ticks = 0
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    joystick.rewind()
+                    while joystick.advance():
+                        engine.run_tick()
+                        ticks += 1
+                elapsed = time.perf_counter() - started
+                events = ui.events - events_before
+                action_times = dict(engine.action_times)
+            finally:
+                engine.cleanup()
+    finally:
+        services.unregister("ui")
+        _restore_config(previous_dir)
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+    return {
+        "scenario": timeline.name,
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_sec": ticks / elapsed if elapsed else 0.0,
+        "output_events": events,
+        "output_events_per_sec": events / elapsed if elapsed else 0.0,
+        "output_events_per_tick": events / ticks if ticks else 0.0,
+        "actions": {
+            action_id: {
+                "calls": len(times),
+                "p50": percentile(times, 0.50),
+                "p99": percentile(times, 0.99),
+            }
+            for action_id, times in sorted(action_times.items())
+        },
+    }
+
+
+def format_report(result):
+    lines = [
+        f"📊 Scenario : {result['scenario']} (rev {result['revision'] or '?'}, "
+        f"Python {result['python']})",
+        f"⏱️  Ticks    : {result['ticks']} in {result['seconds']:.3f}s "
+        f"= {result['ticks_per_sec']:.0f} ticks/s",
+        f"🖱️  Output   : {result['output_events']} events "
+        f"({result['output_events_per_tick']:.3f} per tick)",
+        "-" * 55,
+        f"{'Action':<20} {'Calls':>8} {'p50 (us)':>10} {'p99 (us)':>10}",
+    ]
+    for action_id, stats in result["actions"].items():
+        lines.append(
+            f"{action_id:<20} {stats['calls']:>8} "
+            f"{stats['p50'] * 1e6:>10.1f} {stats['p99'] * 1e6:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def compare(result, baseline, threshold=0.15):
+    """เทียบกับผลเดิม คืน [ข้อความ] ของค่าที่แย่ลงเกิน threshold (0.15 = 15%)
+    เทียบ ticks/s และ p50 ต่อ Action (p99 ระดับไมโครวินาทีแกว่งมากเกินใช้ตัดสิน แสดงในรายงานเท่านั้น)"""
+    regressions = []
+    old, new = baseline.get("ticks_per_sec", 0.0), result["ticks_per_sec"]
+    if old and new < old * (1 - threshold):
+        regressions.append(f"ticks/s {old:.0f} -> {new:.0f} ({new / old - 1:+.0%})")
+    for action_id, stats in result["actions"].items():
+        before = baseline.get("actions", {}).get(action_id)
+        if not before:
+            continue
+        old, new = before["p50"], stats["p50"]
+        if old and new > old * (1 + threshold) and new - old > MIN_DELTA:
+            regressions.append(
+                f"{action_id} p50 {old * 1e6:.1f}us -> {new * 1e6:.1f}us "
+                f"({new / old - 1:+.0%})"
+            )
+    return regressions
+
+
+def save_result(result, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=4, ensure_ascii=False)
+
+
+def load_result(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,182 @@
+import ast
+from typing import Callable, Dict, Tuple
+
+from input_snapshot import hat_direction_bits
+
+# ดันแกนเกิน 85% ถึงจะนับว่ากด (เท่ากับเกณฑ์ตอนบันทึกปุ่มในเมนู)
+AXIS_THRESHOLD = 0.85
+
+
+class Binding:
+    """
+    ปุ่มที่ผูกไว้ใน Mapping 1 ค่า (ปุ่มเดี่ยว / Combo / Hat / Analog) ที่คอมไพล์แล้ว
+    - buttons: Bitmask ของปุ่มที่ต้องกดพร้อมกันทั้งหมด
+    - hats   : Bitmask ทิศ Hat ที่ต้องกด (เทียบกับ InputSnapshot.hat_bits)
+    - axes   : ((แกน, ทิศบวก?, เกณฑ์), ...) สำหรับ Analog
+    matches() เช็คกับ Snapshot ของ Tick ด้วยการ AND Bitmask (ไม่ต้องไล่ JSON ทุก Tick)
+    pressed() / released() / long_pressed() / double_tapped() ใช้ Edge ที่ Engine คำนวณไว้
+    """
+
+    __slots__ = ("buttons", "hats", "axes")
+
+    def __init__(self, buttons: int = 0, hats: int = 0, axes: Tuple = ()):
+        self.buttons = buttons
+        self.hats = hats
+        self.axes = axes
+
+    def _test(self, buttons, hat_bits, axes) -> bool:
+        mask = self.buttons
+        if buttons & mask != mask:
+            return False
+        mask = self.hats
+        if mask and hat_bits & mask != mask:
+            return False
+        if self.axes:
+            for axis, positive, threshold in self.axes:
+                if axis >= len(axes):
+                    return False
+                v = axes[axis]
+                if not (v > threshold if positive else v < -threshold):
+                    return False
+        return True
+
+    def matches(self, snapshot) -> bool:
+        """กดอยู่ใน Tick นี้ (Held)"""
+        return self._test(snapshot.buttons, snapshot.hat_bits, snapshot.axes)
+
+    def was_active(self, snapshot) -> bool:
+        """กดอยู่ใน Tick ก่อนหน้า"""
+        return self._test(
+            snapshot.prev_buttons, snapshot.prev_hat_bits, snapshot.prev_axes
+        )
+
+    def pressed(self, snapshot) -> bool:
+        """เพิ่งเริ่มกดครบใน Tick นี้"""
+        return self.matches(snapshot) and not self.was_active(snapshot)
+
+    def released(self, snapshot) -> bool:
+        """เพิ่งปล่อยใน Tick นี้"""
+        return self.was_active(snapshot) and not self.matches(snapshot)
+
+    def long_pressed(self, snapshot) -> bool:
+        """ทุกปุ่มใน Binding กดค้างครบเวลา Long Press แล้ว (เกิดครั้งเดียวต่อการกด)"""
+        mask = self.buttons
+        return bool(
+            mask
+            and snapshot.long_held & mask == mask
+            and snapshot.long_pressed & mask
+            and self.matches(snapshot)
+        )
+
+    def double_tapped(self, snapshot) -> bool:
+        """กดซ้ำเร็ว ๆ (ปุ่มใดปุ่มหนึ่งใน Binding ถูกแตะ 2 ครั้งติดกัน)"""
+        mask = self.buttons
+        return bool(mask and snapshot.double_tapped & mask) and self.pressed(snapshot)
+
+    def __repr__(self):
+        return (
+            f"Binding(buttons={self.buttons:#x}, hats={self.hats:#x}, axes={self.axes})"
+        )
+
+
+class _NeverBinding(Binding):
+    """Binding ที่ไม่มีวันถูกกด (ค่าใน Mapping ว่าง / ผิดรูปแบบ)"""
+
+    __slots__ = ()
+
+    def _test(self, buttons, hat_bits, axes) -> bool:
+        return False
+
+    def __repr__(self):
+        return "NEVER"
+
+
+NEVER = _NeverBinding()
+
+
+def _compile(val, axis_threshold):
+    if isinstance(val, bool):
+        return None
+    if isinstance(val, int):
+        return Binding(buttons=1 << val) if val >= 0 else None
+    if isinstance(val, list):
+        # Combo: รวมทุกส่วนเป็น Binding เดียว (ต้องกดพร้อมกันทั้งหมด)
+        buttons = hats = 0
+        axes = ()
+        for item in val:
+            part = _compile(item, axis_threshold)
+            if part is None:
+                return None
+            buttons |= part.buttons
+            hats |= part.hats
+            axes += part.axes
+        if not (buttons or hats or axes):
+            return None
+        return Binding(buttons, hats, axes)
+    if isinstance(val, dict):
+        if "hat" in val:
+            # ทุกทิศที่ไม่ใช่ 0 ใน dir ต้องตรง (ขึ้น = ขึ้น/ขึ้นซ้าย/ขึ้นขวา, ทแยง = ต้องทแยงจริง)
+            hat = int(val["hat"])
+            x, y = val["dir"]
+            bits = hat_direction_bits(x, y)
+            if hat < 0 or not bits:
+                return None
+            return Binding(hats=bits << (4 * hat))
+        if "axis" in val:
+            axis = int(val["axis"])
+            if axis < 0:
+                return None
+            return Binding(axes=((axis, val["val"] > 0, axis_threshold),))
+    return None
+
+
+def compile_binding(val, axis_threshold: float = AXIS_THRESHOLD) -> Binding:
+    """แปลงค่า Mapping (int / list / hat dict / axis dict) เป็น Binding (NEVER ถ้าไม่รู้จัก)
+    axis_threshold: เกณฑ์ของแกน Analog (Action ที่เคยใช้เกณฑ์ของตัวเองส่งค่าเดิมมาได้)"""
+    try:
+        binding = _compile(val, axis_threshold)
+    except (KeyError, TypeError, ValueError):
+        binding = None
+    return NEVER if binding is None else binding
+
+
+def parse_binding_key(key_str):
+    """ถอดรหัสคีย์ String ใน Mapping ให้กลับเป็นตัวเลข/List/Dict"""
+    try:
+        return ast.literal_eval(key_str)
+    except (ValueError, SyntaxError):
+        return int(key_str)  # กรณีเป็นตัวเลขโดดๆ เช่น "9"
+
+
+def compile_buttons(mapping) -> Dict[str, Binding]:
+    """คอมไพล์ mapping["buttons"] ของ Action เป็น {ชื่อคำสั่ง: Binding}"""
+    buttons = mapping.get("buttons", {}) if isinstance(mapping, dict) else {}
+    return {key: compile_binding(val) for key, val in buttons.items()}
+
+
+class BindingTable:
+    """
+    Cache ของ Binding ที่คอมไพล์แล้วสำหรับ Action 1 ตัว
+    คอมไพล์ใหม่เฉพาะเมื่อได้ Mapping ชุดใหม่ (Engine สร้าง Dict ใหม่ทุกครั้งที่ Mapping เปลี่ยน)
+    เก็บได้หลายชุดพร้อมกัน (จอยหลายตัวใช้คนละโปรไฟล์ จะไม่คอมไพล์สลับไปมาทุก Tick)
+    """
+
+    MAX_ENTRIES = 8
+
+    __slots__ = ("_builder", "_tables")
+
+    def __init__(self, builder: Callable = compile_buttons):
+        self._builder = builder
+        self._tables = {}  # {id(mapping): (mapping, table)} เก็บ mapping ไว้กัน id ซ้ำ
+
+    def get(self, mapping):
+        entry = self._tables.get(id(mapping))
+        if entry is None or entry[0] is not mapping:
+            if len(self._tables) >= self.MAX_ENTRIES:
+                self._tables.clear()
+            entry = (mapping, self._builder(mapping))
+            self._tables[id(mapping)] = entry
+        return entry[1]
+
+    def binding(self, mapping, key) -> Binding:
+        return self.get(mapping).get(key, NEVER)
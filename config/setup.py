@@ -4,7 +4,14 @@ import os
 CONFIG_DIR = os.path.dirname(__file__)
 
 DEFAULT_CONFIG = {
-    "mouse": {"speed_x": 25, "speed_y": 25, "deadzone": 0.15, "scroll_delay": 0.08},
+    "mouse": {
+        "speed_x": 25,
+        "speed_y": 25,
+        "deadzone": 0.15,
+        "scroll_delay": 0.08,
+        "curve": "linear",
+        "curve_exponent": 2.0,
+    },
     "ui": {
         "items_per_page": 6,
         "menu_radius": 220,
@@ -12,6 +19,12 @@ DEFAULT_CONFIG = {
         "wait_time_ms": 300,
         "opacity": 210,
     },
+    "system": {
+        "tick_rate": 60,
+        "input_mode": "poll",
+        "input_backend": "pygame",
+        "dev_hot_reload": False,
+    },
 }
 
 DEFAULT_MAPPING = {
@@ -0,0 +1,210 @@
+import copy
+import os
+import threading
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, FrozenSet, List
+
+from config import setup
+from json_store import json_store
+
+# --- Typed Sections (มุมมองแบบมีชนิดข้อมูลของ config.json) ---
+
+
+@dataclass(frozen=True)
+class MouseSettings:
+    speed_x: float = 25.0
+    speed_y: float = 25.0
+    deadzone: float = 0.15
+    scroll_delay: float = 0.08
+    curve: str = "linear"
+    curve_exponent: float = 2.0
+
+
+@dataclass(frozen=True)
+class UISettings:
+    items_per_page: int = 6
+    menu_radius: int = 220
+    selection_threshold: float = 0.4
+    wait_time_ms: int = 300
+    opacity: int = 210
+
+
+@dataclass(frozen=True)
+class SystemSettings:
+    tick_rate: int = 60
+    tick_spin_us: int = 0  # Busy-wait ช่วงท้ายก่อนถึง Deadline (แม่นขึ้น แลกกับ CPU)
+    tick_catch_up: str = "skip"  # skip / burst / reset เมื่อ Tick ตื่นช้าเกิน 1 รอบ
+    input_mode: str = "poll"
+    input_backend: str = "pygame"
+    input_device: str = ""
+    dev_hot_reload: bool = False
+    action_shield: bool = False
+
+
+_SECTION_TYPES = {
+    "mouse": MouseSettings,
+    "ui": UISettings,
+    "system": SystemSettings,
+}
+
+
+def _build_section(cls, raw):
+    if not isinstance(raw, dict):
+        raw = {}
+    values = {}
+    for f in fields(cls):
+        if f.name not in raw:
+            continue
+        value = raw[f.name]
+        if f.type is bool:
+            if isinstance(value, (bool, int)):
+                values[f.name] = bool(value)
+            continue
+        # แปลงชนิดตาม Annotation (เช่น "60" -> 60) ถ้าแปลงไม่ได้ใช้ค่า Default
+        try:
+            values[f.name] = f.type(value)
+        except (TypeError, ValueError):
+            pass
+    return cls(**values)
+
+
+def _diff(old, new) -> FrozenSet[str]:
+    """หาคีย์ที่เปลี่ยน 2 ชั้น เช่น {"profiles", "profiles.default"}"""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return frozenset() if old == new else frozenset({"*"})
+    changed = set()
+    for key in old.keys() | new.keys():
+        a, b = old.get(key), new.get(key)
+        if a == b:
+            continue
+        changed.add(key)
+        if isinstance(a, dict) and isinstance(b, dict):
+            for sub in a.keys() | b.keys():
+                if a.get(sub) != b.get(sub):
+                    changed.add(f"{key}.{sub}")
+        elif isinstance(b, dict):
+            changed.update(f"{key}.{sub}" for sub in b)
+        elif isinstance(a, dict):
+            changed.update(f"{key}.{sub}" for sub in a)
+    return frozenset(changed)
+
+
+class ConfigStore:
+    """
+    ที่เก็บ Config กลางในแรม (config / mapping / macros / recipes) ใช้ร่วมกันทั้งโปรแกรม
+    - get(): คืนสำเนาข้อมูล (แก้ได้อิสระ ต้อง update() เพื่อบันทึก)
+    - update(): เก็บข้อมูลใหม่ + เพิ่มเลข Version + แจ้ง Subscriber ว่าคีย์ไหนเปลี่ยน
+      แล้วส่งต่อให้ json_store เขียนลงดิสก์ (Atomic + หน่วงเวลา + Thread แยก)
+    - section(): มุมมองแบบมีชนิดข้อมูลของ config.json (Cache ตาม Version)
+    """
+
+    DEFAULTS = {
+        "config": setup.DEFAULT_CONFIG,
+        "mapping": {"active_profile": "default", "profiles": {"default": {}}},
+        "macros": {},
+        "recipes": [],
+    }
+
+    def __init__(self, config_dir=None):
+        self._dir = config_dir or setup.CONFIG_DIR
+        self._docs = {}
+        self._versions = {}
+        self._subscribers: Dict[str, List[Callable]] = {}
+        self._sections = {}
+        self._lock = threading.RLock()
+
+    def path(self, name) -> str:
+        return os.path.join(self._dir, f"{name}.json")
+
+    def set_dir(self, config_dir) -> str:
+        """ย้าย Store ไปใช้โฟลเดอร์อื่น (เช่น Benchmark ใช้ Config ชั่วคราว) คืนโฟลเดอร์เดิม
+        ข้อมูลที่โหลดไว้ถูกทิ้ง แล้วอ่านจากโฟลเดอร์ใหม่ตอนใช้ครั้งถัดไป (Version นับต่อ ไม่ย้อนกลับ)"""
+        json_store.flush()
+        with self._lock:
+            previous, self._dir = self._dir, config_dir
+            self._docs.clear()
+            self._sections.clear()
+        return previous
+
+    def _ensure(self, name):
+        if name not in self._docs:
+            default = copy.deepcopy(self.DEFAULTS.get(name, {}))
+            self._docs[name] = json_store.load(self.path(name), default)
+            self._versions[name] = self._versions.get(name, 0) + 1
+        return self._docs[name]
+
+    # --- Read ---
+    def get(self, name):
+        with self._lock:
+            return copy.deepcopy(self._ensure(name))
+
+    def version(self, name) -> int:
+        with self._lock:
+            self._ensure(name)
+            return self._versions[name]
+
+    def section(self, name):
+        """คืน Section ของ config.json เป็น Dataclass (เช่น section("mouse").speed_x)"""
+        with self._lock:
+            version = self.version("config")
+            cached = self._sections.get(name)
+            if cached is None or cached[0] != version:
+                raw = self._docs["config"].get(name, {})
+                cached = (version, _build_section(_SECTION_TYPES[name], raw))
+                self._sections[name] = cached
+            return cached[1]
+
+    # --- Write ---
+    def update(self, name, data, save=True) -> FrozenSet[str]:
+        """แทนที่ข้อมูลทั้งไฟล์ คืนชุดคีย์ที่เปลี่ยน (ว่าง = ไม่มีอะไรเปลี่ยน)"""
+        with self._lock:
+            changed = _diff(self._ensure(name), data)
+            if changed:
+                self._docs[name] = copy.deepcopy(data)
+                self._versions[name] += 1
+                version = self._versions[name]
+                callbacks = list(self._subscribers.get(name, ()))
+        if save and changed:
+            json_store.save(self.path(name), data)
+        if changed:
+            for callback in callbacks:
+                try:
+                    callback(name, version, changed)
+                except Exception as ex:
+                    print(f"⚠️ [Config] Subscriber Error ({name}): {ex}")
+        return changed
+
+    def reload(self, name) -> FrozenSet[str]:
+        """อ่านไฟล์จากดิสก์ใหม่ (กรณีถูกแก้จากโปรแกรมภายนอก) แล้วแจ้งเฉพาะถ้ามีการเปลี่ยน"""
+        json_store.invalidate(self.path(name))
+        with self._lock:
+            default = copy.deepcopy(self._docs.get(name, self.DEFAULTS.get(name, {})))
+        data = json_store.load(self.path(name), default)
+        return self.update(name, data, save=False)
+
+    def read_external(self, name):
+        """อ่าน + Parse ไฟล์ที่ถูกแก้จากภายนอก (ทำบน Thread เบื้องหลัง ยังไม่ Update Store)
+        คืน None ถ้าไม่ใช่การแก้จากภายนอก หรือไฟล์เสีย"""
+        if name not in self.DEFAULTS:
+            return None
+        return json_store.read_external(self.path(name))
+
+    def flush(self):
+        json_store.flush()
+
+    # --- Subscribers ---
+    def subscribe(self, name, callback):
+        """callback(name, version, changed_keys) ถูกเรียกบน Thread ที่สั่ง update()"""
+        with self._lock:
+            self._subscribers.setdefault(name, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                subs = self._subscribers.get(name, [])
+                if callback in subs:
+                    subs.remove(callback)
+
+        return unsubscribe
+
+
+config_store = ConfigStore()
@@ -0,0 +1,37 @@
+import weakref
+
+
+class DeviceStates:
+    """
+    สถานะของ Action แยกต่อจอย (จอยแต่ละตัวมีอุปกรณ์ Output ของตัวเอง ใช้ ui_virtual เป็น Key)
+    - สร้างสถานะด้วย factory() ตอนจอยตัวนั้นเรียกใช้ครั้งแรก
+    - อุปกรณ์ Output ถูกปิดทิ้ง (จอยถูกลบ) สถานะหายไปเอง / จอยถอดแล้วเสียบกลับได้สถานะเดิม
+    - ui_virtual เป็น None (สร้างอุปกรณ์ไม่สำเร็จ): ใช้สถานะสำรองตัวเดียวร่วมกัน
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._states = weakref.WeakKeyDictionary()
+        self._fallback = None
+
+    def get(self, ui_virtual):
+        if ui_virtual is None:
+            if self._fallback is None:
+                self._fallback = self._factory()
+            return self._fallback
+        state = self._states.get(ui_virtual)
+        if state is None:
+            state = self._states[ui_virtual] = self._factory()
+        return state
+
+    def peek(self, ui_virtual):
+        """สถานะของจอยนี้ถ้ามีแล้ว (ไม่สร้างใหม่)"""
+        if ui_virtual is None:
+            return self._fallback
+        return self._states.get(ui_virtual)
+
+    def values(self):
+        states = list(self._states.values())
+        if self._fallback is not None:
+            states.append(self._fallback)
+        return states
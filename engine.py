@@ -1,30 +1,32 @@
+import collections
 import importlib
-import json
 import os
 import sys
 import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
 
 # 🔹 ตั้งค่า Environment สำหรับ Linux/CachyOS
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_JOYSTICK_ALLOW_BACKGROUND_EVENTS"] = "1"
 
-import pygame
+import services
+from action_manifest import load_action_manifest
+from file_watcher import DirectoryWatcher, FileWatcher
+from hotplug import HotplugMonitor
+from input_reader import (
+    EvdevJoystickReader,
+    PygameEventReader,
+    find_gamepad_paths,
+    find_gamepads,
+)
+from config_store import config_store
+from input_snapshot import EdgeTracker, InputSnapshot
+from json_store import json_store
+from startup_profiler import profiler
 from virtual_input import VirtualInput
 
-# ✨ Import ฟังก์ชันจัดการ Mapping จาก utils
-try:
-    from menus.utils import load_mapping
-except ImportError:
-
-    def load_mapping():
-        path = "config/mapping.json"
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {"active_profile": "default", "profiles": {"default": {}}}
-
-
 try:
     from config import setup
 except ImportError:
@@ -32,48 +34,233 @@ except ImportError:
     from config import setup
 
 
+@dataclass(frozen=True)
+class DispatchEntry:
+    """แผนการรัน Action 1 ตัว (สร้างล่วงหน้า ไม่ต้องคำนวณใหม่ทุก Tick)"""
+
+    action_id: str
+    module: Any
+    run: Callable
+    is_blocking: bool
+    mapping: Dict
+
+
+class ControllerSession:
+    """
+    จอย 1 ตัวพร้อมสถานะของมันเอง (Snapshot / Edge / อุปกรณ์ Output)
+    - joystick: pygame Joystick (Backend pygame แบบ Poll)
+    - reader  : EvdevJoystickReader / PygameDevice (อ่านจอยเองบน Thread หรือใน Tick)
+    """
+
+    __slots__ = (
+        "key",
+        "device_no",
+        "joystick",
+        "reader",
+        "counts",
+        "ui_virtual",
+        "snapshot",
+        "edges",
+        "_name",
+        "_rest_axes",
+    )
+
+    def __init__(
+        self, key, device_no, name="", joystick=None, reader=None, counts=(0, 0, 0)
+    ):
+        self.key = key
+        self.device_no = device_no
+        self.joystick = joystick
+        self.reader = reader
+        self.counts: Tuple[int, int, int] = counts
+        self.ui_virtual = None
+        self.snapshot: Optional[InputSnapshot] = None
+        self.edges = EdgeTracker()
+        self._name = name
+        self._rest_axes = ()
+
+    @property
+    def name(self) -> str:
+        return self.reader.name if self.reader else self._name
+
+    @property
+    def connected(self) -> bool:
+        return self.reader.connected if self.reader else self.joystick is not None
+
+    @property
+    def rest_axes(self):
+        return self.reader.rest_axes if self.reader else self._rest_axes
+
+    def reset_input(self):
+        """ล้างสถานะ Input ของจอยที่หลุด (เริ่มนับ Edge ใหม่ตอนเชื่อมต่อกลับ)"""
+        if self.reader is None:
+            self.joystick = None
+            self._rest_axes = ()
+        self.snapshot = None
+        self.edges.reset()
+
+    def capture(self):
+        """อ่านสถานะจอย pygame ของ Tick นี้ (เรียกหลังดึง Event จาก SDL แล้ว)"""
+        joystick = self.joystick
+        snap = InputSnapshot.capture(joystick, *self.counts, name=self._name)
+        if not self._rest_axes:
+            self._rest_axes = snap.axes
+        return snap
+
+
 class JoyConEngine:
     DEFAULT_TICK_RATE = 60
+    IDLE_INTERVAL = 0.5  # วินาที: ไม่มีจอยและไม่มีตัวเฝ้า Hotplug -> Tick ช้า ๆ ไว้หาจอย
     CONFIG_DIR = "config"
     ACTIONS_DIR = "actions"
+    # Reader ของจอยถูกเลือกครั้งเดียวตอนเริ่ม: แก้ค่าเหล่านี้ตอนรันอยู่มีผลหลังเปิดโปรแกรมใหม่
+    RESTART_ONLY = ("system.input_mode", "system.input_backend", "system.input_device")
 
     def __init__(self):
-        self._config_path = os.path.join(self.CONFIG_DIR, "config.json")
-        self._mapping_path = os.path.join(self.CONFIG_DIR, "mapping.json")
-
         self._app_config = {}
         self._mod_mapping = {}
+        self._mapping_version = 0
+        self._config_unsubscribers = ()
+        self._config_watcher = None
+        self._config_updates = collections.deque()  # [(name, data)] จาก Thread Watcher
+        self._wake_callback = None
         self._actions = {}
-        self._joystick = None
-        self._ui_virtual = None
-
-        self._init_configs()
-        self._init_hardware()
-        self._init_virtual_device()
-        self._load_actions()
+        self._modules = {}
+        self._module_watcher = None
+        self._plan_actions = ()
+        self._dispatch_plans = {}  # {profile: (DispatchEntry, ...)}
+        self._busy_checks = ()
+        self._pygame = None
+        self._joy_added = None
+        self._joy_removed = None
+        self._sessions: Dict[Any, ControllerSession] = {}
+        self._parked: Dict[str, list] = {}  # {ชื่อจอย: [Session ที่ถูกถอด]} ไว้คืนสถานะตอนเสียบใหม่
+        self._hotplug = None
+        self._event_reader = None  # โหมด Event ของ SDL: Thread เจ้าของ pygame (จอยทุกตัว)
+        self._current: Optional[ControllerSession] = None
+        self._clock = time.monotonic  # เวลาของ Tick (Benchmark เปลี่ยนเป็นเวลาจำลองได้)
+        self._input_backend = "pygame"
+        self._input_mode = "poll"
+        self._input_device = ""
+
+        # 🔗 ลงทะเบียน Engine ให้ Action / Menu เรียกใช้ได้ทันที
+        services.register("engine", self)
+
+        with profiler.phase("Engine: Config"):
+            self._init_configs()
+            system = config_store.section("system")
+            self._input_backend = system.input_backend
+            self._input_mode = system.input_mode
+            self._input_device = system.input_device
+        with profiler.phase("Engine: Controllers"):
+            if self.get_input_backend() == "evdev":
+                self._init_evdev_readers()
+            elif self.is_event_driven():
+                self._init_event_reader()
+            else:
+                self._init_hardware()
+            self._init_hotplug()
+        with profiler.phase("Engine: Actions"):
+            self._load_actions()
+        if self.is_dev_mode():
+            # 🔧 Dev Mode: Reload Action อัตโนมัติเมื่อไฟล์ถูกแก้ไข
+            self._module_watcher = FileWatcher(self.ACTIONS_DIR, "*.py")
 
     def _init_configs(self):
         setup.initialize_configs()
-        if not os.path.exists(self.CONFIG_DIR):
-            os.makedirs(self.CONFIG_DIR, exist_ok=True)
-        self.reload_mapping_from_disk()
         self._load_app_config()
+        self.refresh_mapping()
+        # 📣 รับแจ้งเตือนเมื่อ Config / Mapping ใน Store กลางเปลี่ยน (จากเมนู หรือไฟล์ภายนอก)
+        self._config_unsubscribers = (
+            config_store.subscribe("config", self._on_config_changed),
+            config_store.subscribe("mapping", self._on_mapping_changed),
+        )
+        # 👀 เฝ้าไฟล์ config/*.json (แก้จาก Editor ภายนอก -> มีผลทันทีโดยไม่ต้อง Poll ใน Tick)
+        self._config_watcher = DirectoryWatcher(
+            setup.CONFIG_DIR, "*.json", self._on_config_files_changed
+        )
+        self._config_watcher.start()
+
+    def _on_config_files_changed(self, paths):
+        """เรียกบน Thread ของ Watcher: อ่าน + Parse ไฟล์ที่นี่ แล้วส่งเข้าคิวให้ Tick ถัดไปสลับใช้"""
+        queued = False
+        for path in paths:
+            name = path.stem
+            if name not in config_store.DEFAULTS:
+                continue
+            data = config_store.read_external(name)
+            if data is None:
+                continue
+            self._config_updates.append((name, data))
+            queued = True
+        if queued:
+            print(f"🔄 [Config] ตรวจพบการแก้ไขไฟล์: {', '.join(p.name for p in paths)}")
+            wake = self._wake_callback
+            if wake:
+                wake()
+
+    def _apply_config_updates(self):
+        """สลับข้อมูลที่ Parse แล้วเข้า Store ระหว่าง Tick (Subscriber ทำงานบน Tick Thread)"""
+        while self._config_updates:
+            name, data = self._config_updates.popleft()
+            if name == "config":
+                # ไฟล์ไม่มีสถานะ Shield (เป็นค่าในแรมเท่านั้น) ให้คงค่าปัจจุบันไว้
+                system = data.setdefault("system", {})
+                if isinstance(system, dict):
+                    system["action_shield"] = config_store.section(
+                        "system"
+                    ).action_shield
+            config_store.update(name, data, save=False)
 
     def _load_app_config(self):
-        try:
-            if os.path.exists(self._config_path):
-                with open(self._config_path, "r", encoding="utf-8") as f:
-                    self._app_config = json.load(f)
-            if "system" not in self._app_config:
-                self._app_config["system"] = {}
-            self._app_config["system"]["action_shield"] = False
-        except:
-            self._app_config = {"system": {"action_shield": False}}
+        self._app_config = config_store.get("config")
+        if not isinstance(self._app_config, dict):
+            self._app_config = {}
+        if "system" not in self._app_config:
+            self._app_config["system"] = {}
+        # Shield เริ่มปิดเสมอ (แก้เฉพาะในแรม ไม่เขียนทับไฟล์)
+        self._app_config["system"]["action_shield"] = False
+        config_store.update("config", self._app_config, save=False)
+
+    def _on_config_changed(self, name, version, changed):
+        self._app_config = config_store.get("config")
+        restart = [key.split(".", 1)[1] for key in self.RESTART_ONLY if key in changed]
+        if restart:
+            print(f"⚠️ [Config] {', '.join(restart)} จะมีผลหลังเปิดโปรแกรมใหม่")
+        # สถานะ Shield เปลี่ยน -> สร้างแผนการรัน Action ใหม่
+        if "system.action_shield" in changed:
+            self._rebuild_dispatch_plan()
+
+    def _on_mapping_changed(self, name, version, changed):
+        if not self._pull_mapping():
+            return
+        # สร้างแผนใหม่เฉพาะเมื่อโปรไฟล์ที่จอยตัวใดตัวหนึ่งใช้อยู่ได้รับผลกระทบ
+        if "active_profile" in changed or "device_profiles" in changed:
+            self._rebuild_dispatch_plan()
+            return
+        in_use = {self._session_profile(s) for s in self._sessions.values()}
+        in_use.add(self._session_profile(None))
+        if any(f"profiles.{name}" in changed for name in in_use):
+            self._rebuild_dispatch_plan()
 
     def reload_mapping_from_disk(self):
-        """✨ โหลด Mapping ใหม่จากไฟล์และ Update แรมทันที"""
-        # print("📥 [Engine] Reloading mapping.json from disk...")
-        raw = load_mapping()
+        """✨ โหลด Mapping ใหม่จากไฟล์ (กรณีไฟล์ถูกแก้จากภายนอก) และ Update แรมทันที"""
+        config_store.reload("mapping")
+        return self._mod_mapping
+
+    def refresh_mapping(self):
+        """✨ ดึง Mapping ล่าสุดจาก Store กลางในแรม (ไม่อ่านดิสก์ / ไม่ทำซ้ำถ้า Version เดิม)"""
+        if self._pull_mapping():
+            self._rebuild_dispatch_plan()
+        return self._mod_mapping
+
+    def _pull_mapping(self):
+        """คัดลอก Mapping จาก Store ถ้ามี Version ใหม่ คืนค่า True เมื่อมีการเปลี่ยน"""
+        version = config_store.version("mapping")
+        if version == self._mapping_version:
+            return False
+        raw = config_store.get("mapping")
+        self._mapping_version = version
 
         if "profiles" not in raw:
             print("🔄 [Engine] Upgrading mapping.json to Profile System...")
@@ -84,24 +271,48 @@ class JoyConEngine:
             self.save_mapping()
         else:
             self._mod_mapping = raw
-
-        return self._mod_mapping
+        return True
+
+    # --- Profile ---
+    def _session_profile(self, session):
+        """โปรไฟล์ของจอยตัวนี้: mapping["device_profiles"][ชื่อจอย] ถ้ามี ไม่งั้นใช้ active_profile"""
+        mapping = self._mod_mapping
+        if session is not None:
+            profile = mapping.get("device_profiles", {}).get(session.name)
+            if profile in mapping.get("profiles", {}):
+                return profile
+        return mapping.get("active_profile", "default")
+
+    def get_active_profile(self):
+        """โปรไฟล์ของจอยที่กำลังประมวลผลอยู่ (นอก Tick = active_profile)"""
+        return self._session_profile(self._current)
+
+    def get_profile_names(self):
+        return list(self._mod_mapping.get("profiles", {}).keys())
+
+    def set_active_profile(self, name):
+        """สลับโปรไฟล์ในแรม + บันทึกลงไฟล์ + สร้างแผนการรัน Action ใหม่"""
+        if name not in self._mod_mapping.get("profiles", {}):
+            return False
+        overrides = self._mod_mapping.get("device_profiles", {})
+        session = self._current
+        if session is not None and session.name in overrides:
+            # จอยที่มีโปรไฟล์ของตัวเอง -> สลับเฉพาะจอยตัวนั้น
+            overrides[session.name] = name
+        else:
+            self._mod_mapping["active_profile"] = name
+        # Store จะแจ้งกลับมาที่ _on_mapping_changed เพื่อสร้างแผนใหม่
+        self.save_mapping()
+        return True
 
     def save_app_config(self):
-        try:
-            with open(self._config_path, "w", encoding="utf-8") as f:
-                json.dump(self._app_config, f, indent=4, ensure_ascii=False)
-            return True
-        except:
-            return False
+        # 💾 อัปเดต Store กลางทันที ส่วนการเขียนไฟล์จะรวบ + ทำบน Thread แยก
+        config_store.update("config", self._app_config)
+        return True
 
     def save_mapping(self):
-        try:
-            with open(self._mapping_path, "w", encoding="utf-8") as f:
-                json.dump(self._mod_mapping, f, indent=4, ensure_ascii=False)
-            return True
-        except:
-            return False
+        config_store.update("mapping", self._mod_mapping)
+        return True
 
     def _load_actions(self):
         if not os.path.exists(self.ACTIONS_DIR):
@@ -110,66 +321,89 @@ class JoyConEngine:
         print("📦 LOADING ACTIONS & SYSTEM MODULES")
         print("-" * 50)
         loaded_count = 0
-        files = sorted(os.listdir(self.ACTIONS_DIR))
-        for filename in files:
-            if not filename.endswith(".py") or filename.startswith("_"):
+        # 📋 อ่าน Metadata จาก Manifest (AST) ก่อน -> Import เฉพาะไฟล์ที่เป็น Action จริง
+        manifest = load_action_manifest(self.ACTIONS_DIR)
+        for mod_name, info in manifest.items():
+            action_id = info.get("id")
+            if not action_id:
                 continue
-            mod_name = filename[:-3]
             try:
+                # Import ครั้งเดียว (ไม่ Reload ซ้ำ)
                 module = importlib.import_module(f"{self.ACTIONS_DIR}.{mod_name}")
-                importlib.reload(module)
-                if hasattr(module, "ACTION_INFO") and hasattr(module, "run"):
-                    action_id = module.ACTION_INFO.get("id")
-                    priority = module.ACTION_INFO.get("priority", 99)
-                    is_block = (
-                        "Yes" if module.ACTION_INFO.get("is_blocking", False) else "No"
-                    )
-                    if action_id:
-                        self._actions[action_id] = module
-                        print(
-                            f" ✅ [{priority:02d}] {action_id:<18} | Block: {is_block}"
-                        )
-                        loaded_count += 1
+                if self._register_action(mod_name, module):
+                    priority = info.get("priority", 99)
+                    is_block = "Yes" if info.get("is_blocking", False) else "No"
+                    print(f" ✅ [{priority:02d}] {action_id:<18} | Block: {is_block}")
+                    loaded_count += 1
             except Exception as ex:
                 print(f" ❌ [Error] {mod_name}: {ex}")
         print("-" * 50)
         print(f"🚀 Total Actions Loaded: {loaded_count}")
         print("=" * 50 + "\n")
+        self._refresh_action_hooks()
 
-    def _init_hardware(self):
-        try:
-            pygame.init()
-            pygame.joystick.init()
-            if pygame.joystick.get_count() > 0:
-                self._joystick = pygame.joystick.Joystick(0)
-                self._joystick.init()
-                print(f"🎮 Hardware Ready: {self._joystick.get_name()}")
-            else:
-                self._joystick = None
-        except Exception as ex:
-            print(f"❌ Hardware Error: {ex}")
+    def _register_action(self, mod_name, module):
+        """เพิ่ม Action เข้า Registry คืนค่า Action ID (None ถ้าไม่ใช่ Action)"""
+        if not (hasattr(module, "ACTION_INFO") and hasattr(module, "run")):
+            return None
+        action_id = module.ACTION_INFO.get("id")
+        if not action_id:
+            return None
+        self._modules[mod_name] = module
+        self._actions[action_id] = module
+        return action_id
+
+    def _unregister_action(self, mod_name):
+        module = self._modules.pop(mod_name, None)
+        if module is not None:
+            self._actions.pop(module.ACTION_INFO.get("id"), None)
+
+    def _refresh_action_hooks(self):
+        # Action ที่ต้องการ Tick ต่อเนื่องแม้ไม่มี Input (เช่น เมนูเปิดอยู่, นับเวลา)
+        self._busy_checks = tuple(
+            m.is_busy
+            for m in self._actions.values()
+            if callable(getattr(m, "is_busy", None))
+        )
+        self._rebuild_dispatch_plan()
 
-    def _init_virtual_device(self):
-        try:
-            self._ui_virtual = VirtualInput(device_name="JoyConMe")
-        except Exception as ex:
-            print(f"❌ Virtual Input Error: {ex}")
+    def get_action_module(self, name):
+        """คืน Action ที่โหลดไว้แล้ว (ค้นจากชื่อไฟล์ หรือ Action ID) โดยไม่ Import ซ้ำ"""
+        return self._modules.get(name) or self._actions.get(name)
 
-    def get_sleep_time(self):
-        rate = self._app_config.get("system", {}).get(
-            "tick_rate", self.DEFAULT_TICK_RATE
-        )
-        return 1.0 / max(1, rate)
+    # --- Dev Mode ---
+    def is_dev_mode(self):
+        return config_store.section("system").dev_hot_reload
 
-    def run_tick(self):
-        if not pygame.get_init():
-            return "EXIT"
-        if self._joystick is None:
-            if pygame.joystick.get_count() > 0:
-                self._init_hardware()
+    def _hot_reload_actions(self):
+        """🔧 Reload เฉพาะไฟล์ Action ที่ถูกแก้ไข (เปิดใช้ผ่าน system.dev_hot_reload)"""
+        changed = self._module_watcher.poll()
+        if not changed:
             return
+        for path in changed:
+            mod_name = path.stem
+            if mod_name.startswith("_"):
+                continue
+            if not path.exists():
+                self._unregister_action(mod_name)
+                print(f"🗑️ [Dev] Removed: {mod_name}")
+                continue
+            try:
+                module = self._modules.get(mod_name)
+                if module is None:
+                    module = importlib.import_module(f"{self.ACTIONS_DIR}.{mod_name}")
+                else:
+                    self._unregister_action(mod_name)
+                    module = importlib.reload(module)
+                if self._register_action(mod_name, module):
+                    print(f"🔁 [Dev] Reloaded: {mod_name}")
+            except Exception as ex:
+                print(f" ❌ [Error] {mod_name}: {ex}")
+        self._refresh_action_hooks()
 
-        pygame.event.pump()
+    def _rebuild_dispatch_plan(self):
+        """✨ เรียง Action ตาม Priority + Shield ไว้ล่วงหน้า แล้วล้างแผนของทุกโปรไฟล์
+        เรียกเฉพาะตอนที่ Action / Profile / Shield เปลี่ยนเท่านั้น"""
         is_shield_active = self._app_config.get("system", {}).get(
             "action_shield", False
         )
@@ -179,25 +413,365 @@ class JoyConEngine:
             self._actions.items(), key=lambda x: x[1].ACTION_INFO.get("priority", 99)
         )
 
+        actions = []
         for action_id, module in sorted_actions:
-            is_blocking_mod = module.ACTION_INFO.get("is_blocking", False)
+            is_blocking_mod = bool(module.ACTION_INFO.get("is_blocking", False))
 
             # --- 🛡️ Shield Check ---
             if is_shield_active and not is_blocking_mod:
                 continue
+            actions.append((action_id, module, is_blocking_mod))
+        self._plan_actions = tuple(actions)
+        self._dispatch_plans = {}
+
+    def _get_dispatch_plan(self, profile):
+        """แผนการรัน Action ของโปรไฟล์หนึ่ง (สร้างครั้งแรกที่ใช้ แล้วเก็บไว้จนกว่าจะ Rebuild)"""
+        plan = self._dispatch_plans.get(profile)
+        if plan is None:
+            prof_data = self._mod_mapping.get("profiles", {}).get(profile, {})
+            plan = tuple(
+                DispatchEntry(
+                    action_id=action_id,
+                    module=module,
+                    run=module.run,
+                    is_blocking=is_blocking,
+                    # ดึง Mapping ตาม Profile (ถ้าไม่มีให้ว่างไว้)
+                    mapping=prof_data.get(action_id, {}),
+                )
+                for action_id, module, is_blocking in self._plan_actions
+            )
+            self._dispatch_plans[profile] = plan
+        return plan
+
+    # --- Controllers ---
+    def _add_session(
+        self, key, name="", joystick=None, reader=None, counts=(0, 0, 0)
+    ):
+        used = {session.device_no for session in self._sessions.values()}
+        used.update(s.device_no for parked in self._parked.values() for s in parked)
+        device_no = next(n for n in range(1, len(used) + 2) if n not in used)
+        session = ControllerSession(key, device_no, name, joystick, reader, counts)
+        # 🖱️ อุปกรณ์ Output เสมือนแยกต่อจอย (ตัวแรกชื่อเดิม "JoyConMe")
+        device_name = "JoyConMe" if device_no == 1 else f"JoyConMe {device_no}"
+        session.ui_virtual = self._create_virtual_device(device_name)
+        self._sessions[key] = session
+        return session
+
+    def _remove_session(self, key):
+        session = self._sessions.pop(key, None)
+        if session is None:
+            return None
+        if session.reader:
+            session.reader.stop()
+        if session.ui_virtual:
+            session.ui_virtual.close()
+        return session
+
+    def _init_hardware(self):
+        try:
+            # โหลด pygame เฉพาะ Backend ที่ต้องใช้ SDL จริงเท่านั้น
+            import pygame
+
+            self._pygame = pygame
+            pygame.init()
+            pygame.joystick.init()
+            # 🔌 Hotplug ผ่าน Event ของ SDL (pygame 2) แทนการนับจอยทุก Tick
+            self._joy_added = getattr(pygame, "JOYDEVICEADDED", None)
+            self._joy_removed = getattr(pygame, "JOYDEVICEREMOVED", None)
+            for index in range(pygame.joystick.get_count()):
+                self._add_pygame_device(index)
+        except Exception as ex:
+            print(f"❌ Hardware Error: {ex}")
+
+    def _add_pygame_device(self, index):
+        pygame = self._pygame
+        try:
+            joystick = pygame.joystick.Joystick(index)
+            joystick.init()
+            key = joystick.get_instance_id()
+            if key in self._sessions:
+                return
+            name = joystick.get_name()
+            counts = (
+                joystick.get_numbuttons(),
+                joystick.get_numaxes(),
+                joystick.get_numhats(),
+            )
+        except pygame.error as ex:
+            print(f"❌ Hardware Error: {ex}")
+            return
+        self._attach_device(key, name, counts, joystick=joystick)
+
+    def _attach_device(self, key, name, counts, joystick=None, reader=None):
+        """จอย pygame ที่เพิ่งเปิด (โหมด Poll / Event): คืน Session เดิมถ้าเคยถูกถอด ไม่งั้นสร้างใหม่"""
+        parked = self._parked.get(name)
+        if parked:
+            # 🔁 จอยเดิมเสียบกลับ: ใช้ Session เดิม (อุปกรณ์ Output / หมายเลขจอย) ได้ทันที
+            session = parked.pop(0)
+            session.key = key
+            session.joystick = joystick
+            session.reader = reader
+            session.counts = counts
+            self._sessions[key] = session
+            print(f"🔁 Controller Reconnected: {name} (#{session.device_no})")
+            return session
+        session = self._add_session(
+            key, name, joystick=joystick, reader=reader, counts=counts
+        )
+        print(f"🎮 Hardware Ready: {session.name} (#{session.device_no})")
+        return session
+
+    def _park_session(self, key):
+        """จอยถูกถอด: เก็บ Session ไว้ (ไม่ปิดอุปกรณ์ Output) รอเสียบกลับ"""
+        session = self._sessions.pop(key, None)
+        if session is None:
+            return
+        session.reset_input()
+        self._parked.setdefault(session.name, []).append(session)
+        print(f"🔌 Controller Removed: {session.name} (#{session.device_no})")
+
+    def _pump_hotplug(self):
+        """ดึง Event ทั้งหมดจาก SDL (กันคิวเต็ม) แล้วจัดการเฉพาะการเสียบ / ถอดจอย"""
+        added, removed = self._joy_added, self._joy_removed
+        for ev in self._pygame.event.get():
+            if ev.type == added:
+                self._add_pygame_device(ev.device_index)
+            elif ev.type == removed:
+                self._park_session(ev.instance_id)
+
+    # --- Hotplug ---
+    def _init_hotplug(self):
+        """🔌 เฝ้า /dev/input แทนการหาจอยทุก Tick (โหมด Event ของ SDL: ได้ JOYDEVICE* ผ่าน Thread อ่านจอย)"""
+        if self._pygame is None and self.get_input_backend() != "evdev":
+            return
+        monitor = HotplugMonitor(self._on_hotplug)
+        if not monitor.start():
+            return
+        self._hotplug = monitor
+        for session in self._sessions.values():
+            if session.reader:
+                # ลองเปิดจอยใหม่เฉพาะตอนที่ Monitor แจ้ง (ไม่สแกนอุปกรณ์ทุกวินาที)
+                session.reader.reconnect_interval = None
+
+    def _on_hotplug(self):
+        # เรียกบน Thread ของ Watcher: ปลุก Tick Loop ที่อาจหลับรอจอยอยู่
+        wake = self._wake_callback
+        if wake:
+            wake()
+
+    def _handle_hotplug(self):
+        if self._pygame is not None:
+            # SDL มักส่ง JOYDEVICEADDED มาเอง ถ้ายังไม่มีจอยเลยให้เปิดเฉพาะ Joystick Subsystem ใหม่
+            if not any(s.connected for s in self._sessions.values()):
+                self._reopen_joystick_subsystem()
+        else:
+            self._rescan_evdev()
+
+    def _reopen_joystick_subsystem(self):
+        pygame = self._pygame
+        try:
+            pygame.joystick.quit()
+            pygame.joystick.init()
+        except pygame.error as ex:
+            print(f"❌ Hardware Error: {ex}")
+            return
+        for index in range(pygame.joystick.get_count()):
+            self._add_pygame_device(index)
+
+    def _rescan_evdev(self):
+        """จอย evdev ที่เพิ่งเสียบ: คืนให้ Session เดิมที่หลุดไปก่อน (ชื่อตรงกัน) ที่เหลือสร้างใหม่"""
+        idle = [s for s in self._sessions.values() if not s.connected]
+        if self._input_device:
+            for session in idle:
+                session.reader.reconnect()
+            return
+        try:
+            pads = find_gamepads()
+        except OSError:
+            return
+        claimed = {s.reader.path for s in self._sessions.values() if s.connected}
+        for path, name in pads:
+            if path in claimed:
+                continue
+            session = next((s for s in idle if s.name == name), None) or next(
+                (s for s in idle if not s.name), None
+            )
+            if session is not None:
+                idle.remove(session)
+                session.reset_input()
+                session.reader.reconnect(path)
+                continue
+            reader = EvdevJoystickReader(self._wake_callback, device_path=path)
+            reader.reconnect_interval = None
+            if self.is_event_driven():
+                reader.start()
+            else:
+                reader.open()
+            self._add_session(path, reader=reader)
+
+    def _init_event_reader(self):
+        """โหมด Event: ให้ Thread แยกเป็นเจ้าของ pygame และคอยรับ Event จาก SDL (จอยทุกตัว)"""
+        reader = PygameEventReader(self._wake_callback)
+        reader.start()
+        self._event_reader = reader
+        self._pump_event_reader()
+
+    def _pump_event_reader(self):
+        """จอยที่ Thread อ่าน Event เพิ่งเปิด / ถอด: สร้าง / พัก Session แบบเดียวกับโหมด Poll"""
+        for kind, item in self._event_reader.drain():
+            if kind == "added":
+                self._attach_device(item.instance_id, item.name, item.counts, reader=item)
+            else:
+                self._park_session(item)
+
+    def _init_evdev_readers(self):
+        """Backend evdev: อ่านจอยตรงจาก /dev/input/event* (ทุกตัวที่พบ) โดยไม่ผ่าน pygame / SDL"""
+        device = self._input_device
+        if device:
+            paths = [device]
+        else:
+            try:
+                paths = find_gamepad_paths()
+            except OSError:
+                paths = []
+        # ไม่พบจอยตอนเริ่ม: เปิด Reader ไว้ 1 ตัวให้หาจอยเองเมื่อเสียบ
+        for path in paths or [None]:
+            reader = EvdevJoystickReader(device_path=path)
+            if self.is_event_driven():
+                reader.start()
+            else:
+                reader.open()
+            self._add_session(path or "evdev", reader=reader)
+
+    def _create_virtual_device(self, device_name):
+        try:
+            return VirtualInput(device_name=device_name)
+        except Exception as ex:
+            print(f"❌ Virtual Input Error: {ex}")
+            return None
+
+    def get_sleep_time(self):
+        rate = config_store.section("system").tick_rate or self.DEFAULT_TICK_RATE
+        return 1.0 / max(1, rate)
+
+    # --- Event-Driven Mode ---
+    def get_input_backend(self):
+        """Backend ที่ใช้อยู่จริง (ค่าตอนเริ่มโปรแกรม ไม่ใช่ค่าล่าสุดใน config.json)"""
+        return self._input_backend
+
+    def is_event_driven(self):
+        return self._input_mode == "event"
+
+    def set_wake_callback(self, callback):
+        """ตั้ง Callback ที่จะถูกเรียก (จาก Thread อ่านจอย / Watcher) เมื่อมีงานให้ Tick"""
+        self._wake_callback = callback
+        if self._event_reader:
+            self._event_reader.set_on_change(callback)
+        for session in self._sessions.values():
+            if session.reader:
+                session.reader.set_on_change(callback)
+
+    def needs_continuous_tick(self):
+        """ต้องรัน Tick ต่อเนื่องหรือไม่ (จอยตัวใดยังไม่อยู่ท่าพัก หรือมี Action กำลังทำงานค้าง)"""
+        for session in self._sessions.values():
+            snap = session.snapshot
+            if snap is not None and not snap.is_idle(session.rest_axes):
+                return True
+        return any(check() for check in self._busy_checks)
+
+    def get_config_watch_backend(self):
+        return self._config_watcher.backend if self._config_watcher else None
+
+    def get_hotplug_backend(self):
+        return self._hotplug.backend if self._hotplug else None
+
+    def get_tick_interval(self):
+        """ช่วงเวลา Tick ที่ต้องการตอนนี้ (วินาที) หรือ None = หยุด Timer รอถูกปลุก"""
+        if not any(s.connected for s in self._sessions.values()):
+            # 💤 ไม่มีจอย: หลับรอ Hotplug / Thread อ่านจอยปลุก (ไม่มีตัวเฝ้า = Tick ช้า ๆ)
+            if self._hotplug or self.is_event_driven():
+                return None
+            return self.IDLE_INTERVAL
+        if self.is_event_driven() and not self.needs_continuous_tick():
+            return None
+        return self.get_sleep_time()
+
+    def get_controller_names(self):
+        return [s.name for s in self._sessions.values() if s.connected]
+
+    def get_controller_name(self):
+        return ", ".join(self.get_controller_names()) or None
+
+    def run_tick(self):
+        if self._config_updates:
+            self._apply_config_updates()
+        if self._module_watcher:
+            self._hot_reload_actions()
+
+        if self._pygame is not None:
+            if not self._pygame.get_init():
+                return "EXIT"
+            self._pump_hotplug()
+        elif self._event_reader is not None:
+            if not self._event_reader.is_alive:
+                return "EXIT"
+            self._pump_event_reader()
+        if self._hotplug and self._hotplug.consume():
+            self._handle_hotplug()
+
+        event_mode = self.is_event_driven()
+        for session in tuple(self._sessions.values()):
+            reader = session.reader
+            if reader is None:
+                # 📸 อ่านสถานะจอยครั้งเดียวต่อ Tick แล้วแชร์ให้ทุก Action
+                try:
+                    session.snapshot = session.capture()
+                except self._pygame.error:
+                    continue
+            elif not event_mode:
+                # 📸 evdev แบบ Poll: อ่าน Event ที่ค้างทั้งก้อนโดยไม่รอ
+                session.snapshot = reader.poll()
+            elif not reader.is_alive:
+                return "EXIT"
+            else:
+                # 📸 ใช้ Snapshot ล่าสุดที่ Thread อ่านจอยเตรียมไว้ (ไม่แตะอุปกรณ์ใน Tick)
+                session.snapshot = reader.consume()
+            if session.snapshot is None:
+                continue
+            if self._run_frame(session) == "EXIT":
+                return "EXIT"
 
+    def _run_frame(self, session):
+        # ⚡ คำนวณ Edge (กด / ปล่อย / กดค้าง / กดสองครั้ง) ครั้งเดียวต่อ Tick ให้ทุก Action ใช้ร่วมกัน
+        session.edges.update(session.snapshot, self._clock())
+        # 📦 รวม Output ทั้ง Tick แล้วส่งทีเดียว (SYN เดียวต่อ Tick ต่อจอย)
+        ui = session.ui_virtual
+        if ui:
+            ui.begin_frame()
+        self._current = session
+        try:
+            return self._dispatch(session)
+        finally:
+            self._current = None
+            if ui:
+                ui.end_frame()
+
+    def _dispatch(self, session):
+        for entry in self._get_dispatch_plan(self._session_profile(session)):
             # 🚀 รัน Action
-            result = self._run_action(action_id, module)
+            result = self._run_action(entry, session)
 
             # --- ⚠️ สัญญาณพิเศษ (Signals) ---
             if result == "EXIT":
                 return "EXIT"
 
             if result == "SAVE_CONFIG":
+                # Store จะแจ้ง _on_config_changed (สร้างแผนใหม่ถ้า Shield เปลี่ยน)
                 self.save_app_config()
 
             if result == "SAVE_MAPPING":
-                self.reload_mapping_from_disk()
+                # เมนูบันทึกผ่าน Store กลางแล้ว ข้อมูลล่าสุดอยู่ในแรม
+                self.refresh_mapping()
                 # ✨ สำคัญ: เมื่อมีการเปลี่ยน Mapping (Profile) ให้หยุดการทำงานในเฟรมนี้ทันที
                 # เพื่อป้องกันปุ่มเก่าค้าง หรือการส่งสัญญาณซ้ำซ้อน
                 break
@@ -207,23 +781,34 @@ class JoyConEngine:
             if result is True or isinstance(result, str):
                 break
 
-    def _run_action(self, action_id, module):
-        # 🚨 ดึงข้อมูลจากแรมชุดล่าสุดเสมอ
-        active_prof = self._mod_mapping.get("active_profile", "default")
-        prof_data = self._mod_mapping.get("profiles", {}).get(active_prof, {})
-
-        # ดึง Mapping ตาม Profile (ถ้าไม่มีให้ว่างไว้)
-        mapping = prof_data.get(action_id, {})
-
+    def _run_action(self, entry, session):
         try:
-            return module.run(
-                self._ui_virtual, self._joystick, self._app_config, mapping
+            return entry.run(
+                session.ui_virtual, session.snapshot, self._app_config, entry.mapping
             )
         except Exception as e:
             return None
 
     def cleanup(self):
-        if self._ui_virtual:
-            self._ui_virtual.close()
-        pygame.quit()
+        services.unregister("engine", self)
+        if self._config_watcher:
+            self._config_watcher.stop()
+        for unsubscribe in self._config_unsubscribers:
+            unsubscribe()
+        if self._hotplug:
+            self._hotplug.stop()
+        for key in list(self._sessions):
+            self._remove_session(key)
+        # Thread อ่านจอยจะเรียก pygame.quit() เองก่อนจบ (โหมด Event ของ SDL)
+        if self._event_reader:
+            self._event_reader.stop()
+        for parked in self._parked.values():
+            for session in parked:
+                if session.ui_virtual:
+                    session.ui_virtual.close()
+        self._parked.clear()
+        if self._pygame:
+            self._pygame.quit()
+        # 💾 เขียน Config ที่ยังค้างคิวลงดิสก์ก่อนปิด
+        json_store.flush()
         print("👋 Engine ปิดตัวเรียบร้อย")
@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+
+from config_store import config_store
+from tick_scheduler import TickScheduler
+
+
+class EngineThread:
+    """
+    รัน Engine Tick บน Thread ของตัวเอง แยกจาก GUI Thread ของ Qt
+    (การวาด Overlay / Event ของ Qt ไม่หน่วงการอ่านจอยอีกต่อไป)
+    - เดิน Tick ตาม Deadline ของ TickScheduler (สถิติ Jitter / Overrun อ่านได้จาก .scheduler)
+    - get_tick_interval() เป็น None: หลับรอ wake() จาก Thread อ่านจอย / Hotplug / Config
+    - on_exit() ถูกเรียกบน Engine Thread เมื่อ Engine ขอปิดโปรแกรม (ผู้เรียกส่งต่อเข้า GUI เอง)
+    """
+
+    NICE = -10  # Linux: ขอ Priority สูงกว่าปกติ (ต้องมีสิทธิ์ CAP_SYS_NICE ไม่งั้นข้ามไป)
+
+    def __init__(self, engine, on_exit=None):
+        self._engine = engine
+        self._on_exit = on_exit
+        self._wake = threading.Event()
+        system = config_store.section("system")
+        self.scheduler = TickScheduler(
+            engine.get_sleep_time(),
+            spin=system.tick_spin_us / 1e6,
+            catch_up=system.tick_catch_up,
+        )
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="JoyConMe-Engine", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._running = False
+        self._wake.set()
+        thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+    def wake(self):
+        """ปลุกให้ Tick ทันที (เรียกจาก Thread ไหนก็ได้)"""
+        self._wake.set()
+
+    def _raise_priority(self):
+        if not hasattr(os, "setpriority"):
+            return
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.NICE)
+        except OSError:
+            pass
+
+    def _tick(self):
+        engine = self._engine
+        try:
+            result = engine.run_tick()
+        except Exception as e:
+            print(f"⚠️ Error in engine tick loop: {e}")
+            return True
+        if result == "EXIT":
+            print("\n🛑 [Engine] Received EXIT signal. Closing...")
+            self._running = False
+            if self._on_exit:
+                self._on_exit()
+            return False
+        if result == "SAVE_CONFIG":
+            engine.save_app_config()
+        return True
+
+    def _run(self):
+        self._raise_priority()
+        wake = self._wake
+        scheduler = self.scheduler
+        clock = time.perf_counter
+        scheduler.reset()
+        while self._running:
+            started = clock()
+            if not self._tick():
+                break
+            scheduler.record_work(clock() - started)
+
+            interval = self._engine.get_tick_interval()
+            if interval is None:
+                # 💤 ไม่มีงาน: หลับจนกว่าจะถูกปลุก แล้วเริ่มจังหวะใหม่
+                wake.wait()
+                wake.clear()
+                scheduler.reset()
+                continue
+            scheduler.set_interval(interval)
+            system = config_store.section("system")
+            scheduler.configure(system.tick_spin_us / 1e6, system.tick_catch_up)
+            # ถูกปลุกก่อนเวลา (จอยเปลี่ยนสถานะ): Tick ทันที Deadline ของรอบปกติยังคงเดิม
+            scheduler.wait(wake)
@@ -0,0 +1,171 @@
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+class FileWatcher:
+    """
+    เฝ้าดูไฟล์ในโฟลเดอร์ (ตาม pattern) แล้วบอกว่าไฟล์ไหนถูกแก้ไข / เพิ่ม / ลบ
+    - เทียบ mtime ของไฟล์ ไม่อ่านเนื้อหา
+    - poll() เช็คจริงไม่เกินรอบละ interval วินาที (เรียกถี่ ๆ จาก Tick ได้)
+    """
+
+    def __init__(self, directory, pattern="*", interval=1.0):
+        self._directory = Path(directory)
+        self._pattern = pattern
+        self._interval = interval
+        self._checked_at = time.monotonic()
+        self._mtimes = self._scan()
+
+    def _scan(self):
+        mtimes = {}
+        for path in self._directory.glob(self._pattern):
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return mtimes
+
+    def poll(self):
+        """คืนรายการไฟล์ที่เปลี่ยนตั้งแต่ครั้งก่อน (ว่างถ้ายังไม่ถึงรอบเช็ค)"""
+        now = time.monotonic()
+        if now - self._checked_at < self._interval:
+            return []
+        self._checked_at = now
+
+        current = self._scan()
+        changed = [p for p, m in current.items() if self._mtimes.get(p) != m]
+        changed += [p for p in self._mtimes if p not in current]
+        self._mtimes = current
+        return sorted(changed)
+
+
+# --- inotify (Linux) ---
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_EVENT = struct.Struct("iIII")
+
+# ไฟล์ถูกเขียนเสร็จ / rename ทับ / ลบ (เช่น ไฟล์ Config)
+FILE_EVENTS = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+# Device Node ถูกสร้าง / เปลี่ยนสิทธิ์ (udev ตั้ง Permission ทีหลัง) / ถูกลบ (เช่น /dev/input)
+DEVICE_EVENTS = _IN_CREATE | _IN_ATTRIB | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+
+
+def _open_inotify(directory, mask=FILE_EVENTS):
+    """เปิด inotify ผ่าน libc (คืน fd หรือ None ถ้าระบบไม่รองรับ)"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(str(directory)), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+class DirectoryWatcher:
+    """
+    Thread เฝ้าโฟลเดอร์แล้วเรียก callback(paths) เมื่อไฟล์ที่ตรง pattern ถูกแก้ไข
+    - Linux: ใช้ inotify (หลับรอ Event จาก Kernel ไม่มีการ Poll)
+    - ระบบอื่น / inotify ใช้ไม่ได้: Poll ด้วย FileWatcher บน Thread นี้แทน
+    callback ถูกเรียกบน Thread ของ Watcher (ไม่ใช่ Tick Thread)
+    """
+
+    DEBOUNCE = 0.02  # วินาที: รวบ Event ที่มาติด ๆ กัน (เช่น เขียน + rename)
+    WAIT_TIMEOUT = 0.5
+
+    def __init__(
+        self, directory, pattern, callback, poll_interval=1.0, events=FILE_EVENTS
+    ):
+        self._directory = Path(directory)
+        self._pattern = pattern
+        self._callback = callback
+        self._poll_interval = poll_interval
+        self._events = events
+        self._fd = None
+        self._running = False
+        self._thread = None
+        self.backend = None
+
+    def start(self):
+        self._fd = _open_inotify(self._directory, self._events)
+        self.backend = "inotify" if self._fd is not None else "polling"
+        self._running = True
+        target = self._run_inotify if self._fd is not None else self._run_polling
+        self._thread = threading.Thread(
+            target=target, name="JoyConMe-Watch", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _emit(self, paths):
+        if paths:
+            try:
+                self._callback(sorted(paths))
+            except Exception as ex:
+                print(f"⚠️ [Watch] Callback Error: {ex}")
+
+    def _run_polling(self):
+        watcher = FileWatcher(self._directory, self._pattern, self._poll_interval)
+        while self._running:
+            time.sleep(min(self._poll_interval, self.WAIT_TIMEOUT))
+            self._emit(watcher.poll())
+
+    def _run_inotify(self):
+        fd = self._fd
+        while self._running:
+            readable, _, _ = select.select([fd], [], [], self.WAIT_TIMEOUT)
+            if not readable:
+                continue
+            # รอสั้น ๆ ให้ Event ที่ตามมาติด ๆ เข้าคิวก่อน แล้วอ่านทีเดียว
+            time.sleep(self.DEBOUNCE)
+            changed = set()
+            overflow = False
+            while True:
+                try:
+                    buf = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    break
+                if not buf:
+                    break
+                offset = 0
+                while offset + _IN_EVENT.size <= len(buf):
+                    _, mask, _, length = _IN_EVENT.unpack_from(buf, offset)
+                    offset += _IN_EVENT.size
+                    raw = buf[offset : offset + length].rstrip(b"\0")
+                    offset += length
+                    if mask & _IN_Q_OVERFLOW:
+                        overflow = True
+                    elif raw:
+                        path = self._directory / os.fsdecode(raw)
+                        if path.match(self._pattern):
+                            changed.add(path)
+            if overflow:
+                # คิว Event ล้น: ถือว่าทุกไฟล์อาจเปลี่ยน
+                changed.update(self._directory.glob(self._pattern))
+            self._emit(changed)
@@ -0,0 +1,55 @@
+import os
+import threading
+
+from file_watcher import DEVICE_EVENTS, DirectoryWatcher
+
+
+class HotplugMonitor:
+    """
+    เฝ้า /dev/input แล้วแจ้งเมื่อมีอุปกรณ์ถูกเสียบ / ถอด / ได้สิทธิ์เข้าถึง
+    - Linux: inotify (หลับรอ Kernel) / ระบบอื่นที่มีโฟลเดอร์นี้: Poll บน Thread ของ Watcher
+    - on_change() ถูกเรียกบน Thread ของ Watcher (ใช้ปลุก Tick Loop ที่หลับรอจอยอยู่)
+    - Engine เรียก consume() ใน Tick เพื่อรู้ว่าต้องหาจอยใหม่หรือไม่ (ไม่มีการสแกนทุก Tick)
+    """
+
+    DEVICE_DIR = "/dev/input"
+
+    def __init__(self, on_change=None, device_dir=None):
+        self._on_change = on_change
+        self._device_dir = device_dir or self.DEVICE_DIR
+        self._pending = threading.Event()
+        self._watcher = None
+
+    def start(self) -> bool:
+        if not os.path.isdir(self._device_dir):
+            return False
+        self._watcher = DirectoryWatcher(
+            self._device_dir, "event*", self._on_paths, events=DEVICE_EVENTS
+        )
+        self._watcher.start()
+        return True
+
+    def stop(self):
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+    @property
+    def active(self) -> bool:
+        return self._watcher is not None
+
+    @property
+    def backend(self):
+        return self._watcher.backend if self._watcher else None
+
+    def consume(self) -> bool:
+        """คืน True ถ้ามีการเปลี่ยนแปลงตั้งแต่ครั้งก่อน (แล้วล้างสถานะ)"""
+        if not self._pending.is_set():
+            return False
+        self._pending.clear()
+        return True
+
+    def _on_paths(self, paths):
+        self._pending.set()
+        if self._on_change:
+            self._on_change()
@@ -0,0 +1,520 @@
+import threading
+import time
+
+from input_snapshot import InputSnapshot
+
+# Event ที่ถือว่า "สถานะจอยเปลี่ยน"
+_JOY_EVENT_NAMES = ("JOYBUTTONDOWN", "JOYBUTTONUP", "JOYAXISMOTION", "JOYHATMOTION")
+
+
+class PygameDevice:
+    """
+    จอย 1 ตัวในโหมด Event ของ SDL (ใช้เป็น Reader ของ Session ใน Engine)
+    Thread ของ PygameEventReader เป็นคนอ่านค่า / อัปเดต Snapshot ให้ Engine แค่ consume()
+    """
+
+    def __init__(self, hub, instance_id, joystick):
+        self._hub = hub
+        self._joystick = joystick
+        self.instance_id = instance_id
+        self.name = joystick.get_name()
+        self.counts = (
+            joystick.get_numbuttons(),
+            joystick.get_numaxes(),
+            joystick.get_numhats(),
+        )
+        self._snapshot = self._capture()
+        self.rest_axes = self._snapshot.axes if self._snapshot else ()
+
+    @property
+    def connected(self) -> bool:
+        return self._joystick is not None
+
+    @property
+    def is_alive(self) -> bool:
+        return self._hub.is_alive
+
+    def set_on_change(self, callback):
+        self._hub.set_on_change(callback)
+
+    def stop(self):
+        pass  # Thread / pygame เป็นของ PygameEventReader (Engine สั่งหยุดที่ตัวนั้น)
+
+    def consume(self):
+        """คืน Snapshot ล่าสุดที่ Thread อ่าน Event เตรียมไว้ (เรียกจาก Engine ทุก Tick)"""
+        with self._hub._lock:
+            return self._snapshot
+
+    def _capture(self):
+        if self._joystick is None:
+            return None
+        try:
+            return InputSnapshot.capture(self._joystick, *self.counts, name=self.name)
+        except Exception:
+            return None
+
+    def _publish(self):
+        snap = self._capture()
+        with self._hub._lock:
+            self._snapshot = snap
+
+    def _close(self):
+        self._joystick = None
+        with self._hub._lock:
+            self._snapshot = None
+
+
+class PygameEventReader:
+    """
+    อ่าน Event จอยจาก SDL (JOYBUTTON/JOYAXIS/JOYHAT) ของจอยทุกตัวบน Thread แยก
+    - Thread นี้เป็นเจ้าของ pygame ทั้งหมด (init / pump / อ่านค่า) ในโหมด Event
+    - แยก Event ตาม instance_id ไปยัง PygameDevice ของจอยแต่ละตัว (อัปเดตเฉพาะตัวที่มี Event)
+    - จอยเสียบ / ถอด: เข้าคิวให้ Engine ดึงผ่าน drain() แล้วสร้าง / พัก Session บน Tick Thread
+    - เรียก on_change() เพื่อปลุก Engine (รวบหลาย Event เป็นการปลุกครั้งเดียว)
+    """
+
+    WAIT_TIMEOUT_MS = 250
+
+    def __init__(self, on_change=None):
+        self._on_change = on_change
+        self._devices = {}  # {instance_id: PygameDevice} (แก้เฉพาะบน Thread อ่าน Event)
+        self._hotplug = []  # [("added", PygameDevice) | ("removed", instance_id)]
+        self._pending = False
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._running = False
+        self._thread = None
+
+    # --- Public API ---
+    def start(self, timeout=2.0):
+        """เริ่ม Thread แล้วรอให้เปิดจอยรอบแรกเสร็จ (ไม่เกิน timeout วินาที)"""
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="JoyConMe-Input", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait(timeout)
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def set_on_change(self, callback):
+        self._on_change = callback
+
+    @property
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def drain(self):
+        """คืนจอยที่เสียบ / ถอดตั้งแต่ครั้งก่อน และรีเซ็ตสถานะ "รอปลุก" (เรียกจาก Engine ทุก Tick)"""
+        with self._lock:
+            self._pending = False
+            events, self._hotplug = self._hotplug, []
+        return events
+
+    # --- Reader Thread ---
+    def _run(self):
+        import pygame
+
+        try:
+            pygame.init()
+            pygame.joystick.init()
+            for index in range(pygame.joystick.get_count()):
+                self._open(pygame, index)
+        except Exception as ex:
+            print(f"❌ [Input] Hardware Error: {ex}")
+        finally:
+            self._ready.set()
+
+        joy_events = {getattr(pygame, n) for n in _JOY_EVENT_NAMES}
+        added = getattr(pygame, "JOYDEVICEADDED", None)
+        removed = getattr(pygame, "JOYDEVICEREMOVED", None)
+        devices = self._devices
+
+        while self._running:
+            # 💤 หลับรอ Event จาก SDL (ไม่มีการ Poll สถานะตลอดเวลา)
+            first = pygame.event.wait(self.WAIT_TIMEOUT_MS)
+            if first.type == pygame.NOEVENT:
+                continue
+
+            changed = set()
+            hotplug = False
+            for ev in [first] + pygame.event.get():
+                if ev.type in joy_events:
+                    device = devices.get(getattr(ev, "instance_id", None))
+                    if device is not None:
+                        changed.add(device)
+                elif ev.type == added:
+                    hotplug = self._open(pygame, ev.device_index) or hotplug
+                elif ev.type == removed:
+                    hotplug = self._close(ev.instance_id) or hotplug
+
+            for device in changed:
+                device._publish()
+            if changed or hotplug:
+                self._wake()
+
+        pygame.quit()
+
+    def _open(self, pygame, index) -> bool:
+        try:
+            joystick = pygame.joystick.Joystick(index)
+            joystick.init()
+            instance_id = joystick.get_instance_id()
+            if instance_id in self._devices:
+                return False  # SDL แจ้ง JOYDEVICEADDED ซ้ำสำหรับจอยที่เปิดตอนเริ่มแล้ว
+            device = PygameDevice(self, instance_id, joystick)
+        except pygame.error as ex:
+            print(f"❌ [Input] Hardware Error: {ex}")
+            return False
+        self._devices[instance_id] = device
+        with self._lock:
+            self._hotplug.append(("added", device))
+        return True
+
+    def _close(self, instance_id) -> bool:
+        device = self._devices.pop(instance_id, None)
+        if device is None:
+            return False
+        device._close()
+        with self._lock:
+            self._hotplug.append(("removed", instance_id))
+        return True
+
+    def _wake(self):
+        with self._lock:
+            should_wake = not self._pending
+            self._pending = True
+        if should_wake and self._on_change:
+            self._on_change()
+
+
+def find_gamepads():
+    """หา /dev/input/event* ทุกตัวที่เป็นจอย (มีปุ่ม BTN_GAMEPAD/BTN_JOYSTICK และแกน ABS)
+    คืน [(path, ชื่ออุปกรณ์), ...]"""
+    from evdev import InputDevice, ecodes, list_devices
+
+    pad_buttons = {ecodes.BTN_GAMEPAD, ecodes.BTN_JOYSTICK}
+    pads = []
+    for path in sorted(list_devices()):
+        try:
+            device = InputDevice(path)
+        except OSError:
+            continue
+        try:
+            caps = device.capabilities()
+            keys = set(caps.get(ecodes.EV_KEY, ()))
+            if keys & pad_buttons and ecodes.EV_ABS in caps:
+                pads.append((path, device.name))
+        finally:
+            device.close()
+    return pads
+
+
+def find_gamepad_paths():
+    return [path for path, _ in find_gamepads()]
+
+
+def find_gamepad_path():
+    """หา /dev/input/event* ตัวแรกที่เป็นจอย"""
+    paths = find_gamepad_paths()
+    return paths[0] if paths else None
+
+
+class EvdevJoystickReader:
+    """
+    อ่านจอยตรงจาก /dev/input/event* ผ่าน evdev (ไม่ต้องใช้ pygame / SDL)
+    - อ่านแบบ Non-blocking ทีละก้อน (read() ครั้งเดียวได้หลาย Event)
+    - เก็บสถานะปุ่ม/แกน/Hat เองในแรม แล้วสร้าง InputSnapshot เมื่อจบ SYN_REPORT
+    - ลำดับปุ่ม/แกน/Hat เหมือน SDL เพื่อให้ Mapping เดิมใช้ได้ทันที
+    ใช้ได้ 2 แบบ: start() = Thread รอ Event (โหมด Event), poll() = อ่านใน Tick (โหมด Poll)
+    device_path ระบุเองได้ (เช่น จอยปลอมที่สร้างจาก uinput) ถ้าไม่ระบุจะหาจอยตัวแรกให้
+    """
+
+    WAIT_TIMEOUT = 0.25
+    RECONNECT_INTERVAL = 1.0  # None = ลองเปิดใหม่เฉพาะเมื่อถูกสั่ง reconnect() (มี Hotplug Monitor)
+
+    def __init__(self, on_change=None, device_path=None):
+        from evdev import ecodes
+
+        self._ecodes = ecodes
+        self._on_change = on_change
+        self._device_path = device_path
+        self._device = None
+        self._button_index = {}
+        self._axis_index = {}
+        self._axis_range = {}
+        self._hat_index = {}
+        self._buttons = 0
+        self._axes = []
+        self._hats = []
+        self._dirty = False
+        self._snapshot = None
+        self._pending = False
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._running = False
+        self._thread = None
+        self._next_retry = 0.0
+        self._wake = threading.Event()
+        self.reconnect_interval = self.RECONNECT_INTERVAL
+        self.path = device_path
+        self.name = ""
+        self.rest_axes = ()
+
+    # --- Public API ---
+    def open(self):
+        """เปิดอุปกรณ์ (ถ้ายังไม่เปิด) คืนค่า True เมื่อพร้อมใช้งาน"""
+        if self._device is not None:
+            return True
+        now = time.monotonic()
+        if now < self._next_retry:
+            return False
+        interval = self.reconnect_interval
+        self._next_retry = float("inf") if interval is None else now + interval
+        try:
+            self._open()
+        except Exception as ex:
+            print(f"❌ [Input] Hardware Error: {ex}")
+            self._close()
+        return self._device is not None
+
+    def start(self, timeout=2.0):
+        """เริ่ม Thread แล้วรอให้เปิดจอยรอบแรกเสร็จ (ไม่เกิน timeout วินาที)"""
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="JoyConMe-Input", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait(timeout)
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._close()
+
+    def set_on_change(self, callback):
+        self._on_change = callback
+
+    def reconnect(self, device_path=None):
+        """ให้ลองเปิดอุปกรณ์ใหม่ทันที (Hotplug) ระบุ device_path เพื่อผูกกับอุปกรณ์ที่เพิ่งเสียบได้"""
+        if device_path:
+            self._device_path = device_path
+        self._next_retry = 0.0
+        self._wake.set()
+
+    @property
+    def connected(self) -> bool:
+        return self._device is not None
+
+    @property
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def consume(self):
+        """คืน Snapshot ล่าสุด และรีเซ็ตสถานะ "รอปลุก" (เรียกจาก Engine ทุก Tick)"""
+        with self._lock:
+            self._pending = False
+            return self._snapshot
+
+    def poll(self):
+        """โหมด Poll: อ่าน Event ที่ค้างอยู่ทั้งหมดแบบไม่รอ แล้วคืน Snapshot ล่าสุด"""
+        if not self.open():
+            return None
+        self._drain()
+        with self._lock:
+            return self._snapshot
+
+    # --- Reader Thread ---
+    def _run(self):
+        import select
+
+        self.open()
+        self._ready.set()
+
+        while self._running:
+            device = self._device
+            if device is None:
+                # 💤 รอจนถึงรอบลองใหม่ หรือถูกปลุกด้วย reconnect()
+                self._wake.wait(self.WAIT_TIMEOUT)
+                self._wake.clear()
+                if self.open():
+                    self._publish()
+                continue
+
+            # 💤 หลับรอจน fd อ่านได้ (ไม่มีการ Poll สถานะตลอดเวลา)
+            try:
+                readable, _, _ = select.select([device.fd], [], [], self.WAIT_TIMEOUT)
+            except (OSError, ValueError):
+                readable = True
+            if readable and self._drain():
+                self._publish()
+
+    # --- Device ---
+    def _open(self):
+        from evdev import InputDevice
+
+        ecodes = self._ecodes
+        path = self._device_path or find_gamepad_path()
+        if path is None:
+            return
+        device = InputDevice(path)
+        caps = device.capabilities(absinfo=True)
+
+        # 🔢 ลำดับปุ่มแบบ SDL: BTN_JOYSTICK ขึ้นไปก่อน แล้วตามด้วยช่วง BTN_MISC
+        keys = sorted(caps.get(ecodes.EV_KEY, ()))
+        ordered = [c for c in keys if c >= ecodes.BTN_JOYSTICK] + [
+            c for c in keys if ecodes.BTN_MISC <= c < ecodes.BTN_JOYSTICK
+        ]
+        self._button_index = {code: i for i, code in enumerate(ordered)}
+
+        hat_codes = range(ecodes.ABS_HAT0X, ecodes.ABS_HAT3Y + 1)
+        self._axis_index = {}
+        self._axis_range = {}
+        self._hat_index = {}
+        axes = []
+        hats = {}
+        for code, info in sorted(caps.get(ecodes.EV_ABS, ())):
+            if code in hat_codes:
+                hat, offset = divmod(code - ecodes.ABS_HAT0X, 2)
+                hats.setdefault(hat, [0, 0])[offset] = self._hat_value(offset, info.value)
+                continue
+            self._axis_index[code] = len(axes)
+            self._axis_range[code] = (info.min, info.max)
+            axes.append(self._normalize(code, info.value))
+
+        # Hat ที่มีแค่แกนเดียวก็นับเป็น 1 Hat (เหมือน SDL)
+        hat_slots = sorted(hats)
+        for i, hat in enumerate(hat_slots):
+            self._hat_index[ecodes.ABS_HAT0X + hat * 2] = (i, 0)
+            self._hat_index[ecodes.ABS_HAT0X + hat * 2 + 1] = (i, 1)
+
+        active = set(device.active_keys())
+        mask = 0
+        for code, i in self._button_index.items():
+            if code in active:
+                mask |= 1 << i
+
+        self._buttons = mask
+        self._axes = axes
+        self._hats = [tuple(hats[h]) for h in hat_slots]
+        self._device = device
+        self.path = path
+        self.name = device.name
+        self.rest_axes = tuple(axes)
+        self._dirty = True
+        self._commit()
+        print(f"🎮 Hardware Ready: {self.name} ({path})")
+
+    def _close(self):
+        device, self._device = self._device, None
+        if device is not None:
+            try:
+                device.close()
+            except OSError:
+                pass
+        with self._lock:
+            self._snapshot = None
+
+    def _normalize(self, code, value):
+        lo, hi = self._axis_range[code]
+        if hi <= lo:
+            return 0.0
+        return max(-1.0, min(1.0, (value - lo) * 2.0 / (hi - lo) - 1.0))
+
+    @staticmethod
+    def _hat_value(offset, value):
+        sign = (value > 0) - (value < 0)
+        # evdev: แกน Y ติดลบ = ขึ้น / SDL & pygame: y = +1 คือขึ้น
+        return -sign if offset == 1 else sign
+
+    # --- Event Processing ---
+    def _drain(self):
+        """อ่าน Event ที่ค้างทั้งหมด คืนค่า True ถ้ามี Frame ใหม่ (SYN_REPORT) เข้ามา"""
+        ecodes = self._ecodes
+        committed = False
+        try:
+            for ev in self._device.read():
+                etype = ev.type
+                if etype == ecodes.EV_KEY:
+                    i = self._button_index.get(ev.code)
+                    if i is not None:
+                        if ev.value:
+                            self._buttons |= 1 << i
+                        else:
+                            self._buttons &= ~(1 << i)
+                        self._dirty = True
+                elif etype == ecodes.EV_ABS:
+                    slot = self._hat_index.get(ev.code)
+                    if slot is not None:
+                        i, offset = slot
+                        hat = list(self._hats[i])
+                        hat[offset] = self._hat_value(offset, ev.value)
+                        self._hats[i] = tuple(hat)
+                        self._dirty = True
+                    else:
+                        i = self._axis_index.get(ev.code)
+                        if i is not None:
+                            self._axes[i] = self._normalize(ev.code, ev.value)
+                            self._dirty = True
+                elif etype == ecodes.EV_SYN:
+                    if ev.code == ecodes.SYN_REPORT:
+                        committed = self._commit() or committed
+                    elif ev.code == ecodes.SYN_DROPPED:
+                        # Buffer ล้น: ข้อมูลไม่ครบ ให้อ่านสถานะจริงจาก Kernel ใหม่
+                        self._resync()
+        except BlockingIOError:
+            pass
+        except OSError:
+            # 🔌 จอยถูกถอด
+            print(f"🔌 [Input] Disconnected: {self.name}")
+            self._close()
+            return True
+        return committed
+
+    def _resync(self):
+        device = self._device
+        active = set(device.active_keys())
+        mask = 0
+        for code, i in self._button_index.items():
+            if code in active:
+                mask |= 1 << i
+        self._buttons = mask
+        for code, i in self._axis_index.items():
+            self._axes[i] = self._normalize(code, device.absinfo(code).value)
+        for code, (i, offset) in self._hat_index.items():
+            try:
+                value = device.absinfo(code).value
+            except OSError:
+                continue
+            hat = list(self._hats[i])
+            hat[offset] = self._hat_value(offset, value)
+            self._hats[i] = tuple(hat)
+        self._dirty = True
+
+    def _commit(self):
+        if not self._dirty:
+            return False
+        self._dirty = False
+        snap = InputSnapshot(
+            self._buttons,
+            tuple(self._axes),
+            tuple(self._hats),
+            len(self._button_index),
+            self.name,
+        )
+        with self._lock:
+            self._snapshot = snap
+        return True
+
+    def _publish(self):
+        with self._lock:
+            should_wake = not self._pending
+            self._pending = True
+        if should_wake and self._on_change:
+            self._on_change()
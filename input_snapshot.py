@@ -0,0 +1,208 @@
+from typing import Tuple
+
+# --- Bit ของทิศ Hat (Hat ละ 4 Bit: hat_bits >> (4 * i)) ---
+HAT_UP = 1
+HAT_DOWN = 2
+HAT_LEFT = 4
+HAT_RIGHT = 8
+
+
+def hat_direction_bits(x: int, y: int) -> int:
+    """แปลงทิศ Hat (x, y) แบบ pygame (y = +1 คือขึ้น) เป็น Bit ทิศของ Hat 1 ตัว"""
+    bits = 0
+    if x < 0:
+        bits |= HAT_LEFT
+    elif x > 0:
+        bits |= HAT_RIGHT
+    if y > 0:
+        bits |= HAT_UP
+    elif y < 0:
+        bits |= HAT_DOWN
+    return bits
+
+
+class InputSnapshot:
+    """
+    ภาพสถานะจอยของ 1 Tick (อ่านจาก SDL รอบเดียว แล้วแชร์ให้ทุก Action)
+    - buttons : Bitmask ของปุ่ม (bit i = ปุ่ม i ถูกกด)
+    - axes    : ค่าแกนทั้งหมด
+    - hats    : ค่า Hat / D-Pad ทั้งหมด
+    - hat_bits: Bitmask ทิศของทุก Hat (ใช้เช็ค Binding แบบ Bitmask ได้ทันที)
+    - prev_* / long_* / double_tapped: Edge ของ Tick นี้ (Engine เติมให้ผ่าน EdgeTracker)
+    - time    : เวลาของ Tick นี้จากนาฬิกาของ Engine (Action ที่คิดตามเวลาใช้ค่านี้แทนอ่านนาฬิกาเอง)
+    มี Getter ชื่อเดียวกับ pygame Joystick เพื่อให้ Action เดิมใช้แทนกันได้ทันที
+    """
+
+    __slots__ = (
+        "buttons",
+        "axes",
+        "hats",
+        "hat_bits",
+        "num_buttons",
+        "name",
+        "prev_buttons",
+        "prev_hat_bits",
+        "prev_axes",
+        "long_held",
+        "long_pressed",
+        "double_tapped",
+        "time",
+    )
+
+    def __init__(
+        self,
+        buttons: int = 0,
+        axes: Tuple[float, ...] = (),
+        hats: Tuple[Tuple[int, int], ...] = (),
+        num_buttons: int = 0,
+        name: str = "",
+    ):
+        self.buttons = buttons
+        self.axes = axes
+        self.hats = hats
+        bits = 0
+        for i, (x, y) in enumerate(hats):
+            if x or y:
+                bits |= hat_direction_bits(x, y) << (4 * i)
+        self.hat_bits = bits
+        self.num_buttons = num_buttons
+        self.name = name
+        # ยังไม่ผ่าน EdgeTracker: ถือว่าไม่มี Edge (ก่อนหน้า = ปัจจุบัน)
+        self.prev_buttons = buttons
+        self.prev_hat_bits = bits
+        self.prev_axes = axes
+        self.long_held = 0
+        self.long_pressed = 0
+        self.double_tapped = 0
+        self.time = 0.0
+
+    @classmethod
+    def capture(cls, joystick, num_buttons, num_axes, num_hats, name=""):
+        """อ่านสถานะทั้งหมดจากจอยจริงครั้งเดียว (เรียกหลัง pygame.event.pump())"""
+        mask = 0
+        get_button = joystick.get_button
+        for i in range(num_buttons):
+            if get_button(i):
+                mask |= 1 << i
+        get_axis = joystick.get_axis
+        axes = tuple([get_axis(i) for i in range(num_axes)])
+        get_hat = joystick.get_hat
+        hats = tuple([tuple(get_hat(i)) for i in range(num_hats)])
+        return cls(mask, axes, hats, num_buttons, name)
+
+    @property
+    def pressed(self) -> int:
+        """Bitmask ปุ่มที่เพิ่งถูกกดใน Tick นี้"""
+        return self.buttons & ~self.prev_buttons
+
+    @property
+    def released(self) -> int:
+        """Bitmask ปุ่มที่เพิ่งถูกปล่อยใน Tick นี้"""
+        return self.prev_buttons & ~self.buttons
+
+    def is_idle(self, rest_axes=(), eps: float = 0.1) -> bool:
+        """ไม่มีปุ่ม/Hat ถูกกด และทุกแกนอยู่ใกล้ตำแหน่งพัก (rest_axes)"""
+        if self.buttons:
+            return False
+        for h in self.hats:
+            if h != (0, 0):
+                return False
+        for i, v in enumerate(self.axes):
+            rest = rest_axes[i] if i < len(rest_axes) else 0.0
+            if abs(v - rest) > eps:
+                return False
+        return True
+
+    # --- Compatibility Shim (API เดียวกับ pygame.joystick.Joystick) ---
+    def get_name(self) -> str:
+        return self.name
+
+    def get_numbuttons(self) -> int:
+        return self.num_buttons
+
+    def get_numaxes(self) -> int:
+        return len(self.axes)
+
+    def get_numhats(self) -> int:
+        return len(self.hats)
+
+    def get_button(self, index: int) -> bool:
+        if not 0 <= index < self.num_buttons:
+            raise IndexError(f"Invalid button index: {index}")
+        return bool((self.buttons >> index) & 1)
+
+    def get_axis(self, index: int) -> float:
+        return self.axes[index]
+
+    def get_hat(self, index: int) -> Tuple[int, int]:
+        return self.hats[index]
+
+
+def _iter_bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class EdgeTracker:
+    """
+    คำนวณ Edge ของปุ่มครั้งเดียวต่อ Tick (Engine เป็นเจ้าของ ไม่ใช่แต่ละ Action)
+    - pressed / released : เทียบกับ Tick ก่อนหน้า (ผ่าน prev_* ใน Snapshot)
+    - long_pressed       : ปุ่มที่กดค้างครบ LONG_PRESS วินาทีใน Tick นี้ (ครั้งเดียวต่อการกด)
+    - double_tapped      : ปุ่มที่ถูกกดซ้ำภายใน DOUBLE_TAP วินาที
+    Action ที่ถูกข้ามใน Tick ไหนจะไม่มีสถานะเก่าค้าง (Edge ถัดไปยังถูกต้องเสมอ)
+    """
+
+    LONG_PRESS = 0.5
+    DOUBLE_TAP = 0.3
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._buttons = 0
+        self._hat_bits = 0
+        self._axes = ()
+        self._long_held = 0
+        self._down_at = {}  # {bit: เวลาที่เริ่มกด}
+        self._tapped_at = {}  # {bit: เวลาที่กดครั้งล่าสุด} สำหรับ Double Tap
+
+    def update(self, snap: InputSnapshot, now: float) -> InputSnapshot:
+        """เติม Edge ของ Tick นี้ลงใน Snapshot (เรียกซ้ำกับ Snapshot เดิมได้ = ไม่มี Edge ใหม่)"""
+        buttons = snap.buttons
+        prev = self._buttons
+        snap.prev_buttons = prev
+        snap.prev_hat_bits = self._hat_bits
+        snap.prev_axes = self._axes
+
+        double = 0
+        pressed = buttons & ~prev
+        if pressed:
+            for bit in _iter_bits(pressed):
+                self._down_at[bit] = now
+                tapped = self._tapped_at.pop(bit, None)
+                if tapped is not None and now - tapped <= self.DOUBLE_TAP:
+                    double |= 1 << bit
+                else:
+                    self._tapped_at[bit] = now
+        released = prev & ~buttons
+        if released:
+            for bit in _iter_bits(released):
+                self._down_at.pop(bit, None)
+
+        long_held = self._long_held & buttons
+        if len(self._down_at) > bin(long_held).count("1"):
+            for bit, since in self._down_at.items():
+                if now - since >= self.LONG_PRESS:
+                    long_held |= 1 << bit
+        snap.long_pressed = long_held & ~self._long_held
+        snap.long_held = long_held
+        snap.double_tapped = double
+        snap.time = now
+
+        self._buttons = buttons
+        self._hat_bits = snap.hat_bits
+        self._axes = snap.axes
+        self._long_held = long_held
+        return snap
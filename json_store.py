@@ -0,0 +1,183 @@
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+
+_MISSING = object()
+
+
+class JsonStore:
+    """
+    ที่เก็บไฟล์ JSON (config / mapping / macros / recipes) แบบมี Cache ในแรม
+    - load(): คืนสำเนาข้อมูลจากแรม (อ่านดิสก์ครั้งแรกครั้งเดียว)
+    - save(): อัปเดตแรมทันที แล้วเขียนลงดิสก์บน Worker Thread แบบหน่วงเวลา
+      (บันทึกถี่ ๆ ติดกันจะรวบเหลือการเขียนครั้งเดียว)
+    - เขียนไฟล์แบบ Atomic (เขียนไฟล์ชั่วคราว -> fsync -> rename) ไฟล์ไม่พังแม้โปรแกรมดับกลางคัน
+    """
+
+    DEBOUNCE = 0.25  # วินาที: รอให้การบันทึกนิ่งก่อนเขียนจริง
+    MAX_DELAY = 2.0  # วินาที: บันทึกต่อเนื่องแค่ไหนก็ต้องเขียนภายในเวลานี้
+
+    def __init__(self):
+        self._cache = {}
+        self._pending = {}  # {path: (first_at, due, payload)}
+        self._written = {}  # {path: payload} ที่เราเขียนลงไฟล์ล่าสุด (แยกการแก้จากภายนอก)
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(os.fspath(path))
+
+    # --- Public API ---
+    def load(self, path, default=None):
+        """คืนสำเนาข้อมูลล่าสุด (แก้ไขได้อิสระ ต้องเรียก save() เพื่อบันทึก)"""
+        key = self._key(path)
+        with self._cond:
+            data = self._cache.get(key, _MISSING)
+        if data is _MISSING:
+            data = self._read(key)
+            if data is _MISSING:
+                data = {} if default is None else default
+            with self._cond:
+                data = self._cache.setdefault(key, data)
+        return copy.deepcopy(data)
+
+    def save(self, path, data) -> bool:
+        """อัปเดตข้อมูลในแรมทันที แล้วจองคิวเขียนลงดิสก์ (ไม่บล็อก Thread ที่เรียก)"""
+        key = self._key(path)
+        try:
+            payload = json.dumps(data, indent=4, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            print(f"❌ บันทึก {key} ไม่สำเร็จ: {e}")
+            return False
+
+        now = time.monotonic()
+        with self._cond:
+            self._cache[key] = copy.deepcopy(data)
+            first_at = self._pending.get(key, (now,))[0]
+            due = min(now + self.DEBOUNCE, first_at + self.MAX_DELAY)
+            self._pending[key] = (first_at, due, payload)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="JoyConMe-Save", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def invalidate(self, path):
+        """ล้าง Cache ของไฟล์ (load ครั้งต่อไปจะอ่านจากดิสก์) ยกเว้นมีข้อมูลรอเขียนอยู่"""
+        key = self._key(path)
+        with self._cond:
+            if key not in self._pending:
+                self._cache.pop(key, None)
+
+    def read_external(self, path):
+        """อ่านไฟล์ที่ถูกแก้จากภายนอก (เรียกจาก Thread เบื้องหลังได้)
+        คืน None ถ้าไฟล์นี้เป็นผลจากการเขียนของเราเอง มีข้อมูลรอเขียนอยู่ หรืออ่านไม่ได้"""
+        key = self._key(path)
+        with self._cond:
+            if key in self._pending:
+                return None
+        try:
+            with open(key, "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return None
+        with self._cond:
+            if self._written.get(key) == text:
+                return None
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ โหลด {key} ไม่สำเร็จ: {e}")
+            return None
+        with self._cond:
+            self._cache[key] = copy.deepcopy(data)
+        return data
+
+    def flush(self):
+        """เขียนข้อมูลที่ค้างอยู่ทั้งหมดทันที (เรียกตอนปิดโปรแกรม)"""
+        with self._write_lock:
+            with self._cond:
+                pending = [(k, v[2]) for k, v in self._pending.items()]
+                self._pending.clear()
+            for key, payload in pending:
+                self._write(key, payload)
+
+    # --- Disk I/O ---
+    def _read(self, key):
+        if not os.path.exists(key):
+            return _MISSING
+        try:
+            with open(key, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ โหลด {key} ไม่สำเร็จ: {e}")
+            return _MISSING
+
+    def _write(self, key, payload):
+        # เรียกขณะถือ _write_lock เสมอ (กันไฟล์เดียวกันถูกเขียนสลับลำดับ)
+        directory = os.path.dirname(key)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                prefix=f".{os.path.basename(key)}.", suffix=".tmp", dir=directory
+            )
+        except OSError as e:
+            print(f"❌ บันทึก {key} ไม่สำเร็จ: {e}")
+            return False
+        try:
+            try:
+                mode = os.stat(key).st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(tmp, mode)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            # จำเนื้อหาไว้ก่อน rename (Watcher อาจเห็น Event ทันทีหลัง rename)
+            with self._cond:
+                self._written[key] = payload
+            os.replace(tmp, key)
+            return True
+        except OSError as e:
+            print(f"❌ บันทึก {key} ไม่สำเร็จ: {e}")
+            with self._cond:
+                self._written.pop(key, None)
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return False
+
+    def _pop_due(self):
+        now = time.monotonic()
+        due = [k for k, v in self._pending.items() if v[1] <= now]
+        return [(k, self._pending.pop(k)[2]) for k in due]
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not any(v[1] <= time.monotonic() for v in self._pending.values()):
+                    if self._pending:
+                        wait = min(v[1] for v in self._pending.values())
+                        self._cond.wait(wait - time.monotonic())
+                    else:
+                        self._cond.wait()
+
+            with self._write_lock:
+                with self._cond:
+                    batch = self._pop_due()
+                for key, payload in batch:
+                    self._write(key, payload)
+
+
+json_store = JsonStore()
+atexit.register(json_store.flush)
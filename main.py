@@ -10,20 +10,56 @@ os.environ["SDL_JOYSTICK_ALLOW_BACKGROUND_EVENTS"] = "1"
 if sys.platform == "linux":
     os.environ["QT_QPA_PLATFORM"] = "xcb"
 
-from PySide6.QtCore import QTimer
+# ⏱️ --profile-startup: เริ่มจับเวลา Import ก่อนโหลด Library ใหญ่ ๆ
+from startup_profiler import profiler
+
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+if PROFILE_STARTUP:
+    sys.argv.remove("--profile-startup")
+    profiler.install()
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
 from PySide6.QtWidgets import QApplication
 
+import services
 from engine import JoyConEngine
+from engine_thread import EngineThread
+from ui_bridge import UiBridge
+
+
+class _GuiSignals(QObject):
+    """ส่งสัญญาณจาก Engine Thread มายัง GUI Thread (Queued Connection)"""
+
+    ui_pending = Signal()  # มีงาน UI รอในคิวของ UiBridge
+    exit_requested = Signal()
 
 
 class JoyConApp:
     def __init__(self):
-        self.app = QApplication(sys.argv)
+        with profiler.phase("Qt Application"):
+            self.app = QApplication(sys.argv)
+
+        # 0. ช่องทางส่งงาน UI จาก Engine Thread (ต้องสร้างก่อน Engine โหลด Action)
+        self.gui_signals = _GuiSignals()
+        self.ui_bridge = UiBridge(self.gui_signals.ui_pending.emit)
+        self.gui_signals.ui_pending.connect(
+            self.ui_bridge.drain, Qt.ConnectionType.QueuedConnection
+        )
+        self.gui_signals.exit_requested.connect(
+            self.cleanup, Qt.ConnectionType.QueuedConnection
+        )
+        services.register("ui", self.ui_bridge)
+
         self.engine = JoyConEngine()
 
-        # 1. Main Engine Timer
-        self.engine_timer = QTimer()
-        self.engine_timer.timeout.connect(self._run_tick)
+        # 1. Engine Thread: Tick ตาม Deadline แยกจาก GUI Thread
+        # (โหมด Event / ไม่มีจอย: หลับรอ Thread อ่านจอยปลุก)
+        self.engine_thread = EngineThread(
+            self.engine, on_exit=self.gui_signals.exit_requested.emit
+        )
+        self.engine.set_wake_callback(self.engine_thread.wake)
+        # สถิติจังหวะ Tick (Jitter / Overrun / เวลาทำงาน) ถามได้ตลอดผ่าน services
+        services.register("tick_scheduler", self.engine_thread.scheduler)
 
         # 2. Signal Catcher Timer
         self.signal_timer = QTimer()
@@ -52,18 +88,21 @@ class JoyConApp:
             print(f"🖥️  UI System   : Qt for Python (Ready)")
 
             # ตรวจเช็คชื่อจอย
-            joy_name = (
-                self.engine._joystick.get_name()
-                if self.engine._joystick
-                else "Not Found"
-            )
+            joy_name = self.engine.get_controller_name() or "Not Found"
             print(f"🎮 Controller  : {joy_name}")
 
             # คำนวณ Tick Rate
-            interval_ms = int(self.engine.get_sleep_time() * 1000)
+            interval = self.engine.get_sleep_time()
             print(
-                f"⏱️  Performance : {1000 / interval_ms:.0f} Hz (Tick: {interval_ms}ms)"
+                f"⏱️  Performance : {1 / interval:.0f} Hz "
+                f"(Tick: {interval * 1000:.2f}ms, Engine Thread)"
             )
+            input_mode = "Event-Driven" if self.engine.is_event_driven() else "Polling"
+            print(f"📡 Input Mode  : {input_mode}")
+            watch_backend = self.engine.get_config_watch_backend() or "Off"
+            print(f"👀 Config Watch: {watch_backend}")
+            hotplug_backend = self.engine.get_hotplug_backend() or "Off"
+            print(f"🔌 Hotplug     : {hotplug_backend}")
 
             # แสดงรายชื่อ Action ที่โหลดมา (Engine จะ print ตารางนี้ตอนโหลด)
             # เราเรียก _load_actions ใหม่ที่นี่เพื่อโชว์ log สวยๆ (ถ้า Engine ยังไม่ได้ทำ)
@@ -74,8 +113,12 @@ class JoyConApp:
             print("   - Or use secret sequence to Exit.")
             print("-" * 55)
 
-            # เริ่มทำงาน Timer
-            self.engine_timer.start(interval_ms)
+            if PROFILE_STARTUP:
+                profiler.uninstall()
+                profiler.report()
+
+            # เริ่มทำงาน Engine Thread
+            self.engine_thread.start()
             self.signal_timer.start(500)
 
             # เข้าสู่ Qt Event Loop
@@ -87,26 +130,12 @@ class JoyConApp:
             print(f"\n❌ Fatal Error during startup: {e}")
             self.cleanup()
 
-    def _run_tick(self):
-        """รันรอบการทำงานของ Engine และเช็คสัญญาณพิเศษ"""
-        try:
-            result = self.engine.run_tick()
-
-            # ตรวจสอบสัญญาณปิดโปรแกรม
-            if result == "EXIT":
-                print("\n🛑 [Main] Received EXIT signal. Closing...")
-                self.cleanup()
-            elif result == "SAVE_CONFIG":
-                self.engine.save_app_config()
-
-        except Exception as e:
-            print(f"⚠️ Error in engine tick loop: {e}")
-
     def cleanup(self):
         """คืนค่าทรัพยากรทั้งหมดก่อนปิดแอป"""
         print("\nกำลังปิดระบบ...")
-        self.engine_timer.stop()
+        self.engine_thread.stop()
         self.signal_timer.stop()
+        print(f"⏱️  Tick Stats  : {self.engine_thread.scheduler.summary()}")
 
         if self.engine:
             try:
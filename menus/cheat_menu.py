@@ -1,5 +1,3 @@
-import pygame
-
 MENU_NAME = "จัดการสูตรลับ"
 MENU_TARGET = "cheat_main"
 
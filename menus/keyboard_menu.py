@@ -5,5 +5,6 @@ MENU_NAME = "คีย์บอร์ด"
 
 
 def run(selected_item, context):
-    keyboard._controller.open()
+    # เปิดคีย์บอร์ดของจอยที่สั่งจากเมนู
+    keyboard.get_controller(context.get("ui_virtual")).open()
     return "CLOSE_MENU"
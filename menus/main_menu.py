@@ -6,11 +6,23 @@ from pathlib import Path
 MENU_ITEMS = []
 _loaded_menus = {}
 _target_menus = {}  # เพิ่ม Registry สำหรับเก็บ target ของแต่ละเมนู
+_menu_files = {}  # {ชื่อไฟล์: (mtime, module)} สำหรับเช็คว่าไฟล์ไหนถูกแก้ไข
 
 
-def reload_menus():
-    """ฟังก์ชันสำหรับสแกนหาไฟล์เมนูใหม่ๆ แบบอัตโนมัติ (Plug & Play)"""
-    global MENU_ITEMS, _loaded_menus, _target_menus
+def _iter_menu_files():
+    # ชี้ไปที่โฟลเดอร์ menus/
+    menu_dir = Path(__file__).parent
+
+    for file_path in sorted(menu_dir.glob("*.py")):
+        mod_name = file_path.stem
+
+        # ข้ามไฟล์ระบบและไฟล์ตัวเอง
+        if mod_name in ["main_menu", "utils", "__init__"] or mod_name.startswith("_"):
+            continue
+        yield mod_name, file_path
+
+
+def _rebuild_registry():
     MENU_ITEMS.clear()
     _loaded_menus.clear()
     _target_menus.clear()
@@ -18,35 +30,48 @@ def reload_menus():
     # ลงทะเบียนตัวเองเป็น target "main" เสมอ
     _target_menus["main"] = sys.modules[__name__]
 
-    # ชี้ไปที่โฟลเดอร์ menus/
-    menu_dir = Path(__file__).parent
+    for _, module in _menu_files.values():
+        # นำเข้าชื่อเมนู
+        if hasattr(module, "MENU_NAME"):
+            _loaded_menus[module.MENU_NAME] = module
+            MENU_ITEMS.append(module.MENU_NAME)
 
-    # ค้นหาไฟล์ .py ทั้งหมดในโฟลเดอร์
-    for file_path in menu_dir.glob("*.py"):
-        mod_name = file_path.stem
+        # นำเข้าเป้าหมายของเมนู (เพื่อใช้เวลาสลับหน้า)
+        if hasattr(module, "MENU_TARGET"):
+            _target_menus[module.MENU_TARGET] = module
 
-        # ข้ามไฟล์ระบบและไฟล์ตัวเอง
-        if mod_name in ["main_menu", "utils", "__init__"] or mod_name.startswith("_"):
-            continue
+    # เพิ่มปุ่ม ปิดเมนู ไว้ท้ายสุดเสมอ
+    MENU_ITEMS.append("ปิดเมนู")
 
-        try:
-            module = importlib.import_module(f"menus.{mod_name}")
-            importlib.reload(module)  # บังคับ Reload โค้ดใหม่เสมอเวลาเปิดเมนู
 
-            # นำเข้าชื่อเมนู
-            if hasattr(module, "MENU_NAME"):
-                _loaded_menus[module.MENU_NAME] = module
-                MENU_ITEMS.append(module.MENU_NAME)
+def reload_menus():
+    """สแกนหาไฟล์เมนู (Plug & Play) แล้ว Import เฉพาะไฟล์ใหม่ / ไฟล์ที่ถูกแก้ไข
+    ไฟล์ที่ mtime ไม่เปลี่ยนจะใช้โมดูลเดิมใน Registry (ไม่ Reload ซ้ำ)"""
+    found = {}
+    for mod_name, file_path in _iter_menu_files():
+        try:
+            mtime = file_path.stat().st_mtime_ns
+        except OSError:
+            continue
 
-            # นำเข้าเป้าหมายของเมนู (เพื่อใช้เวลาสลับหน้า)
-            if hasattr(module, "MENU_TARGET"):
-                _target_menus[module.MENU_TARGET] = module
+        cached = _menu_files.get(mod_name)
+        if cached and cached[0] == mtime:
+            found[mod_name] = cached
+            continue
 
+        try:
+            module = importlib.import_module(f"menus.{mod_name}")
+            if cached:
+                module = importlib.reload(module)
+            found[mod_name] = (mtime, module)
         except Exception as e:
             print(f"⚠️ [MainMenu] โหลดไฟล์เมนู {mod_name} ไม่สำเร็จ: {e}")
+            if cached:
+                found[mod_name] = cached
 
-    # เพิ่มปุ่ม ปิดเมนู ไว้ท้ายสุดเสมอ
-    MENU_ITEMS.append("ปิดเมนู")
+    _menu_files.clear()
+    _menu_files.update(found)
+    _rebuild_registry()
 
 
 def get_menu_module(target_id):
@@ -54,7 +79,7 @@ def get_menu_module(target_id):
     return _target_menus.get(target_id)
 
 
-# สแกนเมนูครั้งแรกเมื่อไฟล์ถูกโหลด
+# สแกนเมนูครั้งเดียวเมื่อไฟล์ถูกโหลด (เปิดเมนูครั้งต่อไปใช้ Registry นี้เลย)
 reload_menus()
 
 
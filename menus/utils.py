@@ -1,9 +1,12 @@
 # menus/utils.py
-import json
 import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from action_manifest import load_action_manifest
+from config_store import config_store
+from json_store import json_store
+
 
 def get_project_root() -> Path:
     """หา Root ของโปรเจกต์"""
@@ -17,63 +20,53 @@ def get_config_path(filename: str) -> Path:
 
 
 def load_json_safe(filepath: Path, default: Any = None) -> Any:
-    """โหลด JSON อย่างปลอดภัย"""
-    try:
-        if not filepath.exists():
-            return default if default is not None else {}
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"⚠️ โหลด {filepath} ไม่สำเร็จ: {e}")
-        return default if default is not None else {}
+    """โหลด JSON อย่างปลอดภัย (คืนสำเนาจาก Cache ในแรม อ่านดิสก์ครั้งแรกครั้งเดียว)"""
+    return json_store.load(filepath, default)
 
 
 def save_json_safe(filepath: Path, data: Any) -> bool:
-    """บันทึก JSON อย่างปลอดภัย"""
-    try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-        return True
-    except Exception as e:
-        print(f"❌ บันทึก {filepath} ไม่สำเร็จ: {e}")
-        return False
-
-
-# --- Config Functions ---
+    """บันทึก JSON อย่างปลอดภัย (อัปเดตแรมทันที เขียนไฟล์แบบ Atomic บน Thread แยก)"""
+    return json_store.save(filepath, data)
+
+
+# --- Config Functions (อ่าน/เขียนผ่าน Config Store กลางในแรม ไม่แตะดิสก์ตอนใช้เมนู) ---
 def load_config() -> Dict:
-    return load_json_safe(get_config_path("config.json"), {})
+    return config_store.get("config")
 
 
 def save_config(data: Dict) -> bool:
-    return save_json_safe(get_config_path("config.json"), data)
+    config_store.update("config", data)
+    return True
 
 
 def load_mapping() -> Dict:
-    return load_json_safe(get_config_path("mapping.json"), {})
+    return config_store.get("mapping")
 
 
 def save_mapping(data: Dict) -> bool:
-    return save_json_safe(get_config_path("mapping.json"), data)
+    config_store.update("mapping", data)
+    return True
 
 
 # ✨ ฟังก์ชันใหม่สำหรับคลังมาโคร (Macro Library)
 def load_macros() -> Dict[str, List[Any]]:
     """โหลดรายการมาโครทั้งหมดจากคลัง"""
-    return load_json_safe(get_config_path("macros.json"), {})
+    return config_store.get("macros")
 
 
 def save_macros(data: Dict[str, List[Any]]) -> bool:
     """บันทึกรายการมาโครลงคลัง"""
-    return save_json_safe(get_config_path("macros.json"), data)
+    config_store.update("macros", data)
+    return True
 
 
 def load_recipes() -> List[Dict]:
-    return load_json_safe(get_config_path("recipes.json"), [])
+    return config_store.get("recipes")
 
 
 def save_recipes(data: List[Dict]) -> bool:
-    return save_json_safe(get_config_path("recipes.json"), data)
+    config_store.update("recipes", data)
+    return True
 
 
 # --- Action Scanner ---
@@ -100,40 +93,21 @@ def get_all_available_actions() -> List[Dict]:
                 }
             )
 
-    # 2. สแกนไฟล์ .py ปกติ
-    for f in actions_dir.glob("*.py"):
-        if f.name.startswith("_"):
-            continue
-
-        mod_name = f.stem
-        try:
-            import importlib.util
-
-            spec = importlib.util.spec_from_file_location(f"actions.{mod_name}", f)
-            if not spec or not spec.loader:
-                continue
-
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-
-            if hasattr(module, "ACTION_INFO"):
-                info = module.ACTION_INFO
-                cat_name = info.get("name", info.get("id", "Unknown"))
-
-                for act in info.get("actions", []):
-                    cat = "analogs" if act.get("type") == "analog" else "buttons"
-                    actions.append(
-                        {
-                            "label": act.get("desc", act.get("key", "Unknown")),
-                            "mod": info.get("id", mod_name),
-                            "mod_name": cat_name,
-                            "cat": cat,
-                            "key": act.get("key", ""),
-                        }
-                    )
-        except Exception as e:
-            print(f"⚠️ โหลด {mod_name} ไม่สำเร็จ: {e}")
-            continue
+    # 2. อ่าน ACTION_INFO จาก Manifest (Parse ด้วย AST + Cache ตาม mtime ไม่ Import โมดูล)
+    for mod_name, info in load_action_manifest(actions_dir).items():
+        cat_name = info.get("name", info.get("id", "Unknown"))
+
+        for act in info.get("actions", []):
+            cat = "analogs" if act.get("type") == "analog" else "buttons"
+            actions.append(
+                {
+                    "label": act.get("desc", act.get("key", "Unknown")),
+                    "mod": info.get("id", mod_name),
+                    "mod_name": cat_name,
+                    "cat": cat,
+                    "key": act.get("key", ""),
+                }
+            )
 
     return actions
 
@@ -0,0 +1,76 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class OutputScheduler:
+    """
+    คิวส่ง Event แบบตั้งเวลา (เช่น กดที่ t แล้วปล่อยที่ t+20ms)
+    ทำงานบน Worker Thread แยก เพื่อไม่ให้ Tick Loop ต้องหยุดรอ time.sleep()
+    แต่ละชุดคำสั่งที่ส่งเข้ามาจะต่อคิวท้ายชุดก่อนหน้าเสมอ (มาโครหลายขั้นตอนจะไม่ซ้อนกัน)
+    """
+
+    def __init__(self, name="JoyConMe-Output"):
+        self._queue = []
+        self._cond = threading.Condition()
+        self._counter = itertools.count()
+        self._tail = 0.0
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, steps):
+        """
+        ส่งชุดคำสั่งเข้าคิว: steps = [(delay, func, args), ...]
+        delay คือเวลารอ (วินาที) นับจาก Event ก่อนหน้าในคิว
+        """
+        with self._cond:
+            if not self._running:
+                return
+            t = max(time.monotonic(), self._tail)
+            for delay, func, args in steps:
+                t += delay
+                heapq.heappush(self._queue, (t, next(self._counter), func, args))
+            self._tail = t
+            self._cond.notify()
+
+    def is_idle(self) -> bool:
+        with self._cond:
+            return not self._queue
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    if not self._queue:
+                        self._cond.wait()
+                        continue
+                    wait = self._queue[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if not self._running:
+                    return
+                _, _, func, args = heapq.heappop(self._queue)
+
+            try:
+                func(*args)
+            except Exception as ex:
+                print(f"⚠️ [Output] ส่ง Event ไม่สำเร็จ: {ex}")
+
+    def close(self, flush=True):
+        """หยุด Worker (flush=True จะส่ง Event ที่ค้างทันที เพื่อไม่ให้ปุ่มค้าง)"""
+        with self._cond:
+            self._running = False
+            pending = sorted(self._queue)
+            self._queue = []
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+        if flush:
+            for _, _, func, args in pending:
+                try:
+                    func(*args)
+                except Exception:
+                    pass
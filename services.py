@@ -0,0 +1,21 @@
+from typing import Any, Dict
+
+# --- Service Registry กลางของแอป ---
+# ให้ Action / Menu เข้าถึง Engine และบริการอื่นได้ทันที (O(1))
+# แทนการไล่หา Object ทั้งโปรเซสด้วย gc.get_objects()
+_services: Dict[str, Any] = {}
+
+
+def register(name: str, service: Any) -> None:
+    """ลงทะเบียนบริการ (เช่น register("engine", engine))"""
+    _services[name] = service
+
+
+def unregister(name: str, service: Any = None) -> None:
+    """ยกเลิกการลงทะเบียน (ถ้าระบุ service จะลบเฉพาะเมื่อเป็นตัวเดียวกัน)"""
+    if service is None or _services.get(name) is service:
+        _services.pop(name, None)
+
+
+def get(name: str, default: Any = None) -> Any:
+    return _services.get(name, default)
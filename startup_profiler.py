@@ -0,0 +1,128 @@
+import sys
+import time
+from contextlib import contextmanager
+
+
+class _TimedLoader:
+    """ห่อ Loader เดิม เพื่อจับเวลา create_module / exec_module ของแต่ละโมดูล"""
+
+    def __init__(self, profiler, name, loader):
+        self._profiler = profiler
+        self._name = name
+        self._loader = loader
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        if create is None:
+            return None
+        with self._profiler.measure(self._name):
+            return create(spec)
+
+    def exec_module(self, module):
+        # ให้ module.__loader__ ชี้ Loader ตัวจริง (บาง Library เช็คชนิดของ Loader)
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        with self._profiler.measure(self._name):
+            self._loader.exec_module(module)
+
+
+class _TimingFinder:
+    """MetaPathFinder ที่ถามตัวค้นหาตัวอื่นก่อน แล้วห่อ Loader ที่ได้ด้วย _TimedLoader"""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(self._profiler, name, spec.loader)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    วัดเวลา Startup (--profile-startup)
+    - เวลา Import แยกรายโมดูล (self = เวลาของโมดูลเอง, total = รวมโมดูลที่มัน Import ต่อ)
+    - เวลาแต่ละช่วงของการเริ่มระบบ (phase)
+    """
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._finder = None
+        self._stack = []
+        self._imports = {}
+        self._phases = []
+
+    def install(self):
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder is not None:
+            try:
+                sys.meta_path.remove(self._finder)
+            except ValueError:
+                pass
+            self._finder = None
+
+    @contextmanager
+    def measure(self, name):
+        # child = เวลาของโมดูลลูกที่ถูก Import ระหว่างนี้ (เอาไปหักออกจาก self)
+        frame = [name, 0.0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            total = time.perf_counter() - start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][1] += total
+            prev_self, prev_total = self._imports.get(name, (0.0, 0.0))
+            self._imports[name] = (prev_self + total - frame[1], prev_total + total)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases.append((name, time.perf_counter() - start))
+
+    def report(self, top=25):
+        elapsed = time.perf_counter() - self._t0
+        lines = ["", "=" * 60, "⏱️  STARTUP PROFILE", "-" * 60]
+        for name, secs in self._phases:
+            lines.append(f" {secs * 1000:8.1f} ms  {name}")
+        lines.append(f" {elapsed * 1000:8.1f} ms  (รวมตั้งแต่เริ่มโปรแกรม)")
+
+        # จัดกลุ่มตาม Package บนสุด (เช่น PySide6.QtCore -> PySide6)
+        packages = {}
+        for name, (self_t, _) in self._imports.items():
+            root = name.split(".", 1)[0]
+            packages[root] = packages.get(root, 0.0) + self_t
+
+        lines += ["-" * 60, " Import แยกตาม Package (self time)"]
+        for root, secs in sorted(packages.items(), key=lambda x: -x[1])[:top]:
+            lines.append(f" {secs * 1000:8.1f} ms  {root}")
+
+        lines += ["-" * 60, " Import แยกรายโมดูล (self / total)"]
+        ranked = sorted(self._imports.items(), key=lambda x: -x[1][0])[:top]
+        for name, (self_t, total_t) in ranked:
+            lines.append(f" {self_t * 1000:8.1f} / {total_t * 1000:8.1f} ms  {name}")
+        lines.append("=" * 60)
+        print("\n".join(lines))
+
+
+profiler = StartupProfiler()
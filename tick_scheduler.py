@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import deque
+
+CATCH_UP_POLICIES = ("skip", "burst", "reset")
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class TickScheduler:
+    """
+    ตัวจังหวะ Tick แบบ Deadline สัมบูรณ์ (ให้ system.tick_rate ได้ตามที่ตั้งจริง ไม่ปัดเป็น ms)
+    - Deadline = origin + n * interval: คำนวณจากจุดเริ่มเสมอ ไม่สะสม Drift จากเวลาทำงาน / ตื่นช้า
+    - หลับด้วย Event.wait จนเกือบถึง Deadline แล้ว Busy-wait ช่วงท้าย spin วินาที (0 = ไม่ Spin)
+    - ตื่นช้าเกิน 1 รอบ ใช้นโยบาย catch_up:
+      skip  = ข้ามรอบที่พลาด กลับเข้าจังหวะเดิม / burst = รัวรอบที่พลาดให้ทัน (ไม่เกิน MAX_BURST)
+      reset = เริ่มนับจังหวะใหม่จากตอนนี้
+    - เก็บ Jitter (ตื่นช้ากว่า Deadline) และเวลาทำงานต่อ Tick ใน Ring Buffer อ่านได้ตลอดผ่าน stats()
+    """
+
+    HISTORY = 1024  # จำนวน Tick ล่าสุดที่เก็บสถิติ
+    MAX_BURST = 4
+
+    def __init__(self, interval, spin=0.0, catch_up="skip", clock=time.perf_counter):
+        self._clock = clock
+        self._interval = interval
+        self.configure(spin, catch_up)
+        self._origin = clock()
+        self._index = 1
+        self._bursting = 0  # จำนวน Tick ชดเชย (burst) ที่ยังค้างอยู่
+        self._lock = threading.Lock()
+        self._jitter = deque(maxlen=self.HISTORY)
+        self._work = deque(maxlen=self.HISTORY)
+        self._ticks = 0
+        self._overruns = 0
+        self._skipped = 0
+        self._started_at = self._origin
+
+    @property
+    def interval(self):
+        return self._interval
+
+    def deadline(self) -> float:
+        return self._origin + self._index * self._interval
+
+    def configure(self, spin=0.0, catch_up="skip"):
+        self.spin = max(0.0, spin)
+        self.catch_up = catch_up if catch_up in CATCH_UP_POLICIES else "skip"
+
+    def set_interval(self, interval):
+        """เปลี่ยนความถี่ (เช่น แก้ tick_rate) โดยนับจังหวะใหม่ต่อจาก Deadline เดิม"""
+        if interval != self._interval:
+            self._origin = self._origin + (self._index - 1) * self._interval
+            self._index = 1
+            self._bursting = 0
+            self._interval = interval
+
+    def reset(self):
+        """เริ่มจังหวะใหม่จากตอนนี้ (เช่น หลังหลับรอจอยไปนาน)"""
+        self._origin = self._clock()
+        self._index = 1
+        self._bursting = 0
+
+    def wait(self, wake=None) -> bool:
+        """รอจนถึง Deadline ถัดไป คืน True ถ้าถูกปลุกผ่าน wake ก่อนเวลา (Deadline ยังเป็นค่าเดิม)"""
+        clock = self._clock
+        deadline = self.deadline()
+        remaining = deadline - clock() - self.spin
+        if remaining > 0:
+            if wake is not None:
+                if wake.wait(remaining):
+                    wake.clear()
+                    return True
+            else:
+                time.sleep(remaining)
+        while clock() < deadline:
+            if wake is not None and wake.is_set():
+                wake.clear()
+                return True
+        self._advance(clock() - deadline)
+        return False
+
+    def _advance(self, late):
+        missed = int(late // self._interval)
+        self._index += 1
+        backlog = 0
+        if self._bursting:
+            # Tick ชดเชยของ burst: Deadline อยู่ในอดีตอยู่แล้ว ไม่นับเป็นการตื่นช้าซ้ำ
+            owed = self._bursting
+            self._bursting -= 1
+            if missed < owed:
+                with self._lock:
+                    self._ticks += 1
+                return
+            # ช้าเพิ่มระหว่างชดเชย = หน่วงรอบใหม่ (Jitter นับเฉพาะส่วนที่เกินงานที่ค้างอยู่)
+            backlog = owed - 1
+            self._bursting = 0
+        with self._lock:
+            self._ticks += 1
+            self._jitter.append(late - backlog * self._interval)
+            if missed:
+                self._overruns += 1
+        if not missed:
+            return
+        # 🐢 ตื่นช้าเกิน 1 รอบ (Tick ก่อนหน้าทำงานนาน / ระบบหน่วง)
+        if self.catch_up == "reset":
+            self._skip(missed)
+            self.reset()
+        elif self.catch_up == "burst" and missed <= self.MAX_BURST:
+            # Deadline ที่พลาดยังอยู่ในอดีต: Tick ถัดไปจะรันทันทีจนกว่าจะทัน
+            self._bursting = missed
+        else:
+            self._skip(missed)
+            self._index += missed
+
+    def _skip(self, missed):
+        with self._lock:
+            self._skipped += missed
+
+    def record_work(self, seconds):
+        with self._lock:
+            self._work.append(seconds)
+
+    def stats(self) -> dict:
+        """สถิติล่าสุด (เวลาเป็นวินาที) เรียกจาก Thread ไหนก็ได้"""
+        with self._lock:
+            jitter = list(self._jitter)
+            work = list(self._work)
+            ticks, overruns, skipped = self._ticks, self._overruns, self._skipped
+        elapsed = self._clock() - self._started_at
+        return {
+            "target_hz": 1.0 / self._interval,
+            "actual_hz": ticks / elapsed if elapsed > 0 else 0.0,
+            "ticks": ticks,
+            "overruns": overruns,
+            "skipped": skipped,
+            "jitter_p50": percentile(jitter, 0.50),
+            "jitter_p99": percentile(jitter, 0.99),
+            "jitter_max": max(jitter, default=0.0),
+            "work_p50": percentile(work, 0.50),
+            "work_p99": percentile(work, 0.99),
+            "work_max": max(work, default=0.0),
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (
+            f"{s['actual_hz']:.1f}/{s['target_hz']:.0f} Hz | "
+            f"jitter p50 {s['jitter_p50'] * 1e6:.0f}us p99 {s['jitter_p99'] * 1e6:.0f}us | "
+            f"work p50 {s['work_p50'] * 1e6:.0f}us p99 {s['work_p99'] * 1e6:.0f}us | "
+            f"overruns {s['overruns']} (skipped {s['skipped']})"
+        )
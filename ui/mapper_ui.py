@@ -1,15 +1,22 @@
-import importlib
-import json
 import os
+import sys
+from pathlib import Path
 
 import pygame
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Button, DataTable, Footer, Header, Label, Select
 
+# รันเป็นสคริปต์ได้ (python ui/mapper_ui.py): Import โมดูลจากโฟลเดอร์หลักของโปรเจกต์
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from action_manifest import load_action_manifest
+from config_store import config_store
+
 # ตั้งค่าสภาพแวดล้อม
 os.environ["SDL_VIDEODRIVER"] = "dummy"
-MAPPING_FILE = os.path.join(os.path.dirname(__file__), "config", "mapping.json")
 
 
 class MapperApp(App):
@@ -44,31 +51,15 @@ class MapperApp(App):
             self.joystick.init()
 
     def load_mapping(self):
-        if os.path.exists(MAPPING_FILE):
-            try:
-                with open(MAPPING_FILE, "r") as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        # แก้ไข Mapping ของโปรไฟล์ที่ใช้งานอยู่ (ผ่าน Config Store เดียวกับ Engine)
+        self.full_mapping = config_store.get("mapping")
+        profiles = self.full_mapping.setdefault("profiles", {})
+        active = self.full_mapping.setdefault("active_profile", "default")
+        return profiles.setdefault(active, {})
 
     def scan_actions(self):
-        found = []
-        path = os.path.join(os.path.dirname(__file__), "actions")
-        if not os.path.exists(path):
-            return found
-
-        for f in os.listdir(path):
-            if f.endswith(".py") and f != "__init__.py":
-                try:
-                    # พยายามโหลดโมดูล
-                    m = importlib.import_module(f"actions.{f[:-3]}")
-                    if hasattr(m, "ACTION_INFO"):
-                        found.append(m.ACTION_INFO)
-                except Exception as e:
-                    # ถ้าโหลดไม่ได้ ให้พิมพ์บอกใน Terminal ว่าติดอะไร
-                    print(f"❌ ไม่สามารถโหลด Action '{f}' ได้เพราะ: {e}")
-        return found
+        # อ่าน ACTION_INFO แบบ Static (ไม่ Import โมดูล Action ที่มี Side Effect)
+        return list(load_action_manifest().values())
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -290,9 +281,9 @@ class MapperApp(App):
         self.finalize("❌ ลบรายการเรียบร้อย")
 
     def finalize(self, msg):
-        os.makedirs(os.path.dirname(MAPPING_FILE), exist_ok=True)
-        with open(MAPPING_FILE, "w") as f:
-            json.dump(self.mapping_data, f, indent=4)
+        # เขียนลงไฟล์ทันที (Atomic) เพื่อให้ Engine ที่รันอยู่เห็นการเปลี่ยนแปลง
+        config_store.update("mapping", self.full_mapping)
+        config_store.flush()
         self.refresh_table()
         self.reset_ui_states()
         self.query_one("#msg").update(msg)
@@ -0,0 +1,102 @@
+import functools
+import threading
+from collections import deque
+
+import services
+
+
+class UiBridge:
+    """
+    ส่งงาน UI จาก Engine Thread ไปทำบน GUI Thread (Qt Widget แตะได้จาก GUI Thread เท่านั้น)
+    - post(): ต่อคิวโดยไม่ล็อก (deque.append เป็น Atomic) แล้วปลุก GUI ครั้งเดียวต่อชุดงาน
+    - drain(): GUI Thread ทำงานที่ค้างในคิวทั้งหมดตามลำดับ
+    notify ต้องปลุก GUI แบบ Queued (เช่น Signal.emit ของ QObject ที่อยู่บน GUI Thread)
+    """
+
+    def __init__(self, notify):
+        self._queue = deque()
+        self._notify = notify
+        self._scheduled = False
+        self._gui_thread = threading.get_ident()
+
+    def on_gui_thread(self) -> bool:
+        return threading.get_ident() == self._gui_thread
+
+    def post(self, fn, *args, **kwargs):
+        self._queue.append((fn, args, kwargs))
+        if not self._scheduled:
+            self._scheduled = True
+            self._notify()
+
+    def drain(self):
+        # ล้าง Flag ก่อนดึงงาน: งานที่เข้ามาระหว่างนี้จะถูกทำรอบนี้ หรือปลุกรอบใหม่
+        self._scheduled = False
+        queue = self._queue
+        while queue:
+            fn, args, kwargs = queue.popleft()
+            try:
+                fn(*args, **kwargs)
+            except Exception as ex:
+                print(f"⚠️ [UI] Error: {ex}")
+
+
+def post_ui(fn, *args, **kwargs):
+    """รัน fn บน GUI Thread (ไม่รอผล) ถ้าไม่มี Bridge / อยู่บน GUI Thread แล้วจะรันทันที"""
+    bridge = services.get("ui")
+    if bridge is None or bridge.on_gui_thread():
+        fn(*args, **kwargs)
+    else:
+        bridge.post(fn, *args, **kwargs)
+
+
+def ui_thread(fn):
+    """Decorator: เรียกจาก Thread ไหนก็ได้ ตัวฟังก์ชันจะถูกรันบน GUI Thread (ไม่รอผล)"""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        post_ui(fn, *args, **kwargs)
+
+    return wrapper
+
+
+class UiProxy:
+    """
+    ห่อ Widget ให้ Action บน Engine Thread ใช้ได้เหมือนเดิม (Widget ถูกสร้างบน GUI Thread)
+    - เรียก Method: ส่งไปทำบน GUI Thread ตามลำดับ (ไม่รอผล คืน None)
+    - ตั้ง Attribute: จำค่าไว้ใน Proxy + ส่งไปตั้งบน Widget
+    - อ่าน Attribute: ค่าที่ตั้งผ่าน Proxy ก่อน ไม่มีจึงอ่านจาก Widget ข้าม Thread
+      (ค่าที่ GUI เปลี่ยนเองอาจยังไม่ตรงกับคำสั่งที่รอคิวอยู่: สถานะที่ Action ต้องใช้ให้เก็บฝั่ง Engine)
+    """
+
+    __slots__ = ("_factory", "_widget", "_values")
+
+    def __init__(self, factory, *args, **kwargs):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_widget", None)
+        object.__setattr__(self, "_values", {})
+        post_ui(self._create, args, kwargs)
+
+    def _create(self, args, kwargs):
+        object.__setattr__(self, "_widget", self._factory(*args, **kwargs))
+
+    def _call(self, name, *args, **kwargs):
+        if self._widget is not None:
+            getattr(self._widget, name)(*args, **kwargs)
+
+    def _assign(self, name, value):
+        if self._widget is not None:
+            setattr(self._widget, name, value)
+
+    def __getattr__(self, name):
+        values = self._values
+        if name in values:
+            return values[name]
+        if callable(getattr(self._factory, name, None)):
+            return functools.partial(post_ui, self._call, name)
+        if self._widget is None:
+            raise AttributeError(name)
+        return getattr(self._widget, name)
+
+    def __setattr__(self, name, value):
+        self._values[name] = value
+        post_ui(self._assign, name, value)
@@ -1,5 +1,10 @@
+import os
+import struct
 import sys
-import time
+import threading
+from contextlib import contextmanager
+
+from output_scheduler import OutputScheduler
 
 _E_MAP = {
     "a": ("KEY_A", False), "b": ("KEY_B", False), "c": ("KEY_C", False),
@@ -34,6 +39,11 @@ _E_MAP = {
     "`": ("KEY_GRAVE", False), "~": ("KEY_GRAVE", True),
 }
 
+# struct input_event { struct timeval time; __u16 type; __u16 code; __s32 value; }
+# (uinput ไม่สนใจค่าเวลา ส่งเป็น 0 ได้)
+_EVENT_STRUCT = struct.Struct("llHHi")
+
+
 class VirtualInput:
     """
     Hybrid Abstraction Layer สำหรับเมาส์และคีย์บอร์ด
@@ -41,9 +51,21 @@ class VirtualInput:
     Windows/Mac -> pynput
     """
 
+    # ⏱️ ระยะเวลากดค้างมาตรฐาน (วินาที)
+    TAP_HOLD = 0.02
+    COMBO_HOLD = 0.05
+    CLICK_HOLD = 0.05
+
     def __init__(self, device_name="JoyConMe"):
         self.is_linux = sys.platform == "linux"
         self.backend = "pynput"
+        # 🔒 Worker ของ Scheduler กับ Tick Loop เขียนอุปกรณ์พร้อมกันได้
+        self._lock = threading.RLock()
+
+        # 📦 Frame Batching: สะสม Event ทั้ง Tick แล้วส่งทีเดียวพร้อม SYN เดียว
+        self._frame_depth = 0
+        self._pending = []  # [(type, code, value), ...] ของปุ่ม
+        self._rel = [0, 0, 0]  # dx, dy, wheel ที่สะสมไว้
 
         if self.is_linux:
             try:
@@ -87,40 +109,132 @@ class VirtualInput:
             self.backend = "pynput"
             print("✅ Virtual Input: pynput (Cross-Platform Mode)")
 
-    def mouse_move(self, dx, dy):
+        # ⏱️ คิวส่ง Event แบบตั้งเวลา (กด/ปล่อย) บน Worker Thread
+        self.scheduler = OutputScheduler()
+
+    # --- Frame Batching ---
+    def begin_frame(self):
+        """เริ่มเฟรม: Event หลังจากนี้จะถูกสะสมไว้จนกว่าจะ end_frame()"""
+        with self._lock:
+            self._frame_depth += 1
+
+    def end_frame(self):
+        """จบเฟรม: ส่ง Event ที่สะสมไว้ทั้งหมดในการเขียนครั้งเดียว + SYN_REPORT เดียว"""
+        with self._lock:
+            self._frame_depth = max(0, self._frame_depth - 1)
+            if self._frame_depth == 0:
+                self._flush()
+
+    @contextmanager
+    def frame(self):
+        self.begin_frame()
+        try:
+            yield self
+        finally:
+            self.end_frame()
+
+    def _sync(self):
+        # อยู่ในเฟรม -> รอส่งตอน end_frame(), นอกเฟรม -> ส่งทันที
+        if self._frame_depth == 0:
+            self._flush()
+
+    def _emit_key(self, code, value):
+        # ปุ่มเดิมเปลี่ยนสถานะซ้ำในเฟรมเดียว -> ส่งชุดเก่าก่อน (กด/ปล่อยต้องอยู่คนละ Report)
+        if any(c == code for _, c, _ in self._pending):
+            self._flush()
+        self._pending.append((self.e.EV_KEY, code, value))
+
+    def _flush(self):
+        dx, dy, wheel = self._rel
+        if not (dx or dy or wheel or self._pending):
+            return
+        self._rel = [0, 0, 0]
+
         if self.backend == "evdev":
-            if dx != 0:
-                self.uinput.write(self.e.EV_REL, self.e.REL_X, dx)
-            if dy != 0:
-                self.uinput.write(self.e.EV_REL, self.e.REL_Y, dy)
-            self.uinput.syn()
+            e = self.e
+            events = []
+            if dx:
+                events.append((e.EV_REL, e.REL_X, dx))
+            if dy:
+                events.append((e.EV_REL, e.REL_Y, dy))
+            if wheel:
+                events.append((e.EV_REL, e.REL_WHEEL, wheel))
+            events.extend(self._pending)
+            events.append((e.EV_SYN, e.SYN_REPORT, 0))
+            self._pending = []
+            self._write_batch(events)
         else:
-            self.mouse.move(dx, dy)
+            if dx or dy:
+                self.mouse.move(dx, dy)
+            if wheel:
+                self.mouse.scroll(0, wheel)
+
+    def _write_batch(self, events):
+        """เขียน Event ทั้งชุดลง /dev/uinput ด้วย write() ครั้งเดียว"""
+        try:
+            buf = b"".join([_EVENT_STRUCT.pack(0, 0, t, c, v) for t, c, v in events])
+            os.write(self.uinput.fd, buf)
+        except (OSError, AttributeError, TypeError, struct.error):
+            # Fallback: เขียนทีละ Event ผ่าน python-evdev
+            for t, c, v in events:
+                self.uinput.write(t, c, v)
+
+    # --- Mouse ---
+    def mouse_move(self, dx, dy):
+        with self._lock:
+            self._rel[0] += dx
+            self._rel[1] += dy
+            self._sync()
 
     def mouse_scroll(self, amount):
-        if self.backend == "evdev":
-            self.uinput.write(self.e.EV_REL, self.e.REL_WHEEL, amount)
-            self.uinput.syn()
-        else:
-            self.mouse.scroll(0, -amount if amount < 0 else amount)
+        with self._lock:
+            self._rel[2] += amount
+            self._sync()
 
     def mouse_click(self, button_name, is_press):
-        if self.backend == "evdev":
-            btn_code = self.e.BTN_LEFT if button_name == "left" else self.e.BTN_RIGHT
-            self.uinput.write(self.e.EV_KEY, btn_code, 1 if is_press else 0)
-            self.uinput.syn()
-        else:
-            btn = self.mouse_btns.get(button_name)
-            if is_press:
-                self.mouse.press(btn)
+        with self._lock:
+            if self.backend == "evdev":
+                btn_code = (
+                    self.e.BTN_LEFT if button_name == "left" else self.e.BTN_RIGHT
+                )
+                self._emit_key(btn_code, 1 if is_press else 0)
+                self._sync()
             else:
-                self.mouse.release(btn)
+                # ส่งการขยับที่สะสมไว้ก่อน เพื่อให้ลำดับเหมือนเดิม
+                self._flush()
+                btn = self.mouse_btns.get(button_name)
+                if is_press:
+                    self.mouse.press(btn)
+                else:
+                    self.mouse.release(btn)
+
+    def click(self, button_name, hold=CLICK_HOLD, delay=0.0):
+        """คลิกเมาส์แบบไม่บล็อก (กด -> รอ hold -> ปล่อย ผ่าน Scheduler)"""
+        self.scheduler.submit(
+            [
+                (delay, self.mouse_click, (button_name, True)),
+                (hold, self.mouse_click, (button_name, False)),
+            ]
+        )
 
-    def tap_special(self, key_str):
-        """สำหรับปุ่มพิเศษ เช่น backspace, enter, space"""
-        self.press_special(key_str, True)
-        time.sleep(0.02)
-        self.press_special(key_str, False)
+    def tap_special(self, key_str, hold=TAP_HOLD, delay=0.0):
+        """สำหรับปุ่มพิเศษ เช่น backspace, enter, space (ไม่บล็อก Tick Loop)"""
+        self.scheduler.submit(
+            [
+                (delay, self.press_special, (key_str, True)),
+                (hold, self.press_special, (key_str, False)),
+            ]
+        )
+
+    def tap_combo(self, keys, hold=COMBO_HOLD, delay=0.0):
+        """กดหลายปุ่มพร้อมกัน (เช่น Ctrl + C) แล้วปล่อยย้อนลำดับ (ไม่บล็อก Tick Loop)"""
+        if not keys:
+            return
+        steps = [(delay, self.press_special, (keys[0], True))]
+        steps += [(0.0, self.press_special, (k, True)) for k in keys[1:]]
+        steps.append((hold, self.press_special, (keys[-1], False)))
+        steps += [(0.0, self.press_special, (k, False)) for k in reversed(keys[:-1])]
+        self.scheduler.submit(steps)
 
     def press_special(self, key_str, is_press):
         """กดปุ่มค้าง หรือกดพร้อมกัน (Combo)"""
@@ -135,8 +249,7 @@ class VirtualInput:
             key_name = f"KEY_{evdev_key_str.upper()}"
             code = getattr(self.e, key_name, None)
             if code is not None:
-                self.uinput.write(self.e.EV_KEY, code, 1 if is_press else 0)
-                self.uinput.syn()
+                self._write_key(code, 1 if is_press else 0)
         else:
             # pynput mode
             k = self.special_keys.get(key_str.lower())
@@ -146,13 +259,23 @@ class VirtualInput:
                 k = key_str
             
             if k:
-                if is_press:
-                    self.keyboard.press(k)
-                else:
-                    self.keyboard.release(k)
+                with self._lock:
+                    if is_press:
+                        self.keyboard.press(k)
+                    else:
+                        self.keyboard.release(k)
+
+    def _write_key(self, code, value):
+        with self._lock:
+            self._emit_key(code, value)
+            self._sync()
+
+    def _type_text(self, text):
+        with self._lock:
+            self.keyboard.type(text)
 
-    def type_char(self, char_str, shift=False):
-        """สำหรับพิมพ์ตัวอักษรปกติ"""
+    def type_char(self, char_str, shift=False, hold=TAP_HOLD, delay=0.0):
+        """สำหรับพิมพ์ตัวอักษรปกติ (ไม่บล็อก Tick Loop)"""
         if self.backend == "evdev":
             mapping = _E_MAP.get(char_str.lower())
             if not mapping:
@@ -162,20 +285,22 @@ class VirtualInput:
             if not code:
                 return
             do_shift = shift or req_shift
+            steps = []
             if do_shift:
-                self.uinput.write(self.e.EV_KEY, self.e.KEY_LEFTSHIFT, 1)
-                self.uinput.syn()
-            self.uinput.write(self.e.EV_KEY, code, 1)
-            self.uinput.syn()
-            time.sleep(0.02)
-            self.uinput.write(self.e.EV_KEY, code, 0)
-            self.uinput.syn()
+                steps.append((delay, self._write_key, (self.e.KEY_LEFTSHIFT, 1)))
+            steps.append((0.0 if do_shift else delay, self._write_key, (code, 1)))
+            steps.append((hold, self._write_key, (code, 0)))
             if do_shift:
-                self.uinput.write(self.e.EV_KEY, self.e.KEY_LEFTSHIFT, 0)
-                self.uinput.syn()
+                steps.append((0.0, self._write_key, (self.e.KEY_LEFTSHIFT, 0)))
+            self.scheduler.submit(steps)
         else:
-            self.keyboard.type(char_str)
+            self.scheduler.submit([(delay, self._type_text, (char_str,))])
 
     def close(self):
+        # ส่ง Event ที่ค้างในคิวให้หมดก่อน (กันปุ่มค้าง)
+        self.scheduler.close(flush=True)
+        with self._lock:
+            self._frame_depth = 0
+            self._flush()
         if self.backend == "evdev":
             self.uinput.close()